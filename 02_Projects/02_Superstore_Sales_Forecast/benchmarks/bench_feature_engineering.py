@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: model-ready features, the notebook's row-wise apply vs. the vectorized module
+
+Builds a synthetic order history by resampling
+data/processed/superstore_cleaned.csv, with the text columns as
+categoricals and some zero Sales and Quantity so both ratio branches are
+hit, then derives the model-ready features:
+
+- row-wise:   the notebook's cell, with apply(axis=1) for Profit Margin and
+              Sales per Quantity and a LabelEncoder per text column
+- vectorized: feature_engineering.build_features
+
+Both start from the same in-memory frame, so only feature building is
+timed. The row-wise applies run over slices of --chunk rows: apply(axis=1)
+boxes every value of the frame, which does not fit in memory at 10M rows,
+and its cost is per row either way. The outputs are checked to be
+identical column by column.
+
+Usage:
+    python benchmarks/bench_feature_engineering.py --rows 1M 10M
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from feature_engineering import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, INPUT_COLUMNS, TARGET_COLUMN, build_features  # noqa: E402
+
+SOURCE = os.path.join(PROJECT_ROOT, "data", "processed", "superstore_cleaned.csv")
+NOTEBOOK_ENCODED_COLUMNS = ["Ship Mode", "Segment", "City", "State", "Region", "Category", "Sub-Category"]
+_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_rows(text):
+    multiplier = _SUFFIXES.get(text[-1].lower(), 1)
+    number = text[:-1] if multiplier > 1 else text
+    return int(float(number) * multiplier)
+
+
+def make_history(rows, seed=25):
+    text_columns = CATEGORICAL_COLUMNS + ["City", "State"]
+    source = pd.read_csv(
+        SOURCE,
+        usecols=INPUT_COLUMNS + ["City", "State"],
+        parse_dates=["Order Date"],
+        dtype={col: "category" for col in text_columns},
+    )
+    rng = np.random.default_rng(seed)
+    history = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+    history.loc[rng.random(rows) < 0.01, "Sales"] = 0.0
+    history.loc[rng.random(rows) < 0.01, "Quantity"] = 0
+    return history
+
+
+def apply_rows(df, func, chunk):
+    return pd.concat([df.iloc[start:start + chunk].apply(func, axis=1) for start in range(0, len(df), chunk)])
+
+
+def build_features_rowwise(df, chunk):
+    """
+    The notebook's feature engineering cell
+    """
+    df = df.copy(deep=False)
+    df["Profit Margin"] = apply_rows(df, lambda row: row["Profit"] / row["Sales"] if row["Sales"] != 0 else 0, chunk)
+    df["Sales per Quantity"] = apply_rows(df, lambda row: row["Sales"] / row["Quantity"] if row["Quantity"] != 0 else 0, chunk)
+
+    df["Order Year"] = df["Order Date"].dt.year
+    df["Order Month"] = df["Order Date"].dt.month
+    df["Order Quarter"] = df["Order Date"].dt.quarter
+    df["Order Day of Week"] = df["Order Date"].dt.dayofweek
+
+    encoder = LabelEncoder()
+    for col in NOTEBOOK_ENCODED_COLUMNS:
+        df[col + "_Encoded"] = encoder.fit_transform(df[col])
+    return df[FEATURE_COLUMNS + [TARGET_COLUMN]].fillna(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=parse_rows, nargs="+", default=[1_000_000], help="history sizes, e.g. 1M 10M")
+    parser.add_argument("--chunk", type=parse_rows, default=500_000, help="rows per row-wise apply call (default 500k)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'method':<12}{'seconds':>10}{'rows/s':>14}{'speed-up':>10}")
+    for rows in args.rows:
+        history = make_history(rows)
+
+        start = time.perf_counter()
+        expected = build_features_rowwise(history, args.chunk)
+        rowwise_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        features = build_features(history)
+        vectorized_seconds = time.perf_counter() - start
+
+        if list(features.columns) != list(expected.columns):
+            raise SystemExit("vectorized features have a different schema")
+        differing = [col for col in expected.columns if not np.array_equal(features[col].to_numpy(), expected[col].to_numpy())]
+        if differing:
+            raise SystemExit(f"vectorized features differ in: {', '.join(differing)}")
+
+        print(f"{rows:>12,} {'row-wise':<12}{rowwise_seconds:>10.2f}{rows / rowwise_seconds:>14,.0f}{'':>10}")
+        print(f"{rows:>12,} {'vectorized':<12}{vectorized_seconds:>10.2f}{rows / vectorized_seconds:>14,.0f}{rowwise_seconds / vectorized_seconds:>9,.0f}x")
+        print(f"{'':>12} identical features on {rows:,} rows")
+        del history, expected, features
+
+
+if __name__ == "__main__":
+    main()
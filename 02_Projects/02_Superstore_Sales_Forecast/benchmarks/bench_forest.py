@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: profit classifier inference, sklearn predict_proba vs. compiled forest
+
+Uses models/profit_classifier.pkl when it exists, otherwise trains the
+notebook's classifier (RandomForestClassifier(n_estimators=100,
+random_state=42) on superstore_model_ready.csv without Profit Margin).
+Compiles it with CompiledForest and measures:
+
+- single-row latency (median over --repeat calls), the dashboard's
+  predictor form;
+- batch throughput on rows resampled from the model-ready data;
+
+checking that both engines return identical probabilities.
+
+Usage:
+    python benchmarks/bench_forest.py --rows 100 1k 10k 100k
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from compiled_forest import CompiledForest  # noqa: E402
+
+MODEL_READY = os.path.join(PROJECT_ROOT, "data", "processed", "superstore_model_ready.csv")
+CLASSIFIER = os.path.join(PROJECT_ROOT, "models", "profit_classifier.pkl")
+_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_rows(text):
+    multiplier = _SUFFIXES.get(text[-1].lower(), 1)
+    number = text[:-1] if multiplier > 1 else text
+    return int(float(number) * multiplier)
+
+
+def load_features():
+    data = pd.read_csv(MODEL_READY)
+    return data.drop(columns=["Profit", "Profit Margin"]), (data["Profit"] > 0).astype(int)
+
+
+def load_classifier(X, y):
+    if os.path.exists(CLASSIFIER):
+        with open(CLASSIFIER, "rb") as f:
+            return pickle.load(f), "models/profit_classifier.pkl"
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    classifier = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1).fit(X_train, y_train)
+    return classifier, "trained as in the notebook"
+
+
+def median_seconds(predict, X, repeat):
+    predict(X)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=parse_rows, nargs="+", default=[100, 1_000, 10_000, 100_000], help="batch sizes, e.g. 1k 100k")
+    parser.add_argument("--repeat", type=int, default=200, help="single-row calls to time")
+    args = parser.parse_args()
+
+    X, y = load_features()
+    classifier, source = load_classifier(X, y)
+    # Serve it the way the dashboard does (profit_model.ProfitModel):
+    # single-threaded, and on arrays in the fitted column order without
+    # feature_names_in_, so sklearn does not warn on (and check) every call
+    classifier.n_jobs = None
+    if hasattr(classifier, "feature_names_in_"):
+        X = X[list(classifier.feature_names_in_)]
+        del classifier.feature_names_in_
+    X = X.to_numpy(dtype=np.float64)
+
+    start = time.perf_counter()
+    forest = CompiledForest.from_sklearn(classifier)
+    print(f"Classifier: {source}; compiled {forest.n_trees} trees / {forest.node_count:,} nodes "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    full = classifier.predict_proba(X)
+    if not np.array_equal(full, forest.predict_proba(X)):
+        raise SystemExit("compiled forest probabilities differ from sklearn on the model-ready data")
+    print(f"Identical probabilities on all {len(X):,} model-ready rows\n")
+
+    print(f"{'rows':>10}{'sklearn ms':>13}{'compiled ms':>13}{'speed-up':>10}{'compiled rows/s':>17}")
+    single = X[:1]
+    sklearn_ms = median_seconds(classifier.predict_proba, single, args.repeat) * 1000
+    compiled_ms = median_seconds(forest.predict_proba, single, args.repeat) * 1000
+    print(f"{1:>10,}{sklearn_ms:>13.2f}{compiled_ms:>13.2f}{sklearn_ms / compiled_ms:>9.1f}x{1000 / compiled_ms:>17,.0f}")
+
+    rng = np.random.default_rng(23)
+    for rows in args.rows:
+        batch = X[rng.integers(0, len(X), rows)]
+        repeat = max(1, min(20, 20_000 // rows))
+        sklearn_ms = median_seconds(classifier.predict_proba, batch, repeat) * 1000
+        compiled_ms = median_seconds(forest.predict_proba, batch, repeat) * 1000
+        if not np.array_equal(classifier.predict_proba(batch), forest.predict_proba(batch)):
+            raise SystemExit(f"compiled forest probabilities differ from sklearn on the {rows:,}-row batch")
+        print(f"{rows:>10,}{sklearn_ms:>13.2f}{compiled_ms:>13.2f}{sklearn_ms / compiled_ms:>9.1f}x"
+              f"{rows / compiled_ms * 1000:>17,.0f}")
+
+
+if __name__ == "__main__":
+    main()
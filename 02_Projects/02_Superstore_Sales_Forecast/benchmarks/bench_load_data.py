@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dashboard cold start, CSV parse vs. columnar cache
+
+Builds a synthetic multi-million-row order history by resampling
+data/processed/superstore_cleaned.csv, then loads it three ways, each in a
+fresh process so peak RSS is not shared between them:
+
+- csv:   pd.read_csv with parse_dates (the dashboard before the cache)
+- first: load_orders on a cold cache (typed parse + Feather write)
+- warm:  load_orders with a current cache (memory-mapped Feather read)
+
+Usage:
+    python benchmarks/bench_load_data.py --rows 1M 5M
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from data_cache import load_orders  # noqa: E402
+
+SOURCE = os.path.join(PROJECT_ROOT, "data", "processed", "superstore_cleaned.csv")
+_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_rows(text):
+    multiplier = _SUFFIXES.get(text[-1].lower(), 1)
+    number = text[:-1] if multiplier > 1 else text
+    return int(float(number) * multiplier)
+
+
+def make_history(rows, path, seed=16):
+    source = pd.read_csv(SOURCE)
+    rng = np.random.default_rng(seed)
+    history = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+    history["Row ID"] = np.arange(1, rows + 1)
+    history.to_csv(path, index=False)
+
+
+def peak_rss_mb():
+    # ru_maxrss survives exec on Linux, so the child would inherit the
+    # parent's peak; VmHWM belongs to the new address space
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def measure(mode, csv_path):
+    """
+    Runs in the child process; prints one JSON line
+    """
+    start = time.perf_counter()
+    if mode == "csv":
+        df = pd.read_csv(csv_path, parse_dates=["Order Date", "Ship Date"])
+    else:
+        df = load_orders(csv_path)
+    seconds = time.perf_counter() - start
+    print(json.dumps({
+        "seconds": seconds,
+        "frame_mb": df.memory_usage(deep=True).sum() / 1024 ** 2,
+        "peak_rss_mb": peak_rss_mb(),
+    }))
+
+
+def run_child(mode, csv_path):
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--measure", mode, csv_path],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=parse_rows, nargs="+", default=[1_000_000], help="history sizes, e.g. 1M 5M")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "CSV"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    work_dir = tempfile.mkdtemp(prefix="bench_load_data_")
+    print(f"{'rows':>12} {'load':<8}{'seconds':>10}{'frame MB':>10}{'peak RSS MB':>13}{'on disk MB':>12}")
+    try:
+        for rows in args.rows:
+            csv_path = os.path.join(work_dir, f"orders_{rows}.csv")
+            make_history(rows, csv_path)
+            sizes = {"csv": os.path.getsize(csv_path)}
+            for mode in ("csv", "first", "warm"):
+                result = run_child(mode, csv_path)
+                if mode == "first":
+                    sizes["first"] = sizes["warm"] = os.path.getsize(os.path.join(work_dir, ".cache", f"orders_{rows}.feather"))
+                print(f"{rows:>12,} {mode:<8}{result['seconds']:>10.2f}{result['frame_mb']:>10.0f}"
+                      f"{result['peak_rss_mb']:>13.0f}{sizes[mode] / 1024 ** 2:>12.0f}")
+            shutil.rmtree(os.path.join(work_dir, ".cache"))
+            os.remove(csv_path)
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: profit/loss scoring, row-by-row apply vs. vectorized batch
+
+Builds a synthetic order book by resampling
+data/processed/superstore_cleaned.csv (with extra discounts at the rule
+thresholds, so every branch is hit), then scores it:
+
+- apply: df.apply(predict_profitability, axis=1), on at most --apply-rows
+         rows (it is too slow for millions; throughput is per row)
+- batch: predict_profitability_batch over the whole book
+
+and checks that the batch scores equal the apply scores exactly.
+
+Usage:
+    python benchmarks/bench_predict.py --rows 1M 10M
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from profit_predictor import predict_profitability, predict_profitability_batch  # noqa: E402
+
+SOURCE = os.path.join(PROJECT_ROOT, "data", "processed", "superstore_cleaned.csv")
+COLUMNS = ["Sales", "Quantity", "Discount", "Ship Mode", "Segment", "Region", "Category", "Sub-Category"]
+_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_rows(text):
+    multiplier = _SUFFIXES.get(text[-1].lower(), 1)
+    number = text[:-1] if multiplier > 1 else text
+    return int(float(number) * multiplier)
+
+
+def make_order_book(rows, seed=21):
+    source = pd.read_csv(SOURCE, usecols=COLUMNS, dtype={c: "category" for c in COLUMNS[3:]})
+    rng = np.random.default_rng(seed)
+    book = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+    edges = rng.random(rows) < 0.1
+    book.loc[edges, "Discount"] = rng.choice([0.0, 0.1, 0.2, 0.5, 50.0], int(edges.sum()))
+    return book
+
+
+def score_row(row):
+    return predict_profitability(
+        row["Sales"], row["Quantity"], row["Discount"], row["Ship Mode"],
+        row["Segment"], row["Region"], row["Category"], row["Sub-Category"],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=parse_rows, nargs="+", default=[1_000_000], help="order book sizes, e.g. 1M 10M")
+    parser.add_argument("--apply-rows", type=parse_rows, default=200_000, help="rows scored with apply (default 200k)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'method':<8}{'rows scored':>13}{'seconds':>10}{'rows/s':>14}{'speed-up':>10}")
+    for rows in args.rows:
+        book = make_order_book(rows)
+        subset = book.iloc[:min(rows, args.apply_rows)]
+
+        start = time.perf_counter()
+        expected = subset.apply(score_row, axis=1).to_numpy(dtype=np.float64)
+        apply_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = predict_profitability_batch(book)
+        batch_seconds = time.perf_counter() - start
+
+        if not np.array_equal(scores[:len(subset)], expected):
+            mismatches = np.flatnonzero(scores[:len(subset)] != expected)
+            raise SystemExit(f"batch scores differ from predict_profitability on {len(mismatches):,} rows")
+
+        apply_rate = len(subset) / apply_seconds
+        batch_rate = rows / batch_seconds
+        print(f"{rows:>12,} {'apply':<8}{len(subset):>13,}{apply_seconds:>10.2f}{apply_rate:>14,.0f}{'':>10}")
+        print(f"{rows:>12,} {'batch':<8}{rows:>13,}{batch_seconds:>10.2f}{batch_rate:>14,.0f}{batch_rate / apply_rate:>9,.0f}x")
+        print(f"{'':>12} identical scores on {len(subset):,} rows; {np.mean(scores < 0.5):.1%} flagged as loss-making")
+
+
+if __name__ == "__main__":
+    main()
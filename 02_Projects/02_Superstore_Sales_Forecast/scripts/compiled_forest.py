@@ -0,0 +1,184 @@
+"""
+Array-based inference for a trained random forest classifier.
+
+sklearn's RandomForestClassifier.predict_proba validates its input, then
+calls every tree's predict_proba separately (through joblib) and sums the
+results. For a single order that fixed cost, about 0.1 ms per tree, is
+most of the dashboard's prediction latency. CompiledForest flattens all
+trees into packed arrays indexed by global node number:
+
+- feature, threshold: the split (leaves: feature 0, threshold +inf);
+- children: right and left child of node n at 2n and 2n + 1, so the next
+  node is children[2 * node + go_left] (leaves point to themselves);
+- value: class probabilities of the leaf.
+
+Every (tree, row) pair then walks its tree at the same time. Each step is a
+few vectorized gathers, and pairs that reached a leaf are dropped from the
+working set every few steps.
+
+Outputs are identical to sklearn's:
+- inputs are compared as float32, as sklearn does; the thresholds are
+  rounded down to float32, which gives the same comparisons as float64;
+- the trees' probabilities are added in estimator order before the
+  division by the tree count.
+
+The per-step cost is NumPy's, not compiled code's, so this wins for small
+batches (about 20x for a single row) and loses to sklearn's Cython loop
+beyond a few hundred rows (see benchmarks/bench_forest.py).
+"""
+
+import numpy as np
+
+# (tree, row) pairs walked at once; bounds the working arrays to a few MB
+CHUNK_PAIRS = 1 << 18
+# Steps between removals of the pairs that reached a leaf
+COMPACT_EVERY = 4
+
+
+def _tree_probabilities(tree, n_classes):
+    """
+    Class probabilities of every node, as the installed scikit-learn's
+    DecisionTreeClassifier.predict_proba reports them: from 1.4 tree_.value
+    already holds them, before that it held weighted counts to normalize
+    """
+    import sklearn
+
+    value = tree.value[:, 0, :n_classes]
+    major, minor = (int(part) for part in sklearn.__version__.split(".")[:2])
+    if (major, minor) >= (1, 4):
+        return np.array(value, dtype=np.float64)
+    normalizer = value.sum(axis=1)[:, np.newaxis]
+    normalizer[normalizer == 0.0] = 1.0
+    return value / normalizer
+
+
+def _float32_floor(threshold):
+    """
+    Largest float32 <= each float64 threshold: for any float32 x,
+    x <= threshold exactly when x <= the result
+    """
+    rounded = threshold.astype(np.float32)
+    over = rounded.astype(np.float64) > threshold
+    rounded[over] = np.nextafter(rounded[over], np.float32(-np.inf))
+    return rounded
+
+
+class CompiledForest:
+    """
+    Packed node arrays of a fitted single-output forest classifier
+    (RandomForestClassifier, ExtraTreesClassifier)
+    """
+
+    def __init__(self, feature, threshold, children, value, missing_left, roots, n_features, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.is_leaf = children[1::2] == np.arange(len(feature))
+        self.value = value
+        self.missing_left = missing_left
+        self.roots = roots
+        self.n_features = n_features
+        self.classes_ = classes
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output forests can be compiled")
+        n_classes = int(forest.n_classes_)
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        parts = {key: [] for key in ("feature", "threshold", "left", "right", "value", "missing_left")}
+        for tree, offset in zip(trees, offsets[:-1]):
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left == -1
+            parts["feature"].append(np.where(leaf, 0, tree.feature))
+            parts["threshold"].append(np.where(leaf, np.inf, tree.threshold))
+            parts["left"].append(offset + np.where(leaf, nodes, tree.children_left))
+            parts["right"].append(offset + np.where(leaf, nodes, tree.children_right))
+            parts["value"].append(_tree_probabilities(tree, n_classes))
+            # Where sklearn sends NaN inputs (the side seen in training, or the
+            # larger child); older versions have no such array and NaN fails
+            # every <= and goes right
+            missing = getattr(tree, "missing_go_to_left", None)
+            parts["missing_left"].append(
+                np.zeros(tree.node_count, dtype=bool) if missing is None else (np.asarray(missing) != 0) & ~leaf
+            )
+        packed = {key: np.concatenate(arrays) for key, arrays in parts.items()}
+        return cls(
+            feature=packed["feature"].astype(np.intp),
+            threshold=_float32_floor(packed["threshold"].astype(np.float64)),
+            children=np.stack([packed["right"], packed["left"]], axis=1).ravel().astype(np.intp),
+            value=np.ascontiguousarray(packed["value"]),
+            missing_left=packed["missing_left"] if packed["missing_left"].any() else None,
+            roots=offsets[:-1].astype(np.intp),
+            n_features=int(forest.n_features_in_),
+            classes=np.asarray(forest.classes_),
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def node_count(self):
+        return len(self.feature)
+
+    def _check_input(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected a 2D array with {self.n_features} features, got shape {X.shape}")
+        has_missing = self.missing_left is not None and bool(np.isnan(X).any())
+        return X, has_missing, max(1, CHUNK_PAIRS // self.n_trees)
+
+    def apply(self, X):
+        """
+        Leaf (global node index) reached by every row in every tree, as a
+        (n_trees, n_rows) array
+        """
+        X, has_missing, chunk = self._check_input(X)
+        leaves = np.empty((self.n_trees, len(X)), dtype=np.intp)
+        for start in range(0, len(X), chunk):
+            leaves[:, start:start + chunk] = self._walk(X[start:start + chunk], has_missing)
+        return leaves
+
+    def _walk(self, X, has_missing=False):
+        n_rows = len(X)
+        flat_x = X.ravel()
+        node = np.repeat(self.roots, n_rows)
+        # Offset of each pair's row in flat_x
+        row_base = np.tile(np.arange(n_rows, dtype=np.intp) * self.n_features, self.n_trees)
+        pairs = np.arange(len(node))
+        leaves = np.empty(len(node), dtype=np.intp)
+        step = 0
+        while len(node):
+            position = np.take(self.feature, node)
+            position += row_base
+            x = np.take(flat_x, position)
+            go_left = x <= np.take(self.threshold, node)
+            if has_missing:
+                go_left |= np.isnan(x) & np.take(self.missing_left, node)
+            node *= 2
+            node += go_left
+            node = np.take(self.children, node)
+            step += 1
+            if step % COMPACT_EVERY == 0:
+                done = np.take(self.is_leaf, node)
+                if done.any():
+                    leaves[pairs[done]] = node[done]
+                    active = ~done
+                    node, row_base, pairs = node[active], row_base[active], pairs[active]
+        return leaves.reshape(self.n_trees, n_rows)
+
+    def predict_proba(self, X):
+        X, has_missing, chunk = self._check_input(X)
+        proba = np.empty((len(X), self.value.shape[1]), dtype=np.float64)
+        for start in range(0, len(X), chunk):
+            leaves = self._walk(X[start:start + chunk], has_missing)
+            # A reduction over the outer axis adds the trees one after the
+            # other, in estimator order, as sklearn accumulates them
+            proba[start:start + chunk] = np.take(self.value, leaves, axis=0).sum(axis=0)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
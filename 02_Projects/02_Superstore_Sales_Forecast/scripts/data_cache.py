@@ -0,0 +1,178 @@
+"""
+Columnar cache for the cleaned Superstore order history.
+
+Parsing superstore_cleaned.csv (text -> floats, two date columns, a dozen
+string columns) dominates dashboard cold start on large histories, and the
+parsed frame keeps every string as a separate Python object. load_orders
+parses the CSV once, with categorical dtypes for the repeating text columns
+(Region, Category, Ship Mode, customers, products, ...), and writes an
+uncompressed Feather (Arrow IPC) copy next to it under `.cache/`, together
+with the derived Order Month / Order Weekday columns. Later loads memory-map
+that file instead of parsing.
+
+The cache records the source's size, modification time and SHA-256. It is
+used when size and mtime match; if only the mtime differs (a fresh checkout,
+a copied file) the hash decides, so unchanged data is not re-parsed. Bump
+CACHE_VERSION when the dtype or derived-column rules below change.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow ships with streamlit, but keep the CSV path working without it
+    pa = feather = None
+
+CACHE_VERSION = 2
+CACHE_DIR_NAME = ".cache"
+_METADATA_KEY = b"superstore_cache"
+
+DATE_COLUMNS = ["Order Date", "Ship Date"]
+# Repeating text columns; Order ID stays plain text (about one value per two rows)
+CATEGORICAL_COLUMNS = [
+    "Ship Mode", "Segment", "Country", "City", "State", "Region", "Category", "Sub-Category",
+    "Customer ID", "Customer Name", "Product ID", "Product Name",
+]
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path, with_hash=True):
+    stat = os.stat(path)
+    fingerprint = {"version": CACHE_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        fingerprint["sha256"] = file_sha256(path)
+    return fingerprint
+
+
+def cache_path_for(csv_path, cache_dir=None):
+    """
+    data/processed/superstore_cleaned.csv -> data/processed/.cache/superstore_cleaned.feather
+    """
+    directory = cache_dir or os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(directory, name + ".feather")
+
+
+def add_derived_columns(df):
+    """
+    Order Month (first day of the month) and Order Weekday (Monday = 0),
+    computed once here so the dashboard never adds columns to the shared
+    frame
+    """
+    if "Order Date" in df.columns:
+        order_date = df["Order Date"]
+        df["Order Month"] = order_date.dt.to_period("M").dt.to_timestamp()
+        df["Order Weekday"] = order_date.dt.weekday.astype("int8")
+    return df
+
+
+def read_orders_csv(csv_path):
+    """
+    Parse the CSV with dates parsed and the text dimensions as categoricals
+    whose categories are sorted, so groupby output keeps the alphabetical
+    order plain strings would give. Derived columns are added (and cached)
+    with the rest.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {c: "category" for c in CATEGORICAL_COLUMNS if c in header}
+    dates = [c for c in DATE_COLUMNS if c in header]
+    engine = "pyarrow" if pa is not None else "c"
+    df = pd.read_csv(csv_path, parse_dates=dates, dtype=dtypes, engine=engine)
+    for col in dtypes:
+        if not df[col].cat.categories.is_monotonic_increasing:
+            df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+    return add_derived_columns(df)
+
+
+def _read_cache(cache_path):
+    """
+    Memory-mapped table and its stored fingerprint (None if unreadable)
+    """
+    try:
+        table = feather.read_table(cache_path, memory_map=True)
+        stored = json.loads((table.schema.metadata or {})[_METADATA_KEY])
+    except (OSError, KeyError, ValueError, pa.ArrowInvalid):
+        return None, None
+    return table, stored
+
+
+def _cache_state(stored, csv_path):
+    """
+    'current', 'touched' (same content, new mtime: the stored fingerprint
+    should be refreshed) or 'stale'
+    """
+    current = source_fingerprint(csv_path, with_hash=False)
+    if stored.get("version") != current["version"] or stored.get("size") != current["size"]:
+        return "stale"
+    if stored.get("mtime_ns") == current["mtime_ns"]:
+        return "current"
+    # Same size, different mtime: only a content hash can tell
+    return "touched" if stored.get("sha256") == file_sha256(csv_path) else "stale"
+
+
+def write_cache(data, csv_path, cache_path):
+    """
+    Write a frame (or Arrow table) as uncompressed Feather, which can be
+    memory-mapped, tagged with the source fingerprint. Written to a
+    temporary file and renamed, so a concurrent reader never sees a partial
+    cache.
+    """
+    table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+    fingerprint = json.dumps(source_fingerprint(csv_path)).encode()
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), _METADATA_KEY: fingerprint})
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_orders(csv_path, cache_dir=None, use_cache=True):
+    """
+    Load the cleaned order history, from the columnar cache when it matches
+    the CSV, otherwise by parsing the CSV (and refreshing the cache).
+
+    A cache that cannot be written (read-only deployment, no pyarrow) only
+    costs the speed-up: the parsed frame is returned either way.
+    """
+    if not use_cache or feather is None:
+        return read_orders_csv(csv_path)
+
+    cache_path = cache_path_for(csv_path, cache_dir)
+    if os.path.exists(cache_path):
+        table, stored = _read_cache(cache_path)
+        state = _cache_state(stored, csv_path) if table is not None else "stale"
+        if state != "stale":
+            print(f"⚡ Loaded {table.num_rows:,} rows from columnar cache: {cache_path}")
+            df = table.to_pandas(split_blocks=True)
+            if state == "touched":
+                # Record the new mtime so later starts skip the hash
+                try:
+                    write_cache(table, csv_path, cache_path)
+                except OSError:
+                    pass
+            return df
+        print(f"♻️ Columnar cache is stale, re-parsing {csv_path}")
+
+    df = read_orders_csv(csv_path)
+    try:
+        write_cache(df, csv_path, cache_path)
+        print(f"💾 Wrote columnar cache: {cache_path}")
+    except OSError as e:
+        print(f"⚠️ Could not write columnar cache ({e}); continuing with the parsed CSV")
+    return df
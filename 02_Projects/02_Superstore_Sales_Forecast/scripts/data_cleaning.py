@@ -0,0 +1,48 @@
+"""
+Data cleaning stage: raw Superstore export -> superstore_cleaned.csv.
+
+The steps of the notebook's "Data Cleaning and Preparation" section:
+missing postal codes, date parsing, Shipping Duration, duplicate rows and
+stray whitespace in the text dimensions.
+"""
+
+import pandas as pd
+
+RAW_ENCODING = "ISO-8859-1"
+DATE_FORMAT = "%m/%d/%Y"
+TEXT_COLUMNS = ["Segment", "Country", "City", "State", "Region", "Category", "Sub-Category"]
+
+
+def clean_data(raw_path):
+    """
+    Cleaned order lines from the raw CSV export
+    """
+    df = pd.read_csv(raw_path, encoding=RAW_ENCODING)
+
+    df["Postal Code"] = df["Postal Code"].fillna("Unknown")
+    try:
+        df["Order Date"] = pd.to_datetime(df["Order Date"], format=DATE_FORMAT)
+        df["Ship Date"] = pd.to_datetime(df["Ship Date"], format=DATE_FORMAT)
+    except ValueError:
+        # Not the usual M/D/YYYY export: let pandas infer the format
+        df["Order Date"] = pd.to_datetime(df["Order Date"])
+        df["Ship Date"] = pd.to_datetime(df["Ship Date"])
+    df["Shipping Duration"] = (df["Ship Date"] - df["Order Date"]).dt.days
+    df["Postal Code"] = df["Postal Code"].astype(str)
+
+    rows = len(df)
+    df = df.drop_duplicates()
+    if len(df) < rows:
+        print(f"🧹 Removed {rows - len(df):,} duplicate rows")
+    for col in TEXT_COLUMNS:
+        df[col] = df[col].str.strip()
+    return df
+
+
+def clean_file(raw_path, cleaned_path):
+    """
+    Pipeline stage: clean raw_path and write the result to cleaned_path
+    """
+    df = clean_data(raw_path)
+    df.to_csv(cleaned_path, index=False)
+    print(f"💾 Cleaned {len(df):,} order lines -> {cleaned_path}")
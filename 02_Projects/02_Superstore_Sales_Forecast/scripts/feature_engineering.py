@@ -0,0 +1,124 @@
+"""
+Feature engineering stage: superstore_cleaned.csv -> superstore_model_ready.csv.
+
+The notebook's "Feature Engineering for Modeling" section as a module:
+ratio features, date parts and label-encoded text dimensions, with Profit
+as the target column.
+
+Everything is computed with whole-column operations: the ratios with
+np.divide (0 where the denominator is 0, like the notebook's row-wise
+apply), the date parts with NumPy calendar arithmetic and the encodings
+as codes over the sorted distinct values, which is the numbering
+LabelEncoder gives. The output is identical to the notebook's.
+"""
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ["Ship Mode", "Segment", "Region", "Category", "Sub-Category"]
+FEATURE_COLUMNS = [
+    "Sales", "Quantity", "Discount", "Shipping Duration", "Profit Margin",
+    "Sales per Quantity", "Order Year", "Order Month", "Order Quarter", "Order Day of Week",
+    "Ship Mode_Encoded", "Segment_Encoded", "Region_Encoded", "Category_Encoded", "Sub-Category_Encoded",
+]
+TARGET_COLUMN = "Profit"
+INPUT_COLUMNS = ["Order Date", "Sales", "Quantity", "Discount", "Profit", "Shipping Duration"] + CATEGORICAL_COLUMNS
+
+
+def safe_ratio(numerator, denominator):
+    """
+    numerator / denominator as float64, 0 where the denominator is 0
+    """
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+
+
+def date_parts(days):
+    """
+    Year, month, quarter and weekday (Monday = 0) of datetime64[D] values,
+    as the .dt accessors give them; NaT gives NaN
+    """
+    months = days.astype("datetime64[M]").astype(np.int64)
+    month = months % 12 + 1
+    parts = {
+        "Order Year": months // 12 + 1970,
+        "Order Month": month,
+        "Order Quarter": (month - 1) // 3 + 1,
+        # 1970-01-01 was a Thursday
+        "Order Day of Week": (days.astype(np.int64) + 3) % 7,
+    }
+    missing = np.isnat(days)
+    if missing.any():
+        parts = {name: np.where(missing, np.nan, values) for name, values in parts.items()}
+    return parts
+
+
+def label_codes(values):
+    """
+    LabelEncoder's codes (position in the sorted distinct values) for a
+    text or categorical column; missing values get -1
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return pd.factorize(values, sort=True)[0]
+    codes = values.cat.codes.to_numpy()
+    categories = values.cat.categories
+    used = np.flatnonzero(np.bincount(codes[codes >= 0], minlength=len(categories)))
+    # Rank of each used category among the used ones; the extra last slot
+    # maps code -1 (missing) to -1
+    ranks = np.full(len(categories) + 1, -1, dtype=np.int64)
+    ranks[used[categories[used].argsort()]] = np.arange(len(used))
+    return ranks[codes]
+
+
+def build_features(df):
+    """
+    Model-ready frame (FEATURE_COLUMNS + Profit) from cleaned order lines
+    """
+    missing = [col for col in INPUT_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns for feature engineering: {', '.join(missing)}")
+
+    order_date = df["Order Date"]
+    if not pd.api.types.is_datetime64_any_dtype(order_date):
+        order_date = pd.to_datetime(order_date)
+
+    features = {col: df[col].to_numpy(copy=True) for col in ["Sales", "Quantity", "Discount", "Shipping Duration"]}
+    features.update({
+        "Profit Margin": safe_ratio(df["Profit"], df["Sales"]),
+        "Sales per Quantity": safe_ratio(df["Sales"], df["Quantity"]),
+        **date_parts(order_date.to_numpy(dtype="datetime64[D]")),
+    })
+    for col in CATEGORICAL_COLUMNS:
+        features[col + "_Encoded"] = label_codes(df[col])
+    features[TARGET_COLUMN] = df[TARGET_COLUMN].to_numpy(copy=True)
+
+    # Every column is a fresh array: wrap them without pandas consolidating
+    # them into 2D blocks (a second copy of the frame)
+    model_ready = pd.DataFrame(features, index=df.index, copy=False)
+    nan_columns = model_ready.columns[model_ready.isna().any()]
+    if len(nan_columns):
+        model_ready[nan_columns] = model_ready[nan_columns].fillna(0)
+    return model_ready
+
+
+def engineer_features(cleaned_path):
+    """
+    Model-ready frame from the cleaned CSV
+    """
+    df = pd.read_csv(
+        cleaned_path,
+        usecols=INPUT_COLUMNS,
+        parse_dates=["Order Date"],
+        dtype={col: "category" for col in CATEGORICAL_COLUMNS},
+    )
+    return build_features(df)
+
+
+def engineer_file(cleaned_path, model_ready_path):
+    """
+    Pipeline stage: write the model-ready features of cleaned_path
+    """
+    df = engineer_features(cleaned_path)
+    df.to_csv(model_ready_path, index=False)
+    print(f"💾 Engineered {len(df.columns) - 1} features for {len(df):,} rows -> {model_ready_path}")
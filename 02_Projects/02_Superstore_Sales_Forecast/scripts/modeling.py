@@ -0,0 +1,122 @@
+"""
+Modeling stages on superstore_model_ready.csv.
+
+- train_and_save_model: the notebook's "Predictive Modeling" step. Compares
+  regressors of Profit (linear regression, decision tree, random forest,
+  gradient boosting) on an 80/20 split by RMSE, MAE and R², and saves the
+  best by R² as models/best_profit_predictor.pkl.
+- train_and_save_classifier: the profit/loss RandomForestClassifier the
+  dashboard serves, with its label encoders, feature column list and
+  held-out test-set scores.
+
+Profit Margin is Profit / Sales, so both drop it from the features (the
+notebook's leakage fix for the classifier).
+"""
+
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestClassifier, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import accuracy_score, mean_absolute_error, mean_squared_error, precision_recall_fscore_support, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+from sklearn.tree import DecisionTreeRegressor
+
+RANDOM_STATE = 42
+TEST_SIZE = 0.2
+LEAKING_COLUMNS = ["Profit Margin"]
+CLASSIFIER_ENCODED_COLUMNS = ["Ship Mode", "Segment", "City", "State", "Region", "Category", "Sub-Category"]
+
+MODEL_CANDIDATES = {
+    "Linear Regression": lambda: LinearRegression(),
+    "Decision Tree": lambda: DecisionTreeRegressor(random_state=RANDOM_STATE),
+    "Random Forest": lambda: RandomForestRegressor(n_estimators=100, random_state=RANDOM_STATE, n_jobs=-1),
+    "Gradient Boosting": lambda: GradientBoostingRegressor(random_state=RANDOM_STATE),
+}
+
+
+def load_model_ready(model_ready_path):
+    """
+    Features (without the leaking columns) and the Profit target
+    """
+    df = pd.read_csv(model_ready_path)
+    return df.drop(columns=["Profit"] + LEAKING_COLUMNS), df["Profit"]
+
+
+def compare_models(X, y):
+    """
+    Fitted candidates and their test-set RMSE / MAE / R², best R² first
+    """
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+    models, rows = {}, []
+    for name, make in MODEL_CANDIDATES.items():
+        model = make().fit(X_train, y_train)
+        predictions = model.predict(X_test)
+        models[name] = model
+        rows.append({
+            "Model": name,
+            "RMSE": float(np.sqrt(mean_squared_error(y_test, predictions))),
+            "MAE": float(mean_absolute_error(y_test, predictions)),
+            "R2": float(r2_score(y_test, predictions)),
+        })
+    metrics = pd.DataFrame(rows).sort_values("R2", ascending=False, kind="stable").reset_index(drop=True)
+    return models, metrics
+
+
+def train_and_save_model(model_ready_path, model_path, metrics_path):
+    """
+    Pipeline stage: compare the regressors, save the best one to
+    model_path and the comparison table to metrics_path
+    """
+    X, y = load_model_ready(model_ready_path)
+    models, metrics = compare_models(X, y)
+    best = metrics.loc[0, "Model"]
+    with open(model_path, "wb") as f:
+        pickle.dump(models[best], f)
+    metrics.to_csv(metrics_path, index=False)
+    print(f"🏆 Best profit regressor: {best} (R² {metrics.loc[0, 'R2']:.3f}) -> {model_path}")
+    return metrics
+
+
+def classifier_metrics(y_test, predictions):
+    """
+    Test-set accuracy, and precision / recall / F1 of the loss class (0)
+    """
+    precision, recall, f1, _ = precision_recall_fscore_support(
+        y_test, predictions, labels=[0], average=None, zero_division=0
+    )
+    return {
+        "Accuracy": float(accuracy_score(y_test, predictions)),
+        "Precision (Loss)": float(precision[0]),
+        "Recall (Loss)": float(recall[0]),
+        "F1-Score (Loss)": float(f1[0]),
+        "Test Orders": int(len(y_test)),
+    }
+
+
+def train_and_save_classifier(model_ready_path, cleaned_path, classifier_path, encoders_path, features_path, metrics_path):
+    """
+    Pipeline stage: the profit/loss classifier with its label encoders
+    (fitted on the cleaned data), feature column list and test-set metrics
+    """
+    X, profit = load_model_ready(model_ready_path)
+    y = (profit > 0).astype(int)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y
+    )
+    classifier = RandomForestClassifier(n_estimators=100, random_state=RANDOM_STATE, n_jobs=-1)
+    classifier.fit(X_train, y_train)
+    metrics = classifier_metrics(y_test, classifier.predict(X_test))
+
+    cleaned = pd.read_csv(cleaned_path)
+    encoders = {col: LabelEncoder().fit(cleaned[col]) for col in CLASSIFIER_ENCODED_COLUMNS}
+    for path, obj in ((classifier_path, classifier), (encoders_path, encoders), (features_path, list(X.columns))):
+        with open(path, "wb") as f:
+            pickle.dump(obj, f)
+    with open(metrics_path, "w") as f:
+        json.dump(metrics, f, indent=2)
+    print(f"🤖 Profit/loss classifier (accuracy {metrics['Accuracy']:.2f}) -> {classifier_path}")
+    return metrics
@@ -0,0 +1,323 @@
+"""
+Pre-aggregated cube of the order history behind the dashboard KPIs.
+
+Every chart and KPI on the dashboard is a sum (or a ratio of sums) over a
+handful of dimensions, so the order lines are folded once into
+
+- cells: Sales, Profit, Quantity, Discount sums, line counts and the
+  high-discount line / loss counts, keyed by
+  month x Region x Category x Sub-Category x Segment x Ship Mode x weekday
+  (at most 48 x 4 x 17 x 3 x 4 x 7 ~ 270k cells for four years, however
+  many orders there are);
+- customers: Sales and Profit by Customer ID x month x Region x Segment,
+  for the top-customer chart (customer is too wide a dimension for cells).
+
+summarize() derives the process_data dictionary from these two small
+frames. Both are sums, so new orders are folded in by aggregating them and
+adding them to the matching cells (update()); the cube is saved under
+`.cache/` next to the CSV and extended from the orders whose Row ID is
+above its watermark.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+CUBE_VERSION = 1
+HIGH_DISCOUNT = 0.2
+
+CATEGORICAL_DIMENSIONS = ["Region", "Category", "Sub-Category", "Segment", "Ship Mode"]
+DIMENSIONS = ["Order Month"] + CATEGORICAL_DIMENSIONS + ["Weekday"]
+MEASURES = ["Sales", "Profit", "Quantity", "Discount", "Lines", "High Discount Lines", "High Discount Losses"]
+CUSTOMER_DIMENSIONS = ["Customer ID", "Order Month", "Region", "Segment"]
+CUSTOMER_MEASURES = ["Sales", "Profit"]
+DAYS_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _sum_by(frame, keys, measures):
+    # dropna=False: a line with a missing dimension value still counts in
+    # every total (its cell has NaN for that key)
+    return frame.groupby(keys, observed=True, sort=False, dropna=False)[measures].sum().reset_index()
+
+
+def order_month(orders):
+    """
+    First day of each order's month (the load-time "Order Month" column when
+    present)
+    """
+    if "Order Month" in orders.columns:
+        return orders["Order Month"]
+    return orders["Order Date"].dt.to_period("M").dt.to_timestamp()
+
+
+def order_weekday(orders):
+    """
+    Day of week of each order, Monday = 0 ("Order Weekday" when present)
+    """
+    if "Order Weekday" in orders.columns:
+        return orders["Order Weekday"]
+    return orders["Order Date"].dt.weekday.astype(np.int8)
+
+
+def aggregate_orders(orders):
+    """
+    Fold order lines into (cells, customers) frames
+    """
+    high_discount = orders["Discount"].to_numpy() > HIGH_DISCOUNT
+    lines = pd.DataFrame({
+        "Order Month": order_month(orders),
+        **{c: orders[c] for c in CATEGORICAL_DIMENSIONS + ["Customer ID"]},
+        "Weekday": order_weekday(orders),
+        "Sales": orders["Sales"],
+        "Profit": orders["Profit"],
+        "Quantity": orders["Quantity"].astype(np.int64),
+        "Discount": orders["Discount"],
+        "Lines": np.ones(len(orders), dtype=np.int64),
+        "High Discount Lines": high_discount.astype(np.int64),
+        "High Discount Losses": (high_discount & (orders["Profit"].to_numpy() < 0)).astype(np.int64),
+    })
+    for col in CATEGORICAL_DIMENSIONS + ["Customer ID"]:
+        if not isinstance(lines[col].dtype, pd.CategoricalDtype):
+            lines[col] = lines[col].astype("category")
+    return _sum_by(lines, DIMENSIONS, MEASURES), _sum_by(lines, CUSTOMER_DIMENSIONS, CUSTOMER_MEASURES)
+
+
+def _merge(current, new, keys, measures):
+    """
+    Add new aggregates to current ones, matching on keys
+    """
+    if current is None or current.empty:
+        return new
+    current, new = current.copy(), new.copy()
+    for col in keys:
+        if isinstance(current[col].dtype, pd.CategoricalDtype):
+            categories = current[col].cat.categories.union(new[col].astype("category").cat.categories)
+            current[col] = current[col].cat.set_categories(categories)
+            new[col] = new[col].astype(pd.CategoricalDtype(categories))
+    return _sum_by(pd.concat([current, new], ignore_index=True), keys, measures)
+
+
+class OrderCube:
+    """
+    Cells and customer aggregates plus the Row ID watermark of the orders
+    folded in so far
+    """
+
+    def __init__(self, cells=None, customers=None, watermark=None, rows=0):
+        self.cells = cells
+        self.customers = customers
+        self.watermark = watermark
+        self.rows = rows
+
+    @classmethod
+    def from_orders(cls, orders):
+        cube = cls()
+        cube.update(orders)
+        return cube
+
+    def update(self, orders):
+        """
+        Fold new order lines (none of which were folded before) into the cube
+        """
+        if len(orders) == 0:
+            return self
+        cells, customers = aggregate_orders(orders)
+        self.cells = _merge(self.cells, cells, DIMENSIONS, MEASURES)
+        self.customers = _merge(self.customers, customers, CUSTOMER_DIMENSIONS, CUSTOMER_MEASURES)
+        self.rows += len(orders)
+        if "Row ID" in orders.columns:
+            high = int(orders["Row ID"].max())
+            self.watermark = high if self.watermark is None else max(self.watermark, high)
+        return self
+
+    def new_orders(self, orders):
+        """
+        Orders above the watermark, or None when the orders at or below it
+        are not the ones already folded in (rows edited, removed or
+        replaced, no Row ID), in which case the cube has to be rebuilt.
+        Those orders must match the cube's row count and measure totals.
+        """
+        if self.watermark is None or "Row ID" not in orders.columns:
+            return None
+        above = orders["Row ID"].to_numpy() > self.watermark
+        if len(orders) - int(above.sum()) != self.rows:
+            return None
+        for measure in ("Sales", "Profit", "Quantity", "Discount"):
+            folded = orders[measure].to_numpy()[~above].sum()
+            if not np.isclose(folded, self.cells[measure].sum(), rtol=1e-9, atol=1e-6):
+                return None
+        return orders[above]
+
+    def save(self, directory):
+        """
+        Write cells, customers and state.json; the state is written last, so
+        an interrupted save leaves no state that matches the other files
+        """
+        os.makedirs(directory, exist_ok=True)
+        state_path = os.path.join(directory, "state.json")
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        for name, frame in (("cells", self.cells), ("customers", self.customers)):
+            feather.write_feather(frame, os.path.join(directory, f"{name}.feather"), compression="uncompressed")
+        state = {"version": CUBE_VERSION, "watermark": self.watermark, "rows": self.rows, "cells": len(self.cells)}
+        with open(state_path, "w") as f:
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Saved cube, or None if there is none (or it is from another version)
+        """
+        try:
+            with open(os.path.join(directory, "state.json")) as f:
+                state = json.load(f)
+            if state.get("version") != CUBE_VERSION:
+                return None
+            cells = feather.read_feather(os.path.join(directory, "cells.feather"))
+            customers = feather.read_feather(os.path.join(directory, "customers.feather"))
+        except (OSError, ValueError):
+            return None
+        if len(cells) != state["cells"]:
+            return None
+        return cls(cells, customers, state["watermark"], state["rows"])
+
+    def summarize(self):
+        """
+        KPIs and chart frames in the shape process_data returns them
+        """
+        return summarize(self.cells, self.customers)
+
+
+def _column(frame, name, rows):
+    values = frame[name].to_numpy()
+    return values if rows is None else values[rows]
+
+
+def _group_sums(frame, rows, key, measures):
+    """
+    Sums of measures per observed value of key over the selected rows (a
+    slice, positions or None for all); np.bincount over the codes instead
+    of a groupby, so summaries of filtered selections stay cheap. Cells with
+    a missing key (code -1) are left out, as groupby leaves out NaN keys
+    """
+    column = frame[key]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes, labels = column.cat.codes.to_numpy(), column.cat.categories
+        codes = codes if rows is None else codes[rows]
+    else:
+        codes, labels = pd.factorize(_column(frame, key, rows), sort=True)
+    keyed = codes >= 0
+    unkeyed = not keyed.all()
+    if unkeyed:
+        codes = codes[keyed]
+    present = np.bincount(codes, minlength=len(labels)) > 0
+    result = {key: labels[present]}
+    for measure in measures:
+        values = _column(frame, measure, rows)
+        if unkeyed:
+            values = values[keyed]
+        sums = np.bincount(codes, weights=values, minlength=len(labels))[present]
+        result[measure] = sums.astype(values.dtype) if values.dtype.kind == "i" else sums
+    return pd.DataFrame(result)
+
+
+def summarize(cells, customers, cell_rows=None, customer_rows=None):
+    def by(key, measures=("Profit", "Sales")):
+        return _group_sums(cells, cell_rows, key, measures)
+
+    totals = {measure: _column(cells, measure, cell_rows).sum() for measure in MEASURES}
+    total_sales = totals["Sales"]
+    total_profit = totals["Profit"]
+    lines = totals["Lines"]
+    avg_discount = totals["Discount"] / lines * 100 if lines else 0
+    profit_margin = (total_profit / total_sales) * 100 if total_sales != 0 else 0
+    high_discount = totals["High Discount Lines"]
+    loss_percentage = totals["High Discount Losses"] / high_discount * 100 if high_discount > 0 else 0
+
+    monthly_data = by("Order Month", ("Sales", "Profit"))
+    category_data = by("Category")
+    region_data = by("Region")
+    if len(category_data) > 0:
+        most_profitable_category = category_data.loc[category_data["Profit"].idxmax(), "Category"]
+        least_profitable_category = category_data.loc[category_data["Profit"].idxmin(), "Category"]
+    else:
+        most_profitable_category = least_profitable_category = None
+    if len(region_data) > 0:
+        best_region = region_data.loc[region_data["Profit"].idxmax(), "Region"]
+        worst_region = region_data.loc[region_data["Profit"].idxmin(), "Region"]
+    else:
+        best_region = worst_region = None
+
+    subcategory_data = by("Sub-Category").sort_values(by="Profit", ascending=True)
+    customer_data = _group_sums(customers, customer_rows, "Customer ID", ("Profit", "Sales"))
+    customer_data = customer_data.sort_values(by="Profit", ascending=False)
+
+    dow_data = by("Weekday")
+    dow_data.insert(0, "Order Day of Week", pd.Categorical.from_codes(
+        dow_data.pop("Weekday"), categories=DAYS_ORDER, ordered=True
+    ))
+
+    shipmode_data = by("Ship Mode", ("Profit", "Sales", "Quantity"))
+    sales = shipmode_data["Sales"].to_numpy()
+    shipmode_data["Profit per Order"] = np.divide(
+        shipmode_data["Profit"].to_numpy(), sales, out=np.zeros(len(sales)), where=sales != 0
+    )
+
+    return {
+        "total_sales": total_sales,
+        "total_profit": total_profit,
+        "avg_discount": avg_discount,
+        "profit_margin": profit_margin,
+        "monthly_data": monthly_data,
+        "category_data": category_data,
+        "region_data": region_data,
+        "loss_percentage": loss_percentage,
+        "most_profitable_category": most_profitable_category,
+        "least_profitable_category": least_profitable_category,
+        "best_region": best_region,
+        "worst_region": worst_region,
+        "subcategory_data": subcategory_data,
+        "customer_data": customer_data,
+        "dow_data": dow_data,
+        "shipmode_data": shipmode_data,
+    }
+
+
+def cube_dir_for(csv_path, cache_dir=None):
+    """
+    data/processed/superstore_cleaned.csv -> data/processed/.cache/superstore_cleaned.cube/
+    """
+    directory = cache_dir or os.path.join(os.path.dirname(os.path.abspath(csv_path)), ".cache")
+    return os.path.join(directory, os.path.splitext(os.path.basename(csv_path))[0] + ".cube")
+
+
+def load_order_cube(orders, csv_path=None, cache_dir=None):
+    """
+    The saved cube extended with any orders above its watermark, or a cube
+    rebuilt from all orders when there is none or it no longer matches.
+    Without a csv_path (or pyarrow) the cube is built in memory only.
+    """
+    directory = cube_dir_for(csv_path, cache_dir) if csv_path and feather is not None else None
+    cube = OrderCube.load(directory) if directory else None
+    new = cube.new_orders(orders) if cube is not None else None
+    if new is None:
+        cube = OrderCube.from_orders(orders)
+        print(f"🧊 Built order cube: {cube.rows:,} order lines -> {len(cube.cells):,} cells")
+    elif len(new):
+        cube.update(new)
+        print(f"🧊 Added {len(new):,} new order lines to the order cube ({len(cube.cells):,} cells)")
+    else:
+        return cube
+    if directory:
+        try:
+            cube.save(directory)
+        except OSError as e:
+            print(f"⚠️ Could not save the order cube ({e})")
+    return cube
@@ -0,0 +1,125 @@
+"""
+Indexed filtering of the order cube and order lines for the dashboard's
+global filters (order-month range, Region, Segment).
+
+A filter change must not re-scan every order, so each table the dashboard
+reads (cube cells, customer aggregates, order lines for the scatter plot)
+gets a TableIndex built once:
+
+- the table is sorted by order month once, so a month-range filter is two
+  binary searches and a contiguous block;
+- one bitmap (boolean array) per value of each filter dimension: a
+  multi-value selection is the OR of its values' bitmaps, and dimensions
+  are ANDed together.
+
+Selecting is then a few vectorized boolean operations over the block, and
+the KPIs are summed (np.bincount) over the selected cube cells, whose
+number is bounded by the dimensions rather than the order count.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from order_cube import order_month, summarize
+
+FILTER_DIMENSIONS = ["Region", "Segment"]
+SCATTER_COLUMNS = ["Discount", "Profit", "Category"]
+
+
+class TableIndex:
+    """
+    Month bounds and per-value bitmaps of one table, whose rows must be
+    sorted by month
+    """
+
+    def __init__(self, months, dimensions):
+        self.months = np.asarray(months, dtype="datetime64[ns]")
+        self.bitmaps = {}
+        for name, column in dimensions.items():
+            codes = column.cat.codes.to_numpy()
+            self.bitmaps[name] = {value: codes == i for i, value in enumerate(column.cat.categories)}
+
+    def select(self, month_range=None, filters=None):
+        """
+        Rows in month_range (inclusive Timestamps, None for all) whose
+        values are in filters[dimension] for every filtered dimension: a
+        slice when only the months are filtered, otherwise ascending
+        positions
+        """
+        lo, hi = 0, len(self.months)
+        if month_range is not None:
+            start, end = (np.datetime64(pd.Timestamp(m), "ns") for m in month_range)
+            lo = np.searchsorted(self.months, start, side="left")
+            hi = np.searchsorted(self.months, end, side="right")
+        mask = None
+        for name, values in (filters or {}).items():
+            if not values:
+                continue
+            bitmaps = self.bitmaps[name]
+            selected = np.zeros(hi - lo, dtype=bool)
+            for value in values:
+                if value in bitmaps:
+                    selected |= bitmaps[value][lo:hi]
+            mask = selected if mask is None else mask & selected
+        if mask is None:
+            return slice(lo, hi)
+        return lo + np.flatnonzero(mask)
+
+
+def _categorical(column):
+    return column if isinstance(column.dtype, pd.CategoricalDtype) else column.astype("category")
+
+
+def _sorted_by_month(frame, months):
+    order = np.argsort(np.asarray(months), kind="stable")
+    return frame.take(order).reset_index(drop=True)
+
+
+def _index(frame, months):
+    return TableIndex(months, {d: _categorical(frame[d]) for d in FILTER_DIMENSIONS})
+
+
+class OrderQueryEngine:
+    """
+    Filtered KPIs and chart data from an OrderCube (and, for the scatter
+    plot, the order lines it was built from). Every table is kept sorted by
+    month, so a month range is a contiguous block of it.
+    """
+
+    def __init__(self, cube, orders=None):
+        self.cells = _sorted_by_month(cube.cells, cube.cells["Order Month"])
+        self.customers = _sorted_by_month(cube.customers, cube.customers["Order Month"])
+        self._cell_index = _index(self.cells, self.cells["Order Month"])
+        self._customer_index = _index(self.customers, self.customers["Order Month"])
+        self.orders = None
+        if orders is not None:
+            order_months = order_month(orders).to_numpy()
+            columns = orders[SCATTER_COLUMNS + FILTER_DIMENSIONS].assign(_month=order_months)
+            columns = _sorted_by_month(columns, order_months)
+            self._order_index = _index(columns, columns.pop("_month"))
+            self.orders = columns[SCATTER_COLUMNS]
+        self.months = [pd.Timestamp(m) for m in np.unique(self._cell_index.months)]
+
+    def values(self, dimension):
+        """
+        Values of a filter dimension, for the filter widgets
+        """
+        return list(self._cell_index.bitmaps[dimension])
+
+    def query(self, month_range=None, filters=None):
+        """
+        process_data-style dictionary for the selection, plus 'rows' (order
+        lines selected), 'query_ms' and 'scatter_data' (the selected order
+        lines' SCATTER_COLUMNS)
+        """
+        start = time.perf_counter()
+        cell_rows = self._cell_index.select(month_range, filters)
+        customer_rows = self._customer_index.select(month_range, filters)
+        result = summarize(self.cells, self.customers, cell_rows, customer_rows)
+        if self.orders is not None:
+            result["scatter_data"] = self.orders.iloc[self._order_index.select(month_range, filters)]
+        result["rows"] = int(self.cells["Lines"].to_numpy()[cell_rows].sum())
+        result["query_ms"] = (time.perf_counter() - start) * 1000
+        return result
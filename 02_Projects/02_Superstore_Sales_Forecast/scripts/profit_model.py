@@ -0,0 +1,192 @@
+"""
+Serving layer for the profit/loss classifier.
+
+The pipeline's classifier stage (modeling.train_and_save_classifier), like
+the notebook, pickles a RandomForestClassifier (models/profit_classifier.pkl),
+the LabelEncoders of the text columns (models/label_encoders.pkl) and the
+feature column order (models/feature_columns.pkl); the stage also saves the
+classifier's test-set scores (models/classifier_metrics.json).
+load_profit_model reads them once and prepares everything a prediction
+needs up front:
+
+- each encoder becomes a {value: code} dict, so encoding a column is one
+  dict lookup per distinct value (pd.factorize) instead of
+  LabelEncoder.transform's sorted search per row;
+- the feature matrix is assembled directly as a float64 array in the
+  model's column order, without an intermediate DataFrame;
+- the forest is compiled into packed NumPy arrays (compiled_forest), which
+  answer small batches, a single order in particular, without sklearn's
+  per-tree call overhead; larger batches go to sklearn's own loop, run
+  single-threaded (with n_jobs=-1, as trained, every call also pays the
+  thread-pool start-up). Both give identical probabilities.
+
+Without the classifier (it is not checked in) or scikit-learn, the rule-based
+predict_profitability_batch is served through the same interface.
+"""
+
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from compiled_forest import CompiledForest
+from feature_engineering import date_parts, safe_ratio
+from profit_predictor import predict_profitability_batch
+
+MODEL_FILES = {
+    "classifier": "profit_classifier.pkl",
+    "encoders": "label_encoders.pkl",
+    "features": "feature_columns.pkl",
+}
+# Optional: absent for a classifier pickled by the notebook
+METRICS_FILE = "classifier_metrics.json"
+ORDER_COLUMNS = ["Sales", "Quantity", "Discount", "Ship Mode", "Segment", "Region", "Category", "Sub-Category"]
+ENCODED_SUFFIX = "_Encoded"
+# Batches up to this size use the compiled forest; beyond it sklearn's
+# Cython tree walk is faster than NumPy's per-step overhead
+COMPILED_MAX_ROWS = 500
+# Up to this many rows, columns are encoded with plain dict lookups
+SMALL_BATCH_ROWS = 64
+
+
+def _days(dates):
+    try:
+        # datetime64 columns, dates and ISO strings, without pandas' format inference
+        return np.asarray(dates, dtype="datetime64[D]")
+    except (TypeError, ValueError):
+        return np.asarray(pd.to_datetime(dates), dtype="datetime64[D]")
+
+
+class ProfitModel:
+    """
+    The trained classifier with its encoders; predict_proba takes order
+    lines (ORDER_COLUMNS plus Order Date and Shipping Duration, or Ship
+    Date) and returns the probability that each is profitable
+    """
+
+    kind = "classifier"
+
+    def __init__(self, classifier, encoders, feature_columns, metrics=None):
+        names = list(getattr(classifier, "feature_names_in_", feature_columns))
+        if names != list(feature_columns):
+            raise ValueError("feature_columns.pkl does not match the columns the classifier was fitted on")
+        self.classifier = classifier
+        self.feature_columns = list(feature_columns)
+        self.metrics = metrics
+        self.codes = {
+            column: {value: code for code, value in enumerate(encoder.classes_)}
+            for column, encoder in encoders.items()
+        }
+        # Fitted on a DataFrame, sklearn warns on (and checks) every array
+        # input; the columns are put in the fitted order here instead
+        if hasattr(classifier, "feature_names_in_"):
+            del classifier.feature_names_in_
+        classifier.n_jobs = None
+        self.forest = CompiledForest.from_sklearn(classifier) if hasattr(classifier, "estimators_") else None
+        self.positive = int(np.flatnonzero(classifier.classes_ == 1)[0])
+        self.name = f"Random forest ({len(classifier.estimators_)} trees)"
+
+    def _encode(self, column, values):
+        lookup = self.codes[column]
+        if len(values) <= SMALL_BATCH_ROWS:
+            # A pandas factorize costs more than a few dict lookups
+            positions, uniques = None, list(values)
+        else:
+            positions, uniques = pd.factorize(values if isinstance(values, pd.Series) else pd.Series(values))
+        unknown = [value for value in uniques if value not in lookup]
+        if unknown or (positions is not None and (positions < 0).any()):
+            unknown = unknown or ["missing"]
+            raise ValueError(f"Unknown {column} value(s) for the model: {', '.join(map(str, unknown[:5]))}")
+        codes = np.array([lookup[value] for value in uniques])
+        return codes if positions is None else codes[positions]
+
+    def features(self, orders):
+        """
+        Feature matrix (rows x feature_columns) built column by column
+        """
+        missing = [c for c in ORDER_COLUMNS + ["Order Date"] if c not in orders]
+        if "Shipping Duration" not in orders and "Ship Date" not in orders:
+            missing.append("Shipping Duration")
+        if missing:
+            raise ValueError(f"Missing input column(s): {', '.join(missing)}")
+
+        order_days = _days(orders["Order Date"])
+        sales = np.asarray(orders["Sales"], dtype=np.float64)
+        quantity = np.asarray(orders["Quantity"], dtype=np.float64)
+        if "Shipping Duration" in orders:
+            shipping = np.asarray(orders["Shipping Duration"], dtype=np.float64)
+        else:
+            shipping = (_days(orders["Ship Date"]) - order_days).astype(np.float64)
+        values = {
+            "Sales": sales,
+            "Quantity": quantity,
+            "Discount": np.asarray(orders["Discount"], dtype=np.float64),
+            "Shipping Duration": shipping,
+            "Sales per Quantity": safe_ratio(sales, quantity),
+            **date_parts(order_days),
+        }
+
+        matrix = np.empty((len(sales), len(self.feature_columns)), dtype=np.float64)
+        for i, name in enumerate(self.feature_columns):
+            if name.endswith(ENCODED_SUFFIX):
+                column = name[:-len(ENCODED_SUFFIX)]
+                matrix[:, i] = self._encode(column, orders[column])
+            else:
+                matrix[:, i] = values[name]
+        return matrix
+
+    def predict_proba(self, orders):
+        features = self.features(orders)
+        if self.forest is not None and len(features) <= COMPILED_MAX_ROWS:
+            return self.forest.predict_proba(features)[:, self.positive]
+        return self.classifier.predict_proba(features)[:, self.positive]
+
+
+class HeuristicModel:
+    """
+    Rule-based predict_profitability_batch behind the ProfitModel interface
+    """
+
+    kind = "heuristic"
+    name = "Rule-based heuristic"
+    metrics = None
+
+    def predict_proba(self, orders):
+        return predict_profitability_batch(orders)
+
+
+def load_metrics(model_dir):
+    """
+    {metric: score} saved with the classifier, or None when there are none
+    """
+    try:
+        with open(os.path.join(model_dir, METRICS_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_profit_model(model_dir):
+    """
+    ProfitModel from the pickles in model_dir (with the saved test-set
+    metrics, if any), or HeuristicModel when the classifier (or
+    scikit-learn) is not available
+    """
+    paths = {key: os.path.join(model_dir, name) for key, name in MODEL_FILES.items()}
+    missing = [os.path.basename(p) for p in paths.values() if not os.path.exists(p)]
+    if missing:
+        print(f"ℹ️ No trained classifier ({', '.join(missing)} missing in {model_dir}); using the heuristic")
+        return HeuristicModel()
+    try:
+        loaded = {}
+        for key, path in paths.items():
+            with open(path, "rb") as f:
+                loaded[key] = pickle.load(f)
+        model = ProfitModel(loaded["classifier"], loaded["encoders"], loaded["features"], load_metrics(model_dir))
+    except (ImportError, OSError, pickle.UnpicklingError, AttributeError, ValueError) as e:
+        print(f"⚠️ Could not load the classifier ({e}); using the heuristic")
+        return HeuristicModel()
+    print(f"🤖 Loaded {model.name} from {paths['classifier']}")
+    return model
@@ -0,0 +1,110 @@
+"""
+Profit/loss scoring for the dashboard's predictor.
+
+predict_profitability scores one order with the rule-of-thumb adjustments
+found in the analysis (discount, category, sub-category, region, segment and
+order size). predict_profitability_batch applies the same rules to whole
+order books: each text column is factorized once and its adjustment looked
+up per code, and the numeric thresholds are np.select calls. The adjustments
+are added in the same order as in the scalar function, so the batch scores
+are bit-for-bit identical to scoring the rows one by one.
+"""
+
+import numpy as np
+import pandas as pd
+
+BASE_PROBABILITY = 0.7
+
+# Adjustments per value; values not listed leave the probability unchanged
+CATEGORY_ADJUSTMENTS = {"Technology": 0.2, "Furniture": -0.1}
+SUB_CATEGORY_ADJUSTMENTS = {"Tables": -0.3, "Phones": 0.15, "Accessories": 0.15}
+REGION_ADJUSTMENTS = {"West": 0.1, "East": 0.1, "Central": -0.05}
+SEGMENT_ADJUSTMENTS = {"Corporate": 0.05, "Home Office": 0.03}
+
+BATCH_COLUMNS = {
+    "sales": "Sales",
+    "discount": "Discount",
+    "category": "Category",
+    "sub_category": "Sub-Category",
+    "region": "Region",
+    "segment": "Segment",
+}
+
+
+def predict_profitability(sales, quantity, discount, ship_mode, segment, region, category, sub_category):
+    probability = BASE_PROBABILITY
+    if discount > 0.2:
+        probability -= 0.6
+    elif discount > 0.1:
+        probability -= 0.2
+    elif discount == 0:
+        probability += 0.1
+    if category == 'Technology':
+        probability += 0.2
+    elif category == 'Furniture':
+        probability -= 0.1
+    if sub_category == 'Tables':
+        probability -= 0.3
+    elif sub_category in ['Phones', 'Accessories']:
+        probability += 0.15
+    if region in ['West', 'East']:
+        probability += 0.1
+    elif region == 'Central':
+        probability -= 0.05
+    if segment == 'Corporate':
+        probability += 0.05
+    elif segment == 'Home Office':
+        probability += 0.03
+    if sales > 500:
+        probability += 0.05
+    elif sales < 50:
+        probability -= 0.1
+    return max(0, min(1, probability))
+
+
+def _lookup(values, adjustments):
+    """
+    Adjustment per row: one table entry per distinct value (plus a trailing
+    0.0 for missing values, code -1), indexed by the factorized codes
+    """
+    codes, uniques = pd.factorize(values if isinstance(values, pd.Series) else pd.Series(values))
+    table = np.array([adjustments.get(value, 0.0) for value in uniques] + [0.0])
+    return table[codes]
+
+
+def predict_profitability_batch(orders=None, **columns):
+    """
+    Probability that each order is profitable, as a float64 array.
+
+    orders is a DataFrame (or mapping of arrays) with the Sales, Discount,
+    Category, Sub-Category, Region and Segment columns; alternatively pass
+    the arrays as sales=, discount=, category=, sub_category=, region= and
+    segment= (keywords override columns of orders).
+    """
+    unknown = set(columns) - set(BATCH_COLUMNS)
+    if unknown:
+        raise TypeError(f"Unexpected columns: {', '.join(sorted(unknown))}")
+    values = {}
+    for name, column in BATCH_COLUMNS.items():
+        if name in columns:
+            values[name] = columns[name]
+        elif orders is not None and column in orders:
+            values[name] = orders[column]
+        else:
+            raise ValueError(f"Missing input column: {column}")
+
+    discount = np.asarray(values["discount"], dtype=np.float64)
+    sales = np.asarray(values["sales"], dtype=np.float64)
+    if len(discount) != len(sales):
+        raise ValueError("Input columns must have the same length")
+
+    # Same conditions and order of additions as predict_profitability; a NaN
+    # fails every comparison there and selects the 0.0 default here
+    probability = np.full(len(discount), BASE_PROBABILITY)
+    probability += np.select([discount > 0.2, discount > 0.1, discount == 0], [-0.6, -0.2, 0.1], 0.0)
+    probability += _lookup(values["category"], CATEGORY_ADJUSTMENTS)
+    probability += _lookup(values["sub_category"], SUB_CATEGORY_ADJUSTMENTS)
+    probability += _lookup(values["region"], REGION_ADJUSTMENTS)
+    probability += _lookup(values["segment"], SEGMENT_ADJUSTMENTS)
+    probability += np.select([sales > 500, sales < 50], [0.05, -0.1], 0.0)
+    return np.clip(probability, 0, 1, out=probability)
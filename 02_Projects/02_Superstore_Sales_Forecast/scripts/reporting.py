@@ -0,0 +1,53 @@
+"""
+Reporting stage: a Markdown summary of the cleaned data and the model
+comparison (reports/pipeline_report.md).
+
+The KPIs come from the same order cube the dashboard reads, so the report
+and the dashboard's Overview agree.
+"""
+
+import pandas as pd
+
+from data_cache import read_orders_csv
+from order_cube import OrderCube
+
+
+def _table(frame, formats):
+    columns = list(frame.columns)
+    lines = ["| " + " | ".join(columns) + " |", "|" + "|".join("---" for _ in columns) + "|"]
+    for row in frame.itertuples(index=False):
+        cells = [formats.get(col, "{}").format(value) for col, value in zip(columns, row)]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def write_report(cleaned_path, metrics_path, report_path):
+    """
+    Pipeline stage: write the KPI and model summary to report_path
+    """
+    orders = read_orders_csv(cleaned_path)
+    summary = OrderCube.from_orders(orders).summarize()
+    metrics = pd.read_csv(metrics_path)
+    money = {"Sales": "${:,.0f}", "Profit": "${:,.0f}"}
+
+    sections = [
+        "# Superstore Pipeline Report",
+        f"{len(orders):,} order lines, {orders['Order Date'].min():%Y-%m-%d} to {orders['Order Date'].max():%Y-%m-%d}.",
+        "## Key figures",
+        "\n".join([
+            f"- Total sales: ${summary['total_sales']:,.0f}",
+            f"- Total profit: ${summary['total_profit']:,.0f}",
+            f"- Profit margin: {summary['profit_margin']:.1f}%",
+            f"- Average discount: {summary['avg_discount']:.1f}%",
+            f"- Loss-making share of orders discounted above 20%: {summary['loss_percentage']:.0f}%",
+        ]),
+        "## Profit by region",
+        _table(summary["region_data"][["Region", "Sales", "Profit"]], money),
+        "## Profit by category",
+        _table(summary["category_data"][["Category", "Sales", "Profit"]], money),
+        "## Profit models (test set)",
+        _table(metrics, {"RMSE": "{:,.2f}", "MAE": "{:,.2f}", "R2": "{:.3f}"}),
+    ]
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("\n\n".join(sections) + "\n")
+    print(f"📝 Report -> {report_path}")
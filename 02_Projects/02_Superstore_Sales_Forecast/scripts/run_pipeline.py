@@ -1,47 +1,274 @@
 #!/usr/bin/env python3
-# run_pipeline.py
+"""
+Superstore analysis pipeline: raw export -> cleaned data -> features ->
+models and report, as a small DAG of cached stages.
 
+Each stage declares its input and output files (paths relative to the
+project directory); a stage depends on the stages that produce its inputs.
+
+- Content-addressed caching: a stage's key is the SHA-256 of its code
+  (the module files it runs), the contents of its inputs and the library
+  versions. Outputs are stored under .cache/pipeline/objects/ by their own
+  hash, and .cache/pipeline/stages/<key>.json records which outputs a key
+  produced. A stage whose key is known is not run: its outputs are left as
+  they are when they already match, or restored from the store (e.g. after
+  switching back to an earlier raw file).
+- Parallel execution: stages whose inputs are ready run at the same time
+  in worker processes (--jobs), e.g. the regressor comparison and the
+  profit/loss classifier once the features exist.
+
+Usage:
+    python scripts/run_pipeline.py [--jobs N] [--force]
+"""
+
+import argparse
+import hashlib
+import json
 import os
+import shutil
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import NamedTuple
+
+import numpy as np
 import pandas as pd
-# NOTE: The following imports would only work if you create the corresponding .py files
-# from scripts.data_cleaning import clean_data
-# from scripts.feature_engineering import engineer_features
-# from scripts.modeling import train_and_save_model
+import sklearn
 
-def main():
+import data_cleaning
+import feature_engineering
+import modeling
+import reporting
+from data_cache import file_sha256
+
+PIPELINE_VERSION = 1
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+CACHE_DIR = os.path.join(".cache", "pipeline")
+LIBRARIES = {"pandas": pd.__version__, "numpy": np.__version__, "scikit-learn": sklearn.__version__}
+
+RAW_PATH = "data/raw/Sample.csv"
+CLEANED_PATH = "data/processed/superstore_cleaned.csv"
+MODEL_READY_PATH = "data/processed/superstore_model_ready.csv"
+MODEL_PATH = "models/best_profit_predictor.pkl"
+METRICS_PATH = "reports/model_comparison.csv"
+REPORT_PATH = "reports/pipeline_report.md"
+
+
+class Stage(NamedTuple):
+    name: str
+    func: object    # module-level function called as func(*inputs, *outputs)
+    inputs: tuple
+    outputs: tuple
+    code: tuple     # files in scripts/ whose source is part of the stage key
+
+
+STAGES = [
+    Stage("clean", data_cleaning.clean_file, (RAW_PATH,), (CLEANED_PATH,), ("data_cleaning.py",)),
+    Stage("features", feature_engineering.engineer_file, (CLEANED_PATH,), (MODEL_READY_PATH,), ("feature_engineering.py",)),
+    Stage("train", modeling.train_and_save_model, (MODEL_READY_PATH,), (MODEL_PATH, METRICS_PATH), ("modeling.py",)),
+    Stage(
+        "classifier",
+        modeling.train_and_save_classifier,
+        (MODEL_READY_PATH, CLEANED_PATH),
+        (
+            "models/profit_classifier.pkl",
+            "models/label_encoders.pkl",
+            "models/feature_columns.pkl",
+            "models/classifier_metrics.json",
+        ),
+        ("modeling.py",),
+    ),
+    Stage(
+        "report",
+        reporting.write_report,
+        (CLEANED_PATH, METRICS_PATH),
+        (REPORT_PATH,),
+        ("reporting.py", "data_cache.py", "order_cube.py"),
+    ),
+]
+
+
+def dependencies(stages):
+    """
+    {stage: names of the stages producing its inputs}, checking that every
+    output has one producer and that there is no cycle
+    """
+    producers = {}
+    for stage in stages:
+        for path in stage.outputs:
+            if path in producers:
+                raise ValueError(f"{path} is produced by both {producers[path]} and {stage.name}")
+            producers[path] = stage.name
+    deps = {stage.name: {producers[p] for p in stage.inputs if p in producers} for stage in stages}
+    ordered, remaining = set(), dict(deps)
+    while remaining:
+        ready = [name for name, needs in remaining.items() if needs <= ordered]
+        if not ready:
+            raise ValueError(f"Dependency cycle between stages: {', '.join(sorted(remaining))}")
+        for name in ready:
+            ordered.add(name)
+            del remaining[name]
+    return deps
+
+
+def stage_key(stage, root):
+    """
+    SHA-256 of everything a stage's outputs are a function of
+    """
+    description = {
+        "pipeline": PIPELINE_VERSION,
+        "stage": stage.name,
+        "code": {name: file_sha256(os.path.join(SCRIPTS_DIR, name)) for name in stage.code},
+        "inputs": {path: file_sha256(os.path.join(root, path)) for path in stage.inputs},
+        "outputs": list(stage.outputs),
+        "libraries": LIBRARIES,
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+class ArtifactStore:
     """
-    Main function to run the entire data analysis pipeline.
+    Stage outputs stored by content hash, and the outputs each stage key
+    produced
     """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def _record_path(self, key):
+        return os.path.join(self.directory, "stages", key + ".json")
+
+    def lookup(self, key):
+        """
+        {output path: hash} recorded for key, or None when unknown or when
+        a stored object is missing
+        """
+        try:
+            with open(self._record_path(key)) as f:
+                outputs = json.load(f)["outputs"]
+        except (OSError, ValueError, KeyError):
+            return None
+        if not all(os.path.exists(self._object_path(digest)) for digest in outputs.values()):
+            return None
+        return outputs
+
+    def restore(self, outputs, root):
+        """
+        Bring the output files to the recorded contents; True if any had
+        to be copied from the store
+        """
+        copied = False
+        for path, digest in outputs.items():
+            target = os.path.join(root, path)
+            if os.path.exists(target) and file_sha256(target) == digest:
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            _copy_atomic(self._object_path(digest), target)
+            copied = True
+        return copied
+
+    def save(self, key, stage, root):
+        outputs = {}
+        for path in stage.outputs:
+            source = os.path.join(root, path)
+            digest = file_sha256(source)
+            if not os.path.exists(self._object_path(digest)):
+                os.makedirs(os.path.dirname(self._object_path(digest)), exist_ok=True)
+                _copy_atomic(source, self._object_path(digest))
+            outputs[path] = digest
+        record = {"stage": stage.name, "outputs": outputs, "created": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        os.makedirs(os.path.dirname(self._record_path(key)), exist_ok=True)
+        with open(self._record_path(key), "w") as f:
+            json.dump(record, f, indent=2)
+
+
+def _copy_atomic(source, target):
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    try:
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _run_stage(func, paths):
+    """
+    Runs in a worker process; returns the stage's wall time
+    """
+    start = time.perf_counter()
+    func(*paths)
+    return time.perf_counter() - start
+
+
+def run_pipeline(root=PROJECT_ROOT, stages=STAGES, jobs=None, force=False):
+    """
+    Run the stages whose key is not cached, in dependency order and in
+    parallel where possible; returns {stage: status}
+    """
+    deps = dependencies(stages)
+    store = ArtifactStore(os.path.join(root, CACHE_DIR))
+    by_name = {stage.name: stage for stage in stages}
+    pending, done, status, running = dict(by_name), set(), {}, {}
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+        while pending or running:
+            for name in [n for n in pending if deps[n] <= done]:
+                stage = pending.pop(name)
+                missing = [p for p in stage.inputs if not os.path.exists(os.path.join(root, p))]
+                if missing:
+                    raise FileNotFoundError(f"{name}: missing input(s) {', '.join(missing)}")
+                key = stage_key(stage, root)
+                outputs = None if force else store.lookup(key)
+                if outputs is not None:
+                    status[name] = "restored" if store.restore(outputs, root) else "up to date"
+                    print(f"⏭️  {name}: {status[name]} ({key[:12]})")
+                    done.add(name)
+                    continue
+                for path in stage.outputs:
+                    os.makedirs(os.path.dirname(os.path.join(root, path)), exist_ok=True)
+                print(f"▶️  {name}: running ({key[:12]})")
+                paths = [os.path.join(root, p) for p in stage.inputs + stage.outputs]
+                running[executor.submit(_run_stage, stage.func, paths)] = (stage, key)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, key = running.pop(future)
+                try:
+                    seconds = future.result()
+                except Exception:
+                    print(f"❌ {stage.name} failed; stages depending on it were not run")
+                    for other in running:
+                        other.cancel()
+                    raise
+                store.save(key, stage, root)
+                status[stage.name] = f"ran in {seconds:.1f} s"
+                print(f"✅ {stage.name}: {status[stage.name]}")
+                done.add(stage.name)
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--project-dir", default=PROJECT_ROOT, help="project directory the stage paths are relative to")
+    parser.add_argument("--jobs", type=int, default=None, help="stages run at the same time (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="run every stage, ignoring the cache")
+    args = parser.parse_args()
+
     print("🚀 Starting Superstore Analysis Pipeline...")
+    start = time.perf_counter()
+    try:
+        run_pipeline(os.path.abspath(args.project_dir), jobs=args.jobs, force=args.force)
+    except Exception as e:
+        print(f"❌ Pipeline failed: {e}")
+        sys.exit(1)
+    print(f"\n✅ Pipeline finished successfully in {time.perf_counter() - start:.1f} s!")
 
-    # Define paths
-    raw_path = "data/raw/Sample - Superstore.csv"
-    cleaned_path = "data/processed/superstore_cleaned.csv"
-    model_ready_path = "data/processed/superstore_model_ready.csv"
-    model_path = "models/best_profit_predictor.pkl"
-
-    # 1. Data Cleaning (Placeholder)
-    print("\n[1/4] Cleaning data...")
-    # df_clean = clean_data(raw_path)
-    # df_clean.to_csv(cleaned_path, index=False)
-    print(f"Cleaned data would be saved to {cleaned_path}")
-
-    # 2. Feature Engineering (Placeholder)
-    print("\n[2/4] Engineering features...")
-    # df_model = engineer_features(cleaned_path)
-    # df_model.to_csv(model_ready_path, index=False)
-    print(f"Model-ready data would be saved to {model_ready_path}")
-
-    # 3. Modeling (Placeholder)
-    print("\n[3/4] Training model...")
-    # train_and_save_model(model_ready_path, model_path)
-    print(f"Best model would be saved to {model_path}")
-
-    # 4. Reporting (Placeholder)
-    print("\n[4/4] Generating reports...")
-    print("Reports would be generated.")
-
-    print("\n✅ Pipeline finished successfully!")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,155 @@
+"""
+Server-side reduction of the Discount vs Profit scatter plot.
+
+Plotly ships every point to the browser as JSON, so a scatter of all order
+lines grows linearly with the history and stalls the page at ~1M rows.
+plan_scatter picks a mode from the row count:
+
+- raw:     up to max_points rows, every point is drawn;
+- sample:  up to density_threshold rows, a stratified random sample per
+           Category (each category keeps its share of the points, with a
+           floor so small categories stay visible);
+- density: above that, a 2D histogram (Discount x Profit counts) drawn as
+           a heatmap.
+
+In the sample and density modes the Profit outliers (outside
+Q1 - 3 IQR .. Q3 + 3 IQR) are always drawn as exact points, up to
+max_outliers of the most extreme ones, so the loss-making tail the chart is
+about is never sampled away. Everything else is sampled or binned.
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+MAX_POINTS = 20_000
+DENSITY_THRESHOLD = 1_000_000
+MAX_OUTLIERS = 5_000
+MIN_POINTS_PER_CATEGORY = 500
+OUTLIER_IQR_FACTOR = 3.0
+PROFIT_BINS = 120
+
+
+class ScatterPlan(NamedTuple):
+    mode: str
+    total_rows: int
+    points: pd.DataFrame            # rows drawn as points (sampled rows and outliers, or all)
+    outliers: int
+    density: Optional[tuple] = None  # (counts, discount_centers, profit_centers) in density mode
+
+
+def _outlier_positions(profit, max_outliers):
+    q1, q3 = np.quantile(profit, [0.25, 0.75])
+    low, high = q1 - OUTLIER_IQR_FACTOR * (q3 - q1), q3 + OUTLIER_IQR_FACTOR * (q3 - q1)
+    distance = np.maximum(low - profit, profit - high)
+    positions = np.flatnonzero(distance > 0)
+    if len(positions) > max_outliers:
+        positions = positions[np.argpartition(distance[positions], -max_outliers)[-max_outliers:]]
+    return np.sort(positions)
+
+
+def _stratified_sample(codes, candidates, max_points, rng):
+    """
+    Positions sampled from candidates, per category code in proportion to
+    its size (at least MIN_POINTS_PER_CATEGORY where it has them)
+    """
+    candidate_codes = codes[candidates]
+    counts = np.bincount(candidate_codes[candidate_codes >= 0], minlength=codes.max() + 1)
+    quota = np.maximum(np.round(max_points * counts / max(counts.sum(), 1)), MIN_POINTS_PER_CATEGORY)
+    quota = np.minimum(quota, counts).astype(np.int64)
+    picked = []
+    for code in np.flatnonzero(counts):
+        members = candidates[candidate_codes == code]
+        picked.append(members[rng.choice(len(members), quota[code], replace=False)])
+    return np.sort(np.concatenate(picked)) if picked else np.empty(0, dtype=np.int64)
+
+
+def plan_scatter(
+    df,
+    x="Discount",
+    y="Profit",
+    color="Category",
+    max_points=MAX_POINTS,
+    density_threshold=DENSITY_THRESHOLD,
+    max_outliers=MAX_OUTLIERS,
+    mode="auto",
+    seed=20,
+):
+    """
+    Decide how to draw df[x] vs df[y] (see module docstring); mode forces
+    'raw', 'sample' or 'density'. The sample is seeded, so reruns draw the
+    same points.
+    """
+    total = len(df)
+    if mode == "auto":
+        mode = "raw" if total <= max_points else "sample" if total <= density_threshold else "density"
+    if mode == "raw" or total == 0:
+        return ScatterPlan("raw", total, df[[x, y, color]], 0)
+
+    profit = df[y].to_numpy(dtype=np.float64)
+    outliers = _outlier_positions(profit, max_outliers)
+    inliers = np.ones(total, dtype=bool)
+    inliers[outliers] = False
+
+    if mode == "sample":
+        colors = df[color]
+        codes = colors.cat.codes.to_numpy() if isinstance(colors.dtype, pd.CategoricalDtype) else pd.factorize(colors)[0]
+        rng = np.random.default_rng(seed)
+        sampled = _stratified_sample(codes, np.flatnonzero(inliers & (codes >= 0)), max_points, rng)
+        positions = np.union1d(sampled, outliers)
+        return ScatterPlan("sample", total, df[[x, y, color]].iloc[positions], len(outliers))
+
+    return ScatterPlan("density", total, df[[x, y, color]].iloc[outliers], len(outliers),
+                       _density(df[x].to_numpy(dtype=np.float64)[inliers], profit[inliers]))
+
+
+def _density(discount, profit):
+    """
+    (counts, discount_centers, profit_centers) of the points not drawn
+    exactly, binned with one np.bincount over combined bin numbers
+    """
+    # Discounts come in a few fixed steps: one bin per distinct value
+    steps = np.sort(pd.unique(discount))
+    if len(steps) <= 50:
+        discount_bins, discount_centers = np.searchsorted(steps, discount), steps
+    else:
+        edges = np.linspace(steps[0], steps[-1], 51)
+        discount_bins = np.clip(np.searchsorted(edges, discount, side="right") - 1, 0, 49)
+        discount_centers = (edges[:-1] + edges[1:]) / 2
+    low, high = (profit.min(), profit.max()) if len(profit) else (0.0, 1.0)
+    width = (high - low) / PROFIT_BINS or 1.0
+    profit_bins = np.minimum(((profit - low) / width).astype(np.int64), PROFIT_BINS - 1)
+    counts = np.bincount(
+        discount_bins * PROFIT_BINS + profit_bins, minlength=len(discount_centers) * PROFIT_BINS
+    ).reshape(len(discount_centers), PROFIT_BINS)
+    return counts, discount_centers, low + width * (np.arange(PROFIT_BINS) + 0.5)
+
+
+def build_scatter_figure(plan, x="Discount", y="Profit", color="Category"):
+    if plan.mode != "density":
+        return px.scatter(plan.points, x=x, y=y, color=color, template="plotly_dark", opacity=0.7)
+    counts, discount_centers, profit_centers = plan.density
+    fig = go.Figure(go.Heatmap(
+        x=discount_centers,
+        y=profit_centers,
+        # log scale: a few dense cells would otherwise wash out the rest
+        z=np.where(counts.T > 0, np.log10(np.maximum(counts.T, 1)), np.nan),
+        customdata=counts.T,
+        hovertemplate=f"{x}: %{{x:.2f}}<br>{y}: %{{y:,.0f}}<br>Orders: %{{customdata:,.0f}}<extra></extra>",
+        colorscale="Viridis",
+        colorbar=dict(title="log10 orders"),
+    ))
+    fig.update_layout(template="plotly_dark")
+    for trace in px.scatter(plan.points, x=x, y=y, color=color, opacity=0.8).data:
+        fig.add_trace(trace)
+    return fig
+
+
+def payload_bytes(fig):
+    """
+    Size of the figure JSON sent to the browser
+    """
+    return len(fig.to_json().encode())
@@ -5,6 +5,13 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import os
+import time
+
+from data_cache import load_orders, source_fingerprint
+from order_cube import load_order_cube
+from order_query import OrderQueryEngine
+from profit_model import METRICS_FILE, MODEL_FILES, load_profit_model
+from scatter_downsample import build_scatter_figure, payload_bytes, plan_scatter
 
 # --- Page Configuration and Custom CSS ---
 st.set_page_config(
@@ -274,8 +281,9 @@ st.markdown(
 )
 
 # --- Data Loading and Processing ---
-@st.cache_data
-def load_data():
+REQUIRED_COLUMNS = ['Sales', 'Profit', 'Discount', 'Order Date', 'Ship Date', 'Category', 'Region', 'Sub-Category', 'Quantity', 'Ship Mode', 'Segment', 'Customer ID']
+
+def find_data_file():
     # Get the directory where this script is located
     script_dir = os.path.dirname(os.path.abspath(__file__))
     # Get the project root (one level up from scripts/)
@@ -304,14 +312,7 @@ def load_data():
     # Try each path until one works
     for path in possible_paths:
         if os.path.exists(path):
-            # print to console for debugging; Streamlit will show this in logs
-            print(f"✅ Successfully found data at: {path}")
-            try:
-                df = pd.read_csv(path, parse_dates=['Order Date', 'Ship Date'])
-                return df
-            except Exception as e:
-                st.error(f"Error reading CSV: {e}")
-                return None
+            return path
     
     # Debug: Show all paths that were checked
     debug_info = f"""
@@ -345,131 +346,94 @@ def load_data():
     )
     return None
 
-@st.cache_data
-def process_data(df):
-    if df is None:
-        return None
-    
-    # Ensure required columns exist
-    required_cols = ['Sales', 'Profit', 'Discount', 'Order Date', 'Ship Date', 'Category', 'Region', 'Sub-Category', 'Quantity', 'Ship Mode', 'Segment', 'Customer ID']
-    for c in required_cols:
-        if c not in df.columns:
-            st.error(f"Required column missing from dataset: {c}")
-            return None
-
-    # Calculate KPIs
-    total_sales = df['Sales'].sum()
-    total_profit = df['Profit'].sum()
-    avg_discount = df['Discount'].mean() * 100
-    profit_margin = (total_profit / total_sales) * 100 if total_sales != 0 else 0
-
-    # Process monthly data
-    df['Order Month'] = df['Order Date'].dt.to_period('M')
-    monthly_data = df.groupby('Order Month').agg({'Sales': 'sum', 'Profit': 'sum'}).reset_index()
-    monthly_data['Order Month'] = monthly_data['Order Month'].dt.to_timestamp()
-
-    # Process category/region data
-    category_data = df.groupby('Category').agg({'Profit': 'sum', 'Sales': 'sum'}).reset_index()
-    region_data = df.groupby('Region').agg({'Profit': 'sum', 'Sales': 'sum'}).reset_index()
-
-    # Generate insights
-    high_discount_orders = df[df['Discount'] > 0.2]
-    loss_making_high_discount = high_discount_orders[high_discount_orders['Profit'] < 0]
-    loss_percentage = (len(loss_making_high_discount) / len(high_discount_orders)) * 100 if len(high_discount_orders) > 0 else 0
-
-    if len(category_data) > 0:
-        most_profitable_category = category_data.loc[category_data['Profit'].idxmax(), 'Category']
-        least_profitable_category = category_data.loc[category_data['Profit'].idxmin(), 'Category']
-    else:
-        most_profitable_category = None
-        least_profitable_category = None
-
-    if len(region_data) > 0:
-        best_region = region_data.loc[region_data['Profit'].idxmax(), 'Region']
-        worst_region = region_data.loc[region_data['Profit'].idxmin(), 'Region']
-    else:
-        best_region = None
-        worst_region = None
-
-    # --- New Deep Dive Data Processing ---
-
-    # 1. Sub-Category Performance
-    subcategory_data = df.groupby('Sub-Category').agg({'Profit': 'sum', 'Sales': 'sum'}).reset_index()
-    subcategory_data = subcategory_data.sort_values(by='Profit', ascending=True)  # Sort for horizontal bar
-
-    # 2. Top Customers (Customer Lifetime Value)
-    customer_data = df.groupby('Customer ID').agg({'Profit': 'sum', 'Sales': 'sum'}).reset_index()
-    customer_data = customer_data.sort_values(by='Profit', ascending=False)
-
-    # 3. Day of Week Analysis
-    df['Order Day of Week'] = df['Order Date'].dt.day_name()
-    dow_data = df.groupby('Order Day of Week').agg({'Profit': 'sum', 'Sales': 'sum'}).reset_index()
-    # Ensure correct order for days of the week
-    days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    dow_data['Order Day of Week'] = pd.Categorical(dow_data['Order Day of Week'], categories=days_order, ordered=True)
-    dow_data = dow_data.sort_values('Order Day of Week')
-
-    # 4. Ship Mode Analysis
-    shipmode_data = df.groupby('Ship Mode').agg({'Profit': 'sum', 'Sales': 'sum', 'Quantity': 'sum'}).reset_index()
-    # avoid division by zero
-    shipmode_data['Profit per Order'] = shipmode_data.apply(lambda r: (r['Profit'] / r['Sales']) if r['Sales'] != 0 else 0.0, axis=1)
-
-    return {
-        'total_sales': total_sales,
-        'total_profit': total_profit,
-        'avg_discount': avg_discount,
-        'profit_margin': profit_margin,
-        'monthly_data': monthly_data,
-        'category_data': category_data,
-        'region_data': region_data,
-        'loss_percentage': loss_percentage,
-        'most_profitable_category': most_profitable_category,
-        'least_profitable_category': least_profitable_category,
-        'best_region': best_region,
-        'worst_region': worst_region,
-        'subcategory_data': subcategory_data,
-        'customer_data': customer_data,
-        'dow_data': dow_data,
-        'shipmode_data': shipmode_data,
-        'df': df
-    }
-
-def predict_profitability(sales, quantity, discount, ship_mode, segment, region, category, sub_category):
-    probability = 0.7
-    if discount > 0.2:
-        probability -= 0.6
-    elif discount > 0.1:
-        probability -= 0.2
-    elif discount == 0:
-        probability += 0.1
-    if category == 'Technology':
-        probability += 0.2
-    elif category == 'Furniture':
-        probability -= 0.1
-    if sub_category == 'Tables':
-        probability -= 0.3
-    elif sub_category in ['Phones', 'Accessories']:
-        probability += 0.15
-    if region in ['West', 'East']:
-        probability += 0.1
-    elif region == 'Central':
-        probability -= 0.05
-    if segment == 'Corporate':
-        probability += 0.05
-    elif segment == 'Home Office':
-        probability += 0.03
-    if sales > 500:
-        probability += 0.05
-    elif sales < 50:
-        probability -= 0.1
-    return max(0, min(1, probability))
+@st.cache_resource(max_entries=1, show_spinner="Loading order history...")
+def load_data(data_path, fingerprint):
+    # One shared, read-only copy of the orders (and the cube and query engine
+    # built on them) for every session and rerun: cache_resource hands out
+    # the objects themselves instead of unpickling a copy, and the key is the
+    # file's size/mtime fingerprint, so the frame is never hashed. Only the
+    # current dataset version is kept; a changed file evicts the old one.
+    # Printed once per load; Streamlit shows it in the logs
+    print(f"✅ Successfully found data at: {data_path}")
+    # Memory-mapped columnar copy when it is current, CSV parse otherwise;
+    # derived columns (Order Month, Order Weekday) are added at load
+    df = load_orders(data_path)
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Required column missing from dataset: {', '.join(missing)}")
+    # Pre-aggregated order cube (built once and saved next to the data, then
+    # only extended with new orders) and the indexed filter engine over it
+    cube = load_order_cube(df, data_path)
+    return df, cube, OrderQueryEngine(cube, df)
+
+@st.cache_data(max_entries=1)
+def process_data(data_path, fingerprint):
+    # All KPIs and chart data of the unfiltered views; small frames only, so
+    # the cached result is cheap to copy on every rerun
+    _, cube, _ = load_data(data_path, fingerprint)
+    return cube.summarize()
+
+@st.cache_data(max_entries=32)
+def plan_discount_scatter(_scatter_data, fingerprint, month_range, filters):
+    # Keyed on the dataset version and the filter selection instead of the
+    # (possibly multi-million-row) scatter columns
+    return plan_scatter(_scatter_data)
+
+def find_model_dir(data_path):
+    # models/ of the project the data file belongs to (data/processed/ -> ../../models)
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(data_path)))), "models")
+
+def model_fingerprint(model_dir):
+    # Modification times of the model files (and its saved metrics), so
+    # retraining reloads the model
+    paths = [os.path.join(model_dir, name) for name in [*MODEL_FILES.values(), METRICS_FILE]]
+    return tuple(os.stat(p).st_mtime_ns if os.path.exists(p) else None for p in paths)
+
+@st.cache_resource(max_entries=1, show_spinner="Loading profit model...")
+def load_model(model_dir, fingerprint):
+    # Unpickled once per process and shared by every session: the classifier
+    # (or the heuristic when none is trained) with its encoder lookups ready.
+    # Retraining changes the fingerprint and evicts the previous model
+    return load_profit_model(model_dir)
+
+def render_filters(engine):
+    # Global filter bar; returns (month_range, filters), where None / an
+    # empty selection means no filter
+    months = engine.months
+    filter1, filter2, filter3 = st.columns([2, 1, 1])
+    month_range = None
+    with filter1:
+        if len(months) > 1:
+            start, end = st.select_slider(
+                "Order months",
+                options=months,
+                value=(months[0], months[-1]),
+                format_func=lambda m: m.strftime('%b %Y'),
+                key="filter_months",
+            )
+            if (start, end) != (months[0], months[-1]):
+                month_range = (start, end)
+    with filter2:
+        regions = st.multiselect("Region", options=engine.values('Region'), placeholder="All regions", key="filter_regions")
+    with filter3:
+        segments = st.multiselect("Segment", options=engine.values('Segment'), placeholder="All segments", key="filter_segments")
+    return month_range, {'Region': regions, 'Segment': segments}
 
 # --- Main App Logic ---
 def main():
-    df = load_data()
-    processed_data = process_data(df)
-    if processed_data is None:
+    data_path = find_data_file()
+    if data_path is None:
         st.stop()
+    fingerprint = source_fingerprint(data_path, with_hash=False)
+    try:
+        df, _, engine = load_data(data_path, fingerprint)
+    except Exception as e:
+        st.error(f"Error reading CSV: {e}")
+        st.stop()
+    processed_data = process_data(data_path, fingerprint)
+    model_dir = find_model_dir(data_path)
+    model = load_model(model_dir, model_fingerprint(model_dir))
+    scatter_data = engine.orders
 
     # Initialize session state for navigation
     if 'page' not in st.session_state:
@@ -518,6 +482,18 @@ def main():
             st.session_state.page = 'deepdive'
             st.rerun()
 
+    # --- Global Filters (overview, insights and deep dive pages) ---
+    month_range, filters = None, {}
+    if st.session_state.page in ('overview', 'insights', 'deepdive'):
+        month_range, filters = render_filters(engine)
+        if month_range is not None or any(filters.values()):
+            processed_data = engine.query(month_range, filters)
+            scatter_data = processed_data['scatter_data']
+            st.caption(
+                f"Showing {processed_data['rows']:,} order lines matching the filters "
+                f"(computed in {processed_data['query_ms']:.0f} ms)"
+            )
+
     # --- Page Content ---
     if st.session_state.page == 'overview':
         st.markdown(
@@ -626,7 +602,11 @@ def main():
                 unsafe_allow_html=True,
             )
 
-        fig = px.scatter(processed_data['df'], x='Discount', y='Profit', color='Category', template='plotly_dark', opacity=0.7)
+        # Large selections are sampled per Category or binned into a density
+        # heatmap server-side (outliers always drawn exactly), so the browser
+        # payload stays bounded whatever the number of orders
+        scatter_plan = plan_discount_scatter(scatter_data, fingerprint, month_range, filters)
+        fig = build_scatter_figure(scatter_plan)
         fig.update_layout(
             margin=dict(l=0, r=0, t=30, b=0),
             title_font_color="#e0fbfc",
@@ -634,6 +614,15 @@ def main():
             yaxis=dict(title=dict(text='Profit ($)', font=dict(color='#e0fbfc')), tickfont=dict(color='#e0fbfc')),
         )
         st.plotly_chart(fig, use_container_width=True)
+        scatter_modes = {
+            'raw': 'all points',
+            'sample': f"stratified sample per Category incl. {scatter_plan.outliers:,} exact outliers",
+            'density': f"density heatmap plus {scatter_plan.outliers:,} exact outliers",
+        }
+        st.caption(
+            f"{scatter_plan.total_rows:,} order lines shown as {scatter_modes[scatter_plan.mode]} "
+            f"({len(scatter_plan.points):,} points, chart payload {payload_bytes(fig) / 1024:,.0f} KB)"
+        )
 
     elif st.session_state.page == 'predictor':
         st.markdown(
@@ -650,18 +639,28 @@ def main():
                 quantity = st.number_input("Quantity", min_value=1, value=3)
                 discount = st.slider("Discount (%)", min_value=0.0, max_value=80.0, value=10.0, step=5.0) / 100.0
             with col2:
-                ship_mode = st.selectbox("Ship Mode", options=processed_data['df']['Ship Mode'].unique())
-                segment = st.selectbox("Customer Segment", options=processed_data['df']['Segment'].unique())
-                region = st.selectbox("Region", options=processed_data['df']['Region'].unique())
+                ship_mode = st.selectbox("Ship Mode", options=df['Ship Mode'].unique())
+                segment = st.selectbox("Customer Segment", options=df['Segment'].unique())
+                region = st.selectbox("Region", options=df['Region'].unique())
             with col3:
-                category = st.selectbox("Product Category", options=processed_data['df']['Category'].unique())
-                sub_category_options = processed_data['df'][processed_data['df']['Category'] == category]['Sub-Category'].unique()
+                category = st.selectbox("Product Category", options=df['Category'].unique())
+                sub_category_options = df[df['Category'] == category]['Sub-Category'].unique()
                 sub_category = st.selectbox("Product Sub-Category", options=sub_category_options)
+                order_date = st.date_input("Order Date", value=df['Order Date'].max())
+                shipping_duration = st.number_input("Shipping Duration (days)", min_value=0, value=4)
 
             submitted = st.form_submit_button("Predict Profitability")
 
             if submitted:
-                probability = predict_profitability(sales, quantity, discount, ship_mode, segment, region, category, sub_category)
+                order = {
+                    'Sales': [sales], 'Quantity': [quantity], 'Discount': [discount],
+                    'Ship Mode': [ship_mode], 'Segment': [segment], 'Region': [region],
+                    'Category': [category], 'Sub-Category': [sub_category],
+                    'Order Date': [order_date], 'Shipping Duration': [shipping_duration],
+                }
+                start = time.perf_counter()
+                probability = float(model.predict_proba(order)[0])
+                latency_ms = (time.perf_counter() - start) * 1000
                 if probability >= 0.5:
                     st.markdown(
                         f"""
@@ -682,19 +681,54 @@ def main():
                     """,
                         unsafe_allow_html=True,
                     )
+                st.caption(f"{model.name} · predicted in {latency_ms:.1f} ms")
             st.markdown("</div>", unsafe_allow_html=True)
 
-        model_metrics_df = pd.DataFrame({
-            'Metric': ['Accuracy', 'Precision (Loss)', 'Recall (Loss)', 'F1-Score (Loss)'],
-            'Score': [0.95, 0.95, 0.79, 0.86]
-        })
-        fig = px.bar(model_metrics_df, x='Metric', y='Score', template='plotly_dark')
-        fig.update_layout(
-            margin=dict(l=0, r=0, t=30, b=0),
-            yaxis=dict(range=[0, 1], title=dict(text='Score', font=dict(color='#e0fbfc')), tickfont=dict(color='#e0fbfc')),
-            xaxis=dict(title=dict(text='Metric', font=dict(color='#e0fbfc')), tickfont=dict(color='#e0fbfc')),
+        # Batch scoring: one vectorized call for the whole file
+        uploaded = st.file_uploader(
+            "Score a batch of orders (CSV with Sales, Quantity, Discount, Ship Mode, Segment, Region, "
+            "Category, Sub-Category, Order Date and Shipping Duration or Ship Date)",
+            type="csv",
         )
-        st.plotly_chart(fig, use_container_width=True)
+        if uploaded is not None:
+            try:
+                batch = pd.read_csv(uploaded)
+                start = time.perf_counter()
+                probabilities = model.predict_proba(batch)
+                latency_ms = (time.perf_counter() - start) * 1000
+            except (ValueError, KeyError) as e:
+                st.error(f"Could not score the file: {e}")
+            else:
+                batch.insert(0, 'Profit Probability', probabilities)
+                loss_making = int((probabilities < 0.5).sum())
+                st.caption(
+                    f"{model.name} · {len(batch):,} orders scored in {latency_ms:,.1f} ms "
+                    f"({latency_ms * 1000 / max(len(batch), 1):,.1f} µs per order) · "
+                    f"{loss_making:,} predicted loss-making"
+                )
+                st.dataframe(batch.sort_values('Profit Probability').head(1000), use_container_width=True)
+                st.download_button(
+                    "Download scored orders", batch.to_csv(index=False), file_name="scored_orders.csv", mime="text/csv"
+                )
+
+        if model.metrics:
+            # Test-set scores saved with the served classifier when it was trained
+            scores = {name: score for name, score in model.metrics.items() if name != 'Test Orders'}
+            model_metrics_df = pd.DataFrame({'Metric': list(scores), 'Score': list(scores.values())})
+            fig = px.bar(model_metrics_df, x='Metric', y='Score', template='plotly_dark')
+            fig.update_layout(
+                margin=dict(l=0, r=0, t=30, b=0),
+                yaxis=dict(range=[0, 1], title=dict(text='Score', font=dict(color='#e0fbfc')), tickfont=dict(color='#e0fbfc')),
+                xaxis=dict(title=dict(text='Metric', font=dict(color='#e0fbfc')), tickfont=dict(color='#e0fbfc')),
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            test_orders = model.metrics.get('Test Orders')
+            held_out = f" ({test_orders:,} orders)" if test_orders else ""
+            st.caption(f"Scores of the served classifier on its held-out test set{held_out}, saved when it was trained.")
+        elif model.kind == 'heuristic':
+            st.caption("Scores are rule-based: no trained classifier was found in models/. Run scripts/run_pipeline.py; its classifier stage creates profit_classifier.pkl.")
+        else:
+            st.caption("No test-set metrics were saved with this classifier. Retrain it with scripts/run_pipeline.py to show them here.")
 
     elif st.session_state.page == 'recommendations':
         st.markdown(
@@ -1,20 +1,21 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 import logging
-from typing import List, Dict, Optional, Tuple
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
-from apscheduler.schedulers.blocking import BlockingScheduler
-from sklearn.linear_model import LinearRegression
+from typing import List, Dict, Optional, Tuple, Union
 import io
-import tempfile
 import os
 
+from reporting_delivery import OutgoingMessage, ReportMailer
+from reporting_forecast_engine import ForecastEngine
+from reporting_ingest import category_mode, compact_dtypes
+from reporting_instrumentation import PipelineProfiler
+from reporting_outbox import ReportOutbox
+from reporting_render import render_report
+from reporting_scheduler import ReportScheduler
+from reporting_schema import infer_schema
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,9 +28,94 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+OUTLIER_MODES = ('vectorized', 'sequential')
+DEFAULT_JOB_REGISTRY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'report_jobs.yaml')
+
+
+def compute_iqr_bounds(
+    df: pd.DataFrame,
+    columns: List[str],
+    k: float = 1.5
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute lower/upper IQR fences for all columns with a single quantile call
+    """
+    quartiles = df[columns].quantile([0.25, 0.75])
+    q1 = quartiles.loc[0.25].to_numpy(dtype=np.float64)
+    q3 = quartiles.loc[0.75].to_numpy(dtype=np.float64)
+    iqr = q3 - q1
+    return q1 - k * iqr, q3 + k * iqr
+
+
+def outlier_mask(
+    df: pd.DataFrame,
+    columns: List[str],
+    mode: str = 'vectorized',
+    k: float = 1.5
+) -> np.ndarray:
+    """
+    Build a boolean keep-mask (True = inside the IQR fences) for every row.
+
+    'vectorized' computes all fences on the full frame and combines the
+    per-column tests into one mask, so the result does not depend on column
+    order. 'sequential' reproduces the legacy behaviour where each column's
+    fences are recomputed on the rows that survived the previous columns.
+    """
+    if mode not in OUTLIER_MODES:
+        raise ValueError(f"Unknown outlier mode '{mode}'. Expected one of {OUTLIER_MODES}")
+    
+    keep = np.ones(len(df), dtype=bool)
+    if len(columns) == 0 or len(df) == 0:
+        return keep
+    
+    if mode == 'vectorized':
+        lower, upper = compute_iqr_bounds(df, columns, k)
+        for i, col in enumerate(columns):
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            np.logical_and(keep, values >= lower[i], out=keep)
+            np.logical_and(keep, values <= upper[i], out=keep)
+        return keep
+    
+    # Sequential: shrink the candidate set column by column without copying the frame
+    for col in columns:
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        surviving = values[keep]
+        if surviving.size == 0 or np.isnan(surviving).all():
+            # Legacy pandas quantile returns NaN here, which drops every row
+            keep[:] = False
+            break
+        q1, q3 = np.nanquantile(surviving, [0.25, 0.75])
+        iqr = q3 - q1
+        lower_bound = q1 - k * iqr
+        upper_bound = q3 + k * iqr
+        np.logical_and(keep, values >= lower_bound, out=keep)
+        np.logical_and(keep, values <= upper_bound, out=keep)
+    return keep
+
+
+def remove_outliers(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    mode: str = 'vectorized',
+    k: float = 1.5
+) -> pd.DataFrame:
+    """
+    Drop rows outside the IQR fences of any numeric column in a single filter
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns.tolist()
+    mask = outlier_mask(df, list(columns), mode=mode, k=k)
+    if mask.all():
+        return df
+    return df[mask]
+
+
+def clean_data(df: pd.DataFrame, outlier_mode: str = 'vectorized') -> pd.DataFrame:
     """
     Comprehensive data cleaning pipeline
+
+    outlier_mode selects the IQR engine: 'vectorized' (single pass, default)
+    or 'sequential' (column-by-column, matches results of earlier releases).
     """
     logger.info(f"Starting data cleaning on {len(df)} rows")
     
@@ -41,136 +127,195 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     
     # Handle missing values
     numeric_columns = df_cleaned.select_dtypes(include=[np.number]).columns
-    categorical_columns = df_cleaned.select_dtypes(include=['object']).columns
+    categorical_columns = df_cleaned.select_dtypes(include=['object', 'category']).columns
     
     # Fill numeric missing values with median
     for col in numeric_columns:
         df_cleaned[col] = df_cleaned[col].fillna(df_cleaned[col].median())
     
-    # Fill categorical missing values with mode
+    # Fill categorical missing values with mode (counted on the codes for category columns)
     for col in categorical_columns:
-        df_cleaned[col] = df_cleaned[col].fillna(df_cleaned[col].mode()[0])
+        if isinstance(df_cleaned[col].dtype, pd.CategoricalDtype):
+            mode = category_mode(df_cleaned[col])
+        else:
+            mode = df_cleaned[col].mode()[0]
+        df_cleaned[col] = df_cleaned[col].fillna(mode)
     
     # Remove outliers using IQR method for numeric columns
-    for col in numeric_columns:
-        Q1 = df_cleaned[col].quantile(0.25)
-        Q3 = df_cleaned[col].quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        df_cleaned = df_cleaned[(df_cleaned[col] >= lower_bound) & (df_cleaned[col] <= upper_bound)]
+    df_cleaned = remove_outliers(df_cleaned, numeric_columns.tolist(), mode=outlier_mode)
     
     logger.info(f"Data cleaning complete. {len(df_cleaned)} rows retained.")
     return df_cleaned
 
 
+FORECAST_HORIZON = 30
+
+
+def fit_linear_trends(x: np.ndarray, Y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Fit y = a + b * x for every column of Y in one batched least-squares solve.
+
+    With x centred the design matrix [1, x - mean(x)] has orthogonal columns,
+    so the normal equations are diagonal and the OLS solution is closed-form:
+    intercepts = column means of Y, slopes = (xc @ Y) / (xc @ xc). Centring
+    also avoids the precision loss of raw day ordinals (~7e5). Returns
+    (intercepts, slopes, x_mean) with intercepts expressed at x == x_mean.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    x_mean = float(x.mean())
+    xc = x - x_mean
+    denom = xc @ xc
+    slopes = (xc @ Y) / denom if denom else np.zeros(Y.shape[1])
+    intercepts = Y.mean(axis=0)
+    return intercepts, slopes, x_mean
+
+
 def run_forecasts(df: pd.DataFrame) -> Dict[str, np.ndarray]:
     """
-    Generate forecasts using multiple methods
+    Generate 30-day linear trend forecasts for every numeric column
     """
     logger.info("Starting forecast generation")
     
     forecasts = {}
     
     # Ensure we have a date column for time series
-    date_col = None
-    for col in df.columns:
-        if 'date' in col.lower() or df[col].dtype == 'datetime64[ns]':
-            date_col = col
-            break
+    schema = infer_schema(df)
     
-    if date_col:
-        df = df.sort_values(by=date_col)
-        df['date_ordinal'] = pd.to_datetime(df[date_col]).map(datetime.toordinal)
+    if schema.date_col:
+        # Row order does not affect the least-squares fit, so no sort/copy is needed
+        date_ordinal = schema.day_ordinals(df)
         
         # Forecast for each numeric column
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        if 'date_ordinal' in numeric_cols:
-            numeric_cols.remove('date_ordinal')
+        numeric_cols = list(schema.numeric_columns)
+        if not numeric_cols or len(df) == 0:
+            return forecasts
         
-        for col in numeric_cols[:3]:  # Limit to first 3 numeric columns
-            try:
-                X = df['date_ordinal'].values.reshape(-1, 1)
-                y = df[col].values
-                
-                model = LinearRegression()
-                model.fit(X, y)
-                
-                # Forecast next 30 days
-                last_date = df['date_ordinal'].max()
-                future_dates = np.arange(last_date + 1, last_date + 31).reshape(-1, 1)
-                predictions = model.predict(future_dates)
-                
-                forecasts[col] = predictions
-                logger.info(f"Forecast generated for {col}")
-            except Exception as e:
-                logger.error(f"Failed to forecast {col}: {e}")
+        # Stack all targets so every column is solved against one shared design matrix
+        Y = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        if np.isnan(date_ordinal).any():
+            valid_dates = ~np.isnan(date_ordinal)
+            date_ordinal, Y = date_ordinal[valid_dates], Y[valid_dates]
+            if len(date_ordinal) == 0:
+                logger.error("Failed to forecast: date column has no valid dates")
+                return forecasts
+        finite = np.isfinite(Y).all(axis=0)
+        for col in np.asarray(numeric_cols)[~finite]:
+            logger.error(f"Failed to forecast {col}: column contains NaN or infinite values")
+        fit_cols = [col for col, ok in zip(numeric_cols, finite) if ok]
+        if not fit_cols:
+            return forecasts
+        
+        try:
+            intercepts, slopes, x_mean = fit_linear_trends(date_ordinal, Y[:, finite])
+            
+            # Forecast next 30 days
+            last_date = date_ordinal.max()
+            future_dates = np.arange(last_date + 1, last_date + FORECAST_HORIZON + 1) - x_mean
+            predictions = intercepts + np.outer(future_dates, slopes)
+        except Exception as e:
+            logger.error(f"Failed to forecast {len(fit_cols)} columns: {e}")
+            return forecasts
+        
+        for j, col in enumerate(fit_cols):
+            forecasts[col] = predictions[:, j]
+        logger.info(f"Forecasts generated for {len(fit_cols)} columns")
     
     return forecasts
 
 
-def generate_pdf_report(df: pd.DataFrame, forecasts: Dict, output_path: str) -> str:
+def monthly_means(dates: pd.Series, values: pd.Series) -> pd.Series:
+    """
+    Mean of values per calendar month, indexed by monthly Period (months
+    without data are left out, as with groupby)
+    """
+    months = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[M]').view(np.int64)
+    y = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = (months != np.iinfo(np.int64).min) & ~np.isnan(y)
+    months, y = months[valid], y[valid]
+    if months.size == 0:
+        return pd.Series(dtype=np.float64, index=pd.PeriodIndex([], freq='M'))
+    first = months.min()
+    offsets = months - first
+    counts = np.bincount(offsets)
+    sums = np.bincount(offsets, weights=y)
+    present = np.nonzero(counts)[0]
+    index = pd.PeriodIndex((first + present).astype('datetime64[M]'), freq='M')
+    return pd.Series(sums[present] / counts[present], index=index, name=values.name)
+
+
+def summarize_for_report(df: pd.DataFrame, forecast_freq: str = 'D') -> Dict:
+    """
+    Precompute the aggregates drawn by the four report panels.
+
+    Returns a dict with keys: means (pd.Series), trend_col (str or None),
+    monthly (pd.Series indexed by monthly Period, or None), hist_col
+    (str or None), hist_counts and hist_edges (np.ndarray or None), and
+    forecast_freq ('D', 'W' or 'M', the step of the forecasts drawn with it).
+    """
+    schema = infer_schema(df)
+    numeric_df = df[schema.numeric_columns]
+    summary = {
+        'means': numeric_df.mean(),
+        'trend_col': None,
+        'monthly': None,
+        'hist_col': None,
+        'hist_counts': None,
+        'hist_edges': None,
+        'forecast_freq': forecast_freq,
+    }
+    
+    if schema.date_col and len(numeric_df.columns) > 0:
+        numeric_col = numeric_df.columns[0]
+        summary['trend_col'] = numeric_col
+        summary['monthly'] = monthly_means(schema.dates(df), df[numeric_col])
+    
+    if len(numeric_df.columns) > 0:
+        hist_col = numeric_df.columns[0]
+        values = numeric_df[hist_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        counts, edges = np.histogram(values, bins=30)
+        summary['hist_col'] = hist_col
+        summary['hist_counts'] = counts
+        summary['hist_edges'] = edges
+    
+    return summary
+
+
+def render_pdf_report(
+    summary: Dict,
+    forecasts: Dict,
+    output_path: str,
+    profile: str = 'vector',
+    n_jobs: Optional[int] = None
+) -> str:
+    """
+    Draw the 4-panel report from precomputed aggregates (see summarize_for_report)
+    and write it to output_path with the given render profile
+    """
+    stats = render_report(summary, forecasts, output_path, profile=profile, n_jobs=n_jobs)
+    logger.info(
+        f"Rendered report ({stats.profile}) in {stats.seconds:.2f}s, "
+        f"{stats.size_bytes / 1024:,.1f} KB"
+    )
+    return output_path
+
+
+def generate_pdf_report(
+    df: pd.DataFrame,
+    forecasts: Dict,
+    output_path: str,
+    profile: str = 'vector',
+    n_jobs: Optional[int] = None,
+    forecast_freq: str = 'D'
+) -> str:
     """
     Generate comprehensive PDF report with visualizations
     """
     logger.info("Starting PDF report generation")
     
     try:
-        # Create figure with subplots
-        fig = plt.figure(figsize=(16, 12))
-        
-        # Data summary
-        ax1 = plt.subplot(2, 2, 1)
-        df.select_dtypes(include=[np.number]).describe().loc['mean'].plot(kind='bar', ax=ax1)
-        ax1.set_title('Average Metrics Summary')
-        ax1.set_ylabel('Mean Value')
-        plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
-        
-        # Trend analysis
-        ax2 = plt.subplot(2, 2, 2)
-        date_col = None
-        for col in df.columns:
-            if 'date' in col.lower() or df[col].dtype == 'datetime64[ns]':
-                date_col = col
-                break
-        
-        if date_col:
-            numeric_col = df.select_dtypes(include=[np.number]).columns[0]
-            df.groupby(df[date_col].dt.to_period('M'))[numeric_col].mean().plot(ax=ax2)
-            ax2.set_title(f'Monthly Trend: {numeric_col}')
-            ax2.set_xlabel('Date')
-            ax2.set_ylabel('Average')
-        
-        # Forecast visualization
-        ax3 = plt.subplot(2, 2, 3)
-        if forecasts:
-            for col, preds in list(forecasts.items())[:1]:  # Plot first forecast
-                ax3.plot(preds, label=f'{col} Forecast', marker='o')
-                ax3.set_title('30-Day Forecast')
-                ax3.set_xlabel('Days Ahead')
-                ax3.set_ylabel('Predicted Value')
-                ax3.legend()
-        
-        # Data distribution
-        ax4 = plt.subplot(2, 2, 4)
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
-        if len(numeric_columns) > 0:
-            df[numeric_columns[0]].hist(bins=30, ax=ax4)
-            ax4.set_title(f'Distribution: {numeric_columns[0]}')
-            ax4.set_xlabel('Value')
-            ax4.set_ylabel('Frequency')
-        
-        plt.tight_layout()
-        
-        # Save to PDF
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            plt.savefig(tmp_file.name, format='pdf', dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            # Copy to final location
-            import shutil
-            shutil.copy(tmp_file.name, output_path)
-            os.unlink(tmp_file.name)
+        summary = summarize_for_report(df, forecast_freq)
+        render_pdf_report(summary, forecasts, output_path, profile=profile, n_jobs=n_jobs)
         
         logger.info(f"PDF report successfully generated at {output_path}")
         return output_path
@@ -193,43 +338,63 @@ def send_email_with_attachment(
     logger.info(f"Sending email to {len(to_emails)} recipients")
     
     try:
-        msg = MIMEMultipart()
-        msg['From'] = smtp_config['sender']
-        msg['To'] = ', '.join(to_emails)
-        msg['Subject'] = subject
-        
-        # Attach body
-        msg.attach(MIMEText(body, 'plain'))
-        
-        # Attach PDF
-        with open(attachment_path, 'rb') as f:
-            pdf_attachment = MIMEApplication(f.read(), _subtype='pdf')
-            pdf_attachment.add_header(
-                'Content-Disposition',
-                'attachment',
-                filename=os.path.basename(attachment_path)
-            )
-            msg.attach(pdf_attachment)
-        
-        # Send email
-        with smtplib.SMTP(smtp_config['host'], smtp_config['port']) as server:
-            server.starttls()
-            server.login(smtp_config['username'], smtp_config['password'])
-            server.send_message(msg)
-        
-        logger.info("Email sent successfully")
-        return True
-    
-    except Exception as e:
+        mailer = ReportMailer(smtp_config, pool_size=1)
+    except ValueError as e:
         logger.error(f"Failed to send email: {e}")
         return False
+    with mailer:
+        result = mailer.send(OutgoingMessage(to_emails, subject, body, attachment_path))
+    
+    if result.ok:
+        logger.info("Email sent successfully")
+    return result.ok
+
+
+def build_report_email_body(
+    rows: int,
+    metrics: int,
+    forecast_count: int,
+    stage_summary: Optional[str] = None
+) -> str:
+    """
+    Plain-text body for the report email (stage_summary: pre-formatted
+    table of pipeline stage timings, see PipelineProfiler.summary_table)
+    """
+    timings = f"""
+            Pipeline run statistics:
+{stage_summary}
+            """ if stage_summary else ''
+    return f"""
+            Hello,
+            
+            Please find attached the weekly executive report generated on {datetime.now().strftime('%A, %B %d, %Y')}.
+            
+            Report Summary:
+            - Data points processed: {rows:,}
+            - Metrics analyzed: {metrics}
+            - Forecasts generated: {forecast_count}
+            {timings}
+            Best regards,
+            Automated Reporting System
+            
+            ---
+            This is an automated message. Do not reply.
+            """
 
 
 def automate_reporting_pipeline(
     df: pd.DataFrame, 
     email_list: List[str],
     smtp_config: Optional[Dict] = None,
-    output_dir: str = './reports'
+    output_dir: str = './reports',
+    forecast_model: str = 'linear',
+    forecast_freq: str = 'D',
+    forecast_agg: Union[str, Dict[str, str]] = 'auto',
+    report_profile: str = 'vector',
+    outbox: Optional[ReportOutbox] = None,
+    run_log_path: Optional[str] = None,
+    trace_memory: bool = False,
+    compact: bool = True
 ) -> str:
     """
     Complete automated reporting pipeline that cleans data, runs forecasts, 
@@ -245,6 +410,29 @@ def automate_reporting_pipeline(
         SMTP configuration with keys: host, port, username, password, sender
     output_dir : str
         Directory to save generated reports
+    forecast_model : str
+        'linear' fits a trend on raw rows (run_forecasts); any model name
+        registered in reporting_forecast_engine (or 'auto') resamples to
+        forecast_freq first
+    forecast_freq : str
+        Resampling grid for the forecast engine: 'D', 'W' or 'M'
+    forecast_agg : str or Dict[str, str]
+        How the engine aggregates each metric per period: 'sum', 'mean',
+        'auto' (mean for rate/average-named metrics such as churn_rate,
+        sum otherwise) or a {metric: 'sum' | 'mean'} dict
+    report_profile : str
+        Quality/size profile of the PDF (see reporting_render.RENDER_PROFILES)
+    outbox : ReportOutbox, optional
+        Enqueue the report email for an OutboxWorker instead of sending it
+        inline; the pipeline then returns without waiting on SMTP
+    run_log_path : str, optional
+        JSON-lines file receiving per-stage wall/CPU time, peak memory and
+        row counts (default: <output_dir>/pipeline_runs.jsonl)
+    trace_memory : bool
+        Also record the tracemalloc peak of every stage (slower)
+    compact : bool
+        Downcast numerics and convert low-cardinality text columns to
+        category before cleaning (see reporting_ingest.compact_dtypes)
     
     Returns:
     --------
@@ -257,12 +445,34 @@ def automate_reporting_pipeline(
     logger.info(f"Input data shape: {df.shape}")
     logger.info(f"Recipients: {len(email_list)}")
     
+    profiler = PipelineProfiler(
+        run_log_path=run_log_path or os.path.join(output_dir, 'pipeline_runs.jsonl'),
+        trace_memory=trace_memory
+    )
+    
     try:
+        # Step 0: Shrink dtypes so cleaning and forecasting work on a compact frame
+        if compact:
+            with profiler.stage('compact_dtypes', rows_in=len(df)) as stage:
+                df, compaction = compact_dtypes(df)
+                stage.rows_out = len(df)
+                stage.extra['mb_saved'] = round(compaction.bytes_saved / 1024 ** 2, 2)
+        
         # Step 1: Clean data
-        cleaned_df = clean_data(df)
+        with profiler.stage('clean_data', rows_in=len(df)) as stage:
+            cleaned_df = clean_data(df)
+            stage.rows_out = len(cleaned_df)
         
         # Step 2: Run forecasts
-        forecasts = run_forecasts(cleaned_df)
+        with profiler.stage('run_forecasts', rows_in=len(cleaned_df)) as stage:
+            if forecast_model == 'linear':
+                forecasts = run_forecasts(cleaned_df)
+                forecast_step = 'D'
+            else:
+                engine = ForecastEngine(freq=forecast_freq, horizon=FORECAST_HORIZON, agg=forecast_agg)
+                forecasts = engine.forecast(cleaned_df, model=forecast_model)
+                forecast_step = forecast_freq
+            stage.rows_out = sum(len(values) for values in forecasts.values())
         
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
@@ -270,80 +480,59 @@ def automate_reporting_pipeline(
         # Step 3: Generate PDF report
         report_date = datetime.now().strftime('%Y-%m-%d')
         report_path = os.path.join(output_dir, f'executive_report_{report_date}.pdf')
-        generate_pdf_report(cleaned_df, forecasts, report_path)
+        with profiler.stage('generate_pdf_report', rows_in=len(cleaned_df)) as stage:
+            generate_pdf_report(
+                cleaned_df, forecasts, report_path, profile=report_profile, forecast_freq=forecast_step
+            )
+            stage.extra['size_kb'] = round(os.path.getsize(report_path) / 1024, 1)
         
-        # Step 4: Send email if configured
-        if smtp_config and email_list:
+        # Step 4: Send (or enqueue) email if configured
+        if email_list and (smtp_config or outbox is not None):
             subject = f"Weekly Executive Report - {report_date}"
-            body = f"""
-            Hello,
-            
-            Please find attached the weekly executive report generated on {datetime.now().strftime('%A, %B %d, %Y')}.
-            
-            Report Summary:
-            - Data points processed: {len(cleaned_df):,}
-            - Metrics analyzed: {len(cleaned_df.select_dtypes(include=[np.number]).columns)}
-            - Forecasts generated: {len(forecasts)}
-            
-            Best regards,
-            Automated Reporting System
-            
-            ---
-            This is an automated message. Do not reply.
-            """
-            
-            send_email_with_attachment(
-                to_emails=email_list,
-                subject=subject,
-                body=body,
-                attachment_path=report_path,
-                smtp_config=smtp_config
+            body = build_report_email_body(
+                rows=len(cleaned_df),
+                metrics=len(cleaned_df.select_dtypes(include=[np.number]).columns),
+                forecast_count=len(forecasts),
+                stage_summary=profiler.summary_table(indent=' ' * 12)
             )
+            
+            if outbox is not None:
+                with profiler.stage('enqueue_email') as stage:
+                    message_id = outbox.enqueue(OutgoingMessage(email_list, subject, body, report_path))
+                    stage.extra['message_id'] = message_id
+                logger.info(f"Report email queued in outbox (id {message_id})")
+            else:
+                with profiler.stage('send_email_with_attachment') as stage:
+                    stage.extra['sent'] = send_email_with_attachment(
+                        to_emails=email_list,
+                        subject=subject,
+                        body=body,
+                        attachment_path=report_path,
+                        smtp_config=smtp_config
+                    )
         
+        profiler.write()
         logger.info("PIPELINE COMPLETED SUCCESSFULLY")
         logger.info("="*60)
         
         return f"Report delivered to {len(email_list)} stakeholders"
         
     except Exception as e:
+        profiler.write(status='failed')
         logger.error(f"CRITICAL PIPELINE FAILURE: {e}")
         logger.exception("Full traceback:")
         logger.info("="*60)
         raise
 
 
-def schedule_weekly_report():
+def schedule_weekly_report(config_path: str = DEFAULT_JOB_REGISTRY):
     """
-    Scheduler that runs the pipeline every Monday at 6 AM
+    Run every job of a YAML/TOML report registry on its own schedule.
+
+    The default registry (report_jobs.yaml) holds the Monday 6 AM executive
+    report; add entries there for further reports, data sources and cadences.
     """
-    scheduler = BlockingScheduler()
-    
-    # Example job configuration
-    def job():
-        # Load your data here
-        # df = pd.read_csv('your_data_source.csv')
-        # email_list = ['exec@company.com', 'team@company.com']
-        # smtp_config = {
-        #     'host': 'smtp.company.com',
-        #     'port': 587,
-        #     'username': 'user@company.com',
-        #     'password': 'your_password',
-        #     'sender': 'reports@company.com'
-        # }
-        # 
-        # automate_reporting_pipeline(df, email_list, smtp_config)
-        pass
-    
-    scheduler.add_job(
-        job,
-        'cron',
-        day_of_week='mon',
-        hour=6,
-        minute=0,
-        timezone='America/New_York'
-    )
-    
-    logger.info("Scheduler started. Next run: Monday 6:00 AM")
+    scheduler = ReportScheduler(config_path)
     scheduler.start()
 
 
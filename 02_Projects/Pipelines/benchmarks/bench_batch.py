@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-segment pipeline loop vs. batch reporting with shared intermediates
+
+The naive loop filters the raw frame per segment and runs clean_data,
+run_forecasts and generate_pdf_report on each slice. The batch path cleans
+once, builds every segment's aggregates in one pass and fans rendering out
+to a process pool. No email is sent.
+
+Usage:
+    python benchmarks/bench_batch.py --rows 2000000 --segments 200 --jobs 1 4
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Automated_Reporting_Pipeline import clean_data, generate_pdf_report, run_forecasts  # noqa: E402
+from reporting_batch import automate_reporting_batch, segment_slug  # noqa: E402
+
+
+def make_frame(rows: int, segments: int, seed: int = 8) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    managers = np.array([f'Manager {i:04d}' for i in range(segments)], dtype=object)
+    return pd.DataFrame({
+        'Order Date': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 1095, rows), unit='D'),
+        'Manager': managers[rng.integers(0, segments, rows)],
+        'Sales': rng.gamma(2.0, 120.0, rows),
+        'Profit': rng.normal(25, 60, rows),
+        'Quantity': rng.integers(1, 10, rows),
+    })
+
+
+def naive_loop(df: pd.DataFrame, out_dir: str) -> int:
+    reports = 0
+    for manager, group in df.groupby('Manager', sort=True):
+        cleaned = clean_data(group)
+        forecasts = run_forecasts(cleaned)
+        generate_pdf_report(cleaned, forecasts, os.path.join(out_dir, f'{segment_slug(manager)}.pdf'))
+        reports += 1
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--segments', type=int, default=100)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--skip-naive', action='store_true')
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.segments)
+    out_dir = tempfile.mkdtemp(prefix='bench_batch_')
+    print(f"Frame: {args.rows:,} rows, {args.segments:,} segments, {os.cpu_count()} CPUs")
+    print(f"{'variant':<24}{'seconds':>10}{'reports/s':>12}")
+
+    if not args.skip_naive:
+        start = time.perf_counter()
+        reports = naive_loop(df, out_dir)
+        elapsed = time.perf_counter() - start
+        print(f"{'naive per-segment loop':<24}{elapsed:>10.2f}{reports / elapsed:>12.1f}")
+
+    for n_jobs in sorted(set(args.jobs)):
+        start = time.perf_counter()
+        timings = automate_reporting_batch(df, 'Manager', output_dir=out_dir, n_jobs=n_jobs)
+        elapsed = time.perf_counter() - start
+        print(f"{f'batch (n_jobs={n_jobs})':<24}{elapsed:>10.2f}{len(timings) / elapsed:>12.1f}")
+
+    print("\nSlowest reports of the last batch run:")
+    print(timings.nlargest(5, 'total_seconds')[['segment', 'rows', 'render_seconds', 'size_kb']]
+          .to_string(index=False))
+    shutil.rmtree(out_dir)
+
+
+if __name__ == '__main__':
+    main()
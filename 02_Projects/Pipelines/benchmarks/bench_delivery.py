@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one-connection-per-email delivery vs. pooled concurrent ReportMailer
+
+Sends N report emails (same PDF attached) to a LocalSMTPServer with
+configurable connection set-up and per-message latency. The legacy path
+connects, logs in and re-reads the PDF for every message, one at a time.
+ReportMailer reuses pooled connections, encodes the PDF once and sends
+from a thread pool.
+
+Usage:
+    python benchmarks/bench_delivery.py --messages 200 --latency 0.05 --connect-latency 0.2 --pool 1 4 16
+"""
+
+import argparse
+import logging
+import os
+import smtplib
+import sys
+import tempfile
+import time
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reporting_delivery import LocalSMTPServer, OutgoingMessage, ReportMailer  # noqa: E402
+
+
+def legacy_send(message: OutgoingMessage, smtp_config):
+    msg = MIMEMultipart()
+    msg['From'] = smtp_config['sender']
+    msg['To'] = ', '.join(message.to_emails)
+    msg['Subject'] = message.subject
+    msg.attach(MIMEText(message.body, 'plain'))
+    with open(message.attachment_path, 'rb') as f:
+        part = MIMEApplication(f.read(), _subtype='pdf')
+        part.add_header('Content-Disposition', 'attachment', filename=os.path.basename(message.attachment_path))
+        msg.attach(part)
+    with smtplib.SMTP(smtp_config['host'], smtp_config['port']) as server:
+        server.send_message(msg)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--messages', type=int, default=100)
+    parser.add_argument('--pdf-kb', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds per DATA reply')
+    parser.add_argument('--connect-latency', type=float, default=0.1, help='seconds per new connection')
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    parser.add_argument('--pool', type=int, nargs='+', default=[1, 4, 16])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+        f.write(os.urandom(args.pdf_kb * 1024))
+        pdf_path = f.name
+    messages = [
+        OutgoingMessage([f'user{i}@example.com'], f'Report {i}', 'Please find attached the report.', pdf_path)
+        for i in range(args.messages)
+    ]
+    print(f"{args.messages} messages, {args.pdf_kb} KB PDF, latency {args.latency}s, "
+          f"connect {args.connect_latency}s, fail rate {args.fail_rate:.0%}")
+    print(f"{'variant':<22}{'seconds':>10}{'msg/s':>10}{'sent':>7}{'conns':>7}")
+
+    with LocalSMTPServer(latency=args.latency, connect_latency=args.connect_latency) as server:
+        config = server.smtp_config()
+        start = time.perf_counter()
+        for message in messages:
+            legacy_send(message, config)
+        elapsed = time.perf_counter() - start
+        print(f"{'legacy serial':<22}{elapsed:>10.2f}{len(messages) / elapsed:>10.1f}"
+              f"{len(server.received):>7}{server.connections:>7}")
+
+    for pool_size in args.pool:
+        with LocalSMTPServer(latency=args.latency, connect_latency=args.connect_latency,
+                             fail_rate=args.fail_rate, seed=1) as server:
+            start = time.perf_counter()
+            with ReportMailer(server.smtp_config(), pool_size=pool_size, backoff=0.05) as mailer:
+                results = mailer.send_many(messages)
+            elapsed = time.perf_counter() - start
+            sent = sum(r.ok for r in results)
+            print(f"{f'pooled (pool={pool_size})':<22}{elapsed:>10.2f}{len(messages) / elapsed:>10.1f}"
+                  f"{sent:>7}{server.connections:>7}")
+    os.unlink(pdf_path)
+
+
+if __name__ == '__main__':
+    main()
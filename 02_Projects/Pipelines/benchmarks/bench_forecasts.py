@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batched least-squares forecasts in run_forecasts
+
+Compares the previous approach (one sklearn LinearRegression per numeric
+column) with the single batched NumPy solve used by run_forecasts, on frames
+with hundreds of metric columns.
+
+Usage:
+    python benchmarks/bench_forecasts.py --rows 100000 --cols 50 200 500
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Automated_Reporting_Pipeline import run_forecasts  # noqa: E402
+
+
+def legacy_forecasts(df: pd.DataFrame, date_col: str) -> dict:
+    """
+    Per-column sklearn fit, as run_forecasts worked before batching (without the 3-column cap)
+    """
+    from sklearn.linear_model import LinearRegression
+
+    df = df.sort_values(by=date_col)
+    ordinals = pd.to_datetime(df[date_col]).map(datetime.toordinal)
+    X = ordinals.values.reshape(-1, 1)
+    last_date = ordinals.max()
+    future_dates = np.arange(last_date + 1, last_date + 31).reshape(-1, 1)
+    forecasts = {}
+    for col in df.columns.drop(date_col):
+        model = LinearRegression()
+        model.fit(X, df[col].values)
+        forecasts[col] = model.predict(future_dates)
+    return forecasts
+
+
+def make_frame(rows: int, cols: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    trend = np.linspace(0, 1, rows)
+    data = {'date': pd.date_range('2015-01-01', periods=rows, freq='h')}
+    for i in range(cols):
+        data[f'metric_{i}'] = rng.normal(100 + i, 10, rows) + trend * i
+    return pd.DataFrame(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--cols', type=int, nargs='+', default=[50, 200, 500])
+    parser.add_argument('--skip-legacy', action='store_true', help='only time the batched solve')
+    args = parser.parse_args()
+
+    print(f"{'columns':>8}{'legacy s':>12}{'batched s':>12}{'cols/s':>14}{'speedup':>10}")
+    for cols in args.cols:
+        df = make_frame(args.rows, cols)
+
+        start = time.perf_counter()
+        batched = run_forecasts(df)
+        batched_t = time.perf_counter() - start
+
+        legacy_t = float('nan')
+        if not args.skip_legacy:
+            start = time.perf_counter()
+            legacy = legacy_forecasts(df, 'date')
+            legacy_t = time.perf_counter() - start
+            worst = max(np.max(np.abs(legacy[c] - batched[c])) for c in legacy)
+            assert worst < 1e-6, f"batched forecasts diverged from sklearn (max abs diff {worst})"
+
+        print(f"{cols:>8}{legacy_t:>12.3f}{batched_t:>12.3f}"
+              f"{cols / batched_t:>14,.0f}{legacy_t / batched_t:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: grouped per-segment forecasting scaling across cores
+
+Times run_grouped_forecasts for n_jobs = 1..N on a synthetic order history
+with thousands of Region x Category x Sub-Category series, next to a naive
+loop that fits every group separately.
+
+Usage:
+    python benchmarks/bench_grouped_forecasts.py --rows 5000000 --segments 5000 --jobs 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reporting_schema import day_ordinals  # noqa: E402
+from reporting_segments import SEGMENT_COLUMNS, run_grouped_forecasts  # noqa: E402
+
+
+def naive_grouped_forecasts(df: pd.DataFrame, metrics) -> int:
+    """
+    One np.polyfit per group and metric; returns the number of fits
+    """
+    last = day_ordinals(df['date']).max()
+    future = last + np.arange(1, 31)
+    fits = 0
+    for _, group in df.groupby(SEGMENT_COLUMNS, sort=True, observed=True):
+        if len(group) < 2:
+            continue
+        x = day_ordinals(group['date'])
+        for metric in metrics:
+            np.polyval(np.polyfit(x, group[metric].to_numpy(), 1), future)
+            fits += 1
+    return fits
+
+
+def make_frame(rows: int, segments: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    regions = np.array(['Central', 'East', 'South', 'West'], dtype=object)
+    categories = np.array(['Furniture', 'Office Supplies', 'Technology'], dtype=object)
+    per_pair = max(1, segments // (len(regions) * len(categories)))
+    sub_categories = np.array([f'Sub-{i:04d}' for i in range(per_pair)], dtype=object)
+    return pd.DataFrame({
+        'date': pd.Timestamp('2018-01-01') + pd.to_timedelta(rng.integers(0, 2000, rows), unit='D'),
+        'Region': regions[rng.integers(0, len(regions), rows)],
+        'Category': categories[rng.integers(0, len(categories), rows)],
+        'Sub-Category': sub_categories[rng.integers(0, len(sub_categories), rows)],
+        'Sales': rng.gamma(2.0, 120.0, rows),
+        'Profit': rng.normal(25, 60, rows),
+        'Quantity': rng.integers(1, 10, rows).astype(np.float64),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--segments', type=int, default=5000)
+    parser.add_argument('--jobs', type=int, nargs='+', default=None,
+                        help='worker counts to try (default: 1, 2, 4, ... up to cpu_count)')
+    parser.add_argument('--skip-naive', action='store_true')
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    jobs = args.jobs or sorted({1, *[2 ** i for i in range(1, cpus.bit_length()) if 2 ** i <= cpus], cpus})
+    metrics = ['Sales', 'Profit', 'Quantity']
+
+    df = make_frame(args.rows, args.segments)
+    n_series = df.groupby(SEGMENT_COLUMNS, observed=True).ngroups
+    print(f"Frame: {args.rows:,} rows, {n_series:,} segments, {len(metrics)} metrics, {cpus} CPUs")
+
+    if not args.skip_naive:
+        start = time.perf_counter()
+        fits = naive_grouped_forecasts(df, metrics)
+        print(f"naive per-group loop: {time.perf_counter() - start:.3f}s ({fits:,} fits)")
+
+    print(f"{'n_jobs':>7}{'seconds':>10}{'series/s':>12}{'speedup':>10}")
+    baseline = None
+    for n_jobs in jobs:
+        start = time.perf_counter()
+        table = run_grouped_forecasts(df, metrics=metrics, n_jobs=n_jobs)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        series = table.groupby(SEGMENT_COLUMNS + ['metric'], observed=True).ngroups
+        print(f"{n_jobs:>7}{elapsed:>10.3f}{series / elapsed:>12,.0f}{baseline / elapsed:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
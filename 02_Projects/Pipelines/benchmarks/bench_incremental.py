@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full recompute vs. incremental (checkpointed) weekly runs
+
+Simulates a growing history: every "week" appends --rows new rows (plus a
+few re-delivered rows from the previous week). The full path re-runs
+clean_data, run_forecasts and summarize_for_report on the whole history;
+the incremental path loads the checkpoint, folds in only the new rows,
+derives the same results and saves the checkpoint. Report rendering and
+email are the same for both and are left out.
+
+Usage:
+    python benchmarks/bench_incremental.py --weeks 20 --rows 200000
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Automated_Reporting_Pipeline import clean_data, run_forecasts, summarize_for_report  # noqa: E402
+from reporting_incremental import IncrementalReportState  # noqa: E402
+
+
+def make_week(week: int, rows: int, rng: np.random.Generator) -> pd.DataFrame:
+    df = pd.DataFrame({
+        'Order Date': pd.Timestamp('2023-01-02') + pd.to_timedelta(week * 7 + rng.integers(0, 7, rows), unit='D'),
+        'Region': rng.choice(['East', 'West', 'Central', 'South'], rows),
+        'Sales': rng.gamma(2.0, 120.0 + week, rows),
+        'Profit': rng.normal(25, 60, rows),
+        'Quantity': rng.integers(1, 10, rows).astype(np.float64),
+    })
+    df.loc[rng.random(rows) < 0.01, 'Sales'] = np.nan
+    return df
+
+
+def max_relative_difference(incremental, full) -> float:
+    (forecasts, summary), (full_forecasts, full_summary) = incremental, full
+    diffs = [np.max(np.abs(forecasts[c] - full_forecasts[c]) / np.abs(full_forecasts[c])) for c in full_forecasts]
+    diffs.append(np.max(np.abs(summary['means'] - full_summary['means']) / np.abs(full_summary['means'])))
+    diffs.append(np.max(np.abs(summary['monthly'] - full_summary['monthly']) / np.abs(full_summary['monthly'])))
+    return float(max(diffs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--weeks', type=int, default=12)
+    parser.add_argument('--rows', type=int, default=100_000, help='new rows per week')
+    parser.add_argument('--skip-full', action='store_true', help='time the incremental path only')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = np.random.default_rng(11)
+    state_dir = tempfile.mkdtemp(prefix='bench_incremental_')
+    history = []
+    print(f"{'week':>5}{'history rows':>15}{'full s':>10}{'incremental s':>15}{'max rel diff':>15}{'hist rows moved':>17}")
+
+    for week in range(args.weeks):
+        new_rows = make_week(week, args.rows, rng)
+        if history:
+            new_rows = pd.concat([new_rows, history[-1].sample(min(1000, len(history[-1])), random_state=week)])
+        history.append(new_rows)
+
+        start = time.perf_counter()
+        if week:
+            state = IncrementalReportState.load(state_dir)
+        else:
+            state = IncrementalReportState(state_dir=state_dir)
+        state.update(new_rows)
+        incremental = (state.forecasts(), state.summary())
+        state.save()
+        incremental_seconds = time.perf_counter() - start
+
+        if args.skip_full:
+            print(f"{week + 1:>5}{sum(map(len, history)):>15,}{'-':>10}{incremental_seconds:>15.3f}{'-':>15}{'-':>17}")
+            continue
+        start = time.perf_counter()
+        cleaned = clean_data(pd.concat(history, ignore_index=True))
+        full = (run_forecasts(cleaned), summarize_for_report(cleaned))
+        full_seconds = time.perf_counter() - start
+
+        misplaced = int(np.abs(incremental[1]['hist_counts'] - full[1]['hist_counts']).sum()) // 2
+        print(f"{week + 1:>5}{sum(map(len, history)):>15,}{full_seconds:>10.3f}{incremental_seconds:>15.3f}"
+              f"{max_relative_difference(incremental, full):>15.1e}{misplaced:>17,}")
+
+    shutil.rmtree(state_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: per-stage time and memory of the reporting pipeline at scale
+
+Generates reproducible synthetic frames (10k to 50M rows) with configurable
+numeric / categorical widths, missing-value and duplicate rates, then runs
+clean_data, run_forecasts and generate_pdf_report on each, recording wall
+time, CPU time and peak memory per stage (reporting_instrumentation). The
+best of --repeat runs is kept; --trace-memory adds one untimed traced run.
+
+Results can be saved as a baseline (--save-baseline) and later runs compared
+against it (--baseline): stages slower than the baseline by more than
+--tolerance (and taking at least --min-seconds) are flagged and the script
+exits with status 1, so it can gate CI. Baselines are keyed by frame shape
+and rates, and only comparable on the same machine, so the default
+baseline file is ignored by git.
+
+Usage:
+    python benchmarks/bench_pipeline.py --rows 10k 100k 1M --save-baseline
+    python benchmarks/bench_pipeline.py --rows 10k 100k 1M --baseline
+    python benchmarks/bench_pipeline.py --rows 1M 10M --compact --trace-memory
+    python benchmarks/bench_pipeline.py --rows 50M --numeric 8 --categorical 4 --missing-rate 0.05
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Automated_Reporting_Pipeline import clean_data, generate_pdf_report, run_forecasts  # noqa: E402
+from reporting_ingest import compact_dtypes  # noqa: E402
+from reporting_instrumentation import PipelineProfiler  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_pipeline.json')
+STAGES = ('clean_data', 'run_forecasts', 'generate_pdf_report')
+_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_rows(text: str) -> int:
+    """
+    '10k' -> 10000, '50M' -> 50000000, '2500' -> 2500
+    """
+    multiplier = _SUFFIXES.get(text[-1].lower(), 1)
+    number = text[:-1] if multiplier > 1 else text
+    return int(float(number) * multiplier)
+
+
+def make_synthetic_frame(
+    rows: int,
+    numeric: int = 4,
+    categorical: int = 2,
+    missing_rate: float = 0.02,
+    duplicate_rate: float = 0.01,
+    cardinality: int = 50,
+    seed: int = 14
+) -> pd.DataFrame:
+    """
+    Order-date column, `numeric` float metrics (trend + noise with heavy
+    tails, so the IQR filter has outliers to remove) and `categorical` text
+    columns; `missing_rate` of every non-date cell is blanked and
+    `duplicate_rate` of the rows repeat earlier rows
+    """
+    rng = np.random.default_rng(seed)
+    n_duplicates = int(rows * duplicate_rate)
+    targets = rng.choice(rows, n_duplicates, replace=False)
+    sources = rng.integers(0, rows, n_duplicates)
+
+    def with_duplicates(values: np.ndarray) -> np.ndarray:
+        values[targets] = values[sources]
+        return values
+
+    days = with_duplicates(rng.integers(0, 3 * 365, rows))
+    data = {'Order Date': pd.Timestamp('2021-01-01') + pd.to_timedelta(days, unit='D')}
+    trend = days / 365.0
+    for i in range(numeric):
+        values = 100.0 * (i + 1) + 10.0 * trend + rng.standard_t(4, rows) * 15.0 * (i + 1)
+        values[rng.random(rows) < missing_rate] = np.nan
+        data[f'metric_{i}'] = with_duplicates(values)
+    for i in range(categorical):
+        labels = np.array([f'cat{i}_{j:03d}' for j in range(cardinality)] + [None], dtype=object)
+        codes = rng.integers(0, cardinality, rows)
+        codes[rng.random(rows) < missing_rate] = cardinality
+        data[f'category_{i}'] = labels[with_duplicates(codes)]
+    return pd.DataFrame(data)
+
+
+def run_stages(df: pd.DataFrame, out_dir: str, trace_memory: bool, compact: bool = False) -> Dict[str, Dict]:
+    profiler = PipelineProfiler(pipeline='bench_pipeline', trace_memory=trace_memory)
+    if compact:
+        with profiler.stage('compact_dtypes', rows_in=len(df)) as stage:
+            df, report = compact_dtypes(df)
+            stage.rows_out = len(df)
+            stage.extra['mb_saved'] = round(report.bytes_saved / 1024 ** 2, 2)
+    with profiler.stage('clean_data', rows_in=len(df)) as stage:
+        cleaned = clean_data(df)
+        stage.rows_out = len(cleaned)
+    with profiler.stage('run_forecasts', rows_in=len(cleaned)) as stage:
+        forecasts = run_forecasts(cleaned)
+        stage.rows_out = sum(len(values) for values in forecasts.values())
+    with profiler.stage('generate_pdf_report', rows_in=len(cleaned)):
+        generate_pdf_report(cleaned, forecasts, os.path.join(out_dir, 'report.pdf'))
+    profiler.write()
+    return {record['stage']: record for record in profiler.records()}
+
+
+def config_key(rows: int, args) -> str:
+    return (f'rows={rows},numeric={args.numeric},categorical={args.categorical},'
+            f'missing={args.missing_rate},duplicates={args.duplicate_rate}' + (',compact' if args.compact else ''))
+
+
+def load_baseline(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=parse_rows, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help='frame sizes, e.g. 10k 1M 50M')
+    parser.add_argument('--numeric', type=int, default=4, help='numeric metric columns')
+    parser.add_argument('--categorical', type=int, default=2, help='text category columns')
+    parser.add_argument('--missing-rate', type=float, default=0.02)
+    parser.add_argument('--duplicate-rate', type=float, default=0.01)
+    parser.add_argument('--compact', action='store_true', help='run compact_dtypes before cleaning')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per size; the fastest is kept')
+    parser.add_argument('--trace-memory', action='store_true', help='also record tracemalloc peaks (slower)')
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE, help='compare against this baseline')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, help='store results as baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed slowdown vs. baseline')
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help='ignore slowdowns of stages faster than this (timer noise)')
+    parser.add_argument('--json', help='also write the raw results to this file')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    baseline = load_baseline(args.baseline) if args.baseline else {}
+    if args.baseline and not baseline:
+        print(f"No baseline found at {args.baseline}; run with --save-baseline first")
+    out_dir = tempfile.mkdtemp(prefix='bench_pipeline_')
+    results: Dict[str, Dict] = {}
+    regressions: List[str] = []
+
+    print(f"{platform.processor() or platform.machine()}, {os.cpu_count()} CPUs, pandas {pd.__version__}, "
+          f"numpy {np.__version__}")
+    # Warm-up: imports, font cache and first-render costs stay out of the timings
+    run_stages(make_synthetic_frame(1_000, args.numeric, args.categorical), out_dir, trace_memory=False)
+    print(f"{'rows':>12} {'stage':<20}{'wall s':>9}{'CPU s':>9}{'peak MB':>9}{'traced MB':>10}"
+          f"{'rows out':>12}{'baseline s':>12}{'ratio':>8}")
+    for rows in args.rows:
+        df = make_synthetic_frame(rows, args.numeric, args.categorical, args.missing_rate, args.duplicate_rate)
+        runs = []
+        for _ in range(args.repeat):
+            gc.collect()
+            runs.append(run_stages(df, out_dir, trace_memory=False, compact=args.compact))
+        # tracemalloc slows allocation-heavy stages several-fold, so traced
+        # peaks come from a separate run that is not timed
+        traced = run_stages(df, out_dir, trace_memory=True, compact=args.compact) if args.trace_memory else None
+        key = config_key(rows, args)
+        results[key] = {}
+        for stage in (('compact_dtypes',) if args.compact else ()) + STAGES + ('total',):
+            best = min((run[stage] for run in runs), key=lambda record: record['wall_seconds'])
+            results[key][stage] = {
+                'wall_seconds': best['wall_seconds'],
+                'cpu_seconds': best['cpu_seconds'],
+                'peak_rss_mb': max(run[stage]['peak_rss_mb'] or 0 for run in runs),
+                'traced_peak_mb': traced[stage]['traced_peak_mb'] if traced else None,
+                'rows_out': best['rows_out'],
+            }
+            reference = baseline.get('results', {}).get(key, {}).get(stage)
+            ratio = best['wall_seconds'] / reference['wall_seconds'] if reference else None
+            flag = ''
+            if ratio is not None and ratio > 1 + args.tolerance and best['wall_seconds'] >= args.min_seconds:
+                flag = '  REGRESSION'
+                regressions.append(f"{rows:,} rows / {stage}: {ratio:.2f}x baseline")
+            traced_mb = results[key][stage]['traced_peak_mb']
+            traced_mb = '-' if traced_mb is None else f"{traced_mb:.0f}"
+            rows_out = '-' if best['rows_out'] is None else f"{best['rows_out']:,}"
+            print(f"{rows:>12,} {stage:<20}{best['wall_seconds']:>9.3f}{best['cpu_seconds']:>9.3f}"
+                  f"{results[key][stage]['peak_rss_mb']:>9.0f}{traced_mb:>10}{rows_out:>12}"
+                  f"{reference['wall_seconds'] if reference else float('nan'):>12.3f}"
+                  f"{ratio if ratio is not None else float('nan'):>8.2f}{flag}")
+        del df, runs, traced
+    shutil.rmtree(out_dir)
+
+    document = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'machine': {'platform': platform.platform(), 'cpus': os.cpu_count(), 'python': platform.python_version(),
+                    'pandas': pd.__version__, 'numpy': np.__version__},
+        'results': results,
+    }
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(document, f, indent=2)
+    if args.save_baseline:
+        # Merge, so baselines for other sizes / shapes are kept
+        stored = load_baseline(args.save_baseline)
+        document['results'] = {**stored.get('results', {}), **results}
+        with open(args.save_baseline, 'w') as f:
+            json.dump(document, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) slower than baseline by more than {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
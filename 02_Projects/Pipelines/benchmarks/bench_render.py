@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: legacy pyplot report vs. precomputed aggregates + render profiles
+
+Times the original generate_pdf_report (describe(), pandas histogram on
+every row, pyplot, temp file + copy) against summarize_for_report followed
+by render_report for each profile and worker count, and reports file sizes.
+
+Usage:
+    python benchmarks/bench_render.py --rows 5000000 --jobs 1 4
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Automated_Reporting_Pipeline import run_forecasts, summarize_for_report  # noqa: E402
+from reporting_render import RENDER_PROFILES, render_report  # noqa: E402
+
+
+def legacy_report(df: pd.DataFrame, forecasts, output_path: str):
+    fig = plt.figure(figsize=(16, 12))
+    ax1 = plt.subplot(2, 2, 1)
+    df.select_dtypes(include=[np.number]).describe().loc['mean'].plot(kind='bar', ax=ax1)
+    ax2 = plt.subplot(2, 2, 2)
+    numeric_col = df.select_dtypes(include=[np.number]).columns[0]
+    df.groupby(df['date'].dt.to_period('M'))[numeric_col].mean().plot(ax=ax2)
+    ax3 = plt.subplot(2, 2, 3)
+    for col, preds in list(forecasts.items())[:1]:
+        ax3.plot(preds, label=f'{col} Forecast', marker='o')
+        ax3.legend()
+    ax4 = plt.subplot(2, 2, 4)
+    df[numeric_col].hist(bins=30, ax=ax4)
+    plt.tight_layout()
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
+        plt.savefig(tmp_file.name, format='pdf', dpi=300, bbox_inches='tight')
+        plt.close(fig)
+        shutil.copy(tmp_file.name, output_path)
+        os.unlink(tmp_file.name)
+
+
+def make_frame(rows: int, seed: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 1095, rows), unit='D'),
+        'Sales': rng.gamma(2.0, 120.0, rows),
+        'Profit': rng.normal(25, 60, rows),
+        'Quantity': rng.integers(1, 10, rows),
+        'Discount': rng.choice([0.0, 0.1, 0.2, 0.5], rows),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    forecasts = run_forecasts(df)
+    out_dir = tempfile.mkdtemp(prefix='bench_render_')
+    print(f"Frame: {args.rows:,} rows, {os.cpu_count()} CPUs")
+
+    path = os.path.join(out_dir, 'legacy.pdf')
+    start = time.perf_counter()
+    legacy_report(df, forecasts, path)
+    legacy_t = time.perf_counter() - start
+
+    start = time.perf_counter()
+    summary = summarize_for_report(df)
+    summary_t = time.perf_counter() - start
+
+    print(f"{'variant':<22}{'seconds':>10}{'KB':>10}")
+    print(f"{'legacy pyplot':<22}{legacy_t:>10.3f}{os.path.getsize(path) / 1024:>10.1f}")
+    print(f"{'summarize_for_report':<22}{summary_t:>10.3f}{'':>10}")
+    for profile, settings in RENDER_PROFILES.items():
+        for n_jobs in sorted(set(args.jobs)) if settings['raster'] else [1]:
+            stats = render_report(summary, forecasts, os.path.join(out_dir, f'{profile}_{n_jobs}.pdf'),
+                                  profile=profile, n_jobs=n_jobs)
+            label = f"{profile} (n_jobs={n_jobs})" if settings['raster'] else profile
+            print(f"{label:<22}{stats.seconds:>10.3f}{stats.size_bytes / 1024:>10.1f}")
+    shutil.rmtree(out_dir)
+
+
+if __name__ == '__main__':
+    main()
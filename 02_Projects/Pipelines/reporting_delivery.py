@@ -0,0 +1,428 @@
+"""
+Pooled, concurrent email delivery for the reporting pipeline.
+
+send_email_with_attachment used to open a fresh SMTP connection (connect,
+STARTTLS, login) for every message, read the PDF from disk each time and
+send serially. ReportMailer instead:
+
+- keeps a pool of logged-in SMTP connections (SMTPConnectionPool) that are
+  reused across messages and across calls, and replaced when they drop;
+- sends messages concurrently from a thread pool (SMTP is I/O bound);
+- reads and base64-encodes each attachment once; every message that
+  carries the same PDF shares the encoded MIME part;
+- retries transient failures (dropped connections, 4xx replies) with
+  exponential backoff plus jitter; permanent 5xx replies fail immediately.
+
+LocalSMTPServer is a minimal in-process SMTP sink with optional latency and
+failure injection, so delivery throughput can be measured offline:
+
+    with LocalSMTPServer(latency=0.05) as server:
+        with ReportMailer(server.smtp_config(), pool_size=8) as mailer:
+            mailer.send_many(messages)
+
+smtp_config keys: host, port, sender, and optionally username/password
+(login is skipped without them), use_tls (STARTTLS, default True) and
+timeout (seconds, default 30).
+"""
+
+import logging
+import os
+import queue
+import random
+import smtplib
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_SMTP_KEYS = ('host', 'port', 'sender')
+
+# Connection-level problems worth retrying on a fresh connection
+TRANSIENT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+
+class OutgoingMessage(NamedTuple):
+    to_emails: List[str]
+    subject: str
+    body: str
+    attachment_path: Optional[str] = None
+
+
+class DeliveryResult(NamedTuple):
+    to_emails: List[str]
+    ok: bool
+    attempts: int
+    seconds: float
+    error: Optional[str] = None
+    transient: bool = False
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return False
+
+
+def validate_smtp_config(smtp_config: Dict) -> None:
+    """
+    Raise ValueError naming any missing smtp_config keys (a username also
+    needs a password)
+    """
+    if not isinstance(smtp_config, dict):
+        raise ValueError(f"smtp_config must be a dict, got {type(smtp_config).__name__}")
+    missing = [key for key in REQUIRED_SMTP_KEYS if key not in smtp_config]
+    if smtp_config.get('username') and 'password' not in smtp_config:
+        missing.append('password')
+    if missing:
+        raise ValueError(f"smtp_config is missing required key(s): {', '.join(missing)}")
+
+
+class SMTPConnectionPool:
+    """
+    Up to `size` logged-in SMTP connections, created lazily and reused.
+
+    Connections idle for longer than `idle_check` seconds are probed with
+    NOOP before reuse and replaced if the server has dropped them.
+    """
+
+    def __init__(self, smtp_config: Dict, size: int = 4, idle_check: float = 30.0):
+        self.smtp_config = smtp_config
+        self.size = size
+        self.idle_check = idle_check
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        config = self.smtp_config
+        server = smtplib.SMTP(config['host'], config['port'], timeout=config.get('timeout', 30))
+        try:
+            if config.get('use_tls', True):
+                server.starttls()
+            if config.get('username'):
+                server.login(config['username'], config['password'])
+        except Exception:
+            server.close()
+            raise
+        with self._lock:
+            self.opened += 1
+        return server
+
+    def _checkout(self) -> smtplib.SMTP:
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used < self.idle_check:
+                return server
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._discard(server)
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection. It goes back to the pool afterwards unless the
+        body failed in a way that leaves the session unusable.
+        """
+        self._slots.acquire()
+        server = None
+        try:
+            server = self._checkout()
+            yield server
+        except Exception as e:
+            reusable = (
+                isinstance(e, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused))
+                and getattr(e, 'smtp_code', None) != 421
+            )
+            if server is not None and not reusable:
+                self._discard(server)
+                server = None
+            raise
+        finally:
+            if server is not None:
+                self._idle.put((server, time.monotonic()))
+            self._slots.release()
+
+    @staticmethod
+    def _discard(server: smtplib.SMTP):
+        try:
+            server.close()
+        except Exception:
+            pass
+
+    def close(self):
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                server.quit()
+            except Exception:
+                self._discard(server)
+
+
+class ReportMailer:
+    """
+    Concurrent sender with a persistent connection pool and retries.
+
+    Use as a context manager (or call close()) so pooled connections are
+    closed with QUIT when delivery is done.
+    """
+
+    def __init__(
+        self,
+        smtp_config: Dict,
+        pool_size: int = 4,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0
+    ):
+        validate_smtp_config(smtp_config)
+        self.smtp_config = smtp_config
+        self.pool = SMTPConnectionPool(smtp_config, size=pool_size)
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._attachments: Dict[Tuple[str, float, int], MIMEApplication] = {}
+        self._attachments_lock = threading.Lock()
+
+    def __enter__(self) -> 'ReportMailer':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+
+    def attachment(self, path: str) -> MIMEApplication:
+        """
+        The encoded MIME part for a file, read and base64-encoded once per
+        (path, mtime, size)
+        """
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+        with self._attachments_lock:
+            part = self._attachments.get(key)
+            if part is None:
+                with open(path, 'rb') as f:
+                    part = MIMEApplication(f.read(), _subtype='pdf')
+                part.add_header('Content-Disposition', 'attachment', filename=os.path.basename(path))
+                self._attachments[key] = part
+        return part
+
+    def build(self, message: OutgoingMessage) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From'] = self.smtp_config['sender']
+        msg['To'] = ', '.join(message.to_emails)
+        msg['Subject'] = message.subject
+        msg.attach(MIMEText(message.body, 'plain'))
+        if message.attachment_path:
+            msg.attach(self.attachment(message.attachment_path))
+        return msg
+
+    def _delay(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return delay * (0.5 + random.random() / 2)
+
+    def send(self, message: OutgoingMessage) -> DeliveryResult:
+        """
+        Send one message, retrying transient failures with backoff
+        """
+        start = time.perf_counter()
+        try:
+            msg = self.build(message)
+        except OSError as e:
+            logger.error(f"Cannot build email to {message.to_emails}: {e}")
+            return DeliveryResult(message.to_emails, False, 0, time.perf_counter() - start, str(e))
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with self.pool.connection() as server:
+                    server.send_message(msg)
+                return DeliveryResult(message.to_emails, True, attempt, time.perf_counter() - start)
+            except Exception as e:
+                if attempt > self.max_retries or not _is_transient(e):
+                    log = logger.warning if _is_transient(e) else logger.error
+                    log(f"Failed to send email to {message.to_emails} after {attempt} attempt(s): {e}")
+                    return DeliveryResult(
+                        message.to_emails, False, attempt, time.perf_counter() - start, str(e),
+                        transient=_is_transient(e)
+                    )
+                delay = self._delay(attempt)
+                logger.warning(f"Transient SMTP error ({e}); retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                time.sleep(delay)
+
+    def send_many(self, messages: List[OutgoingMessage]) -> List[DeliveryResult]:
+        """
+        Send messages concurrently (up to pool_size in flight); results are
+        in input order
+        """
+        start = time.perf_counter()
+        if len(messages) <= 1 or self.pool_size == 1:
+            results = [self.send(m) for m in messages]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.pool_size, len(messages))) as executor:
+                results = list(executor.map(self.send, messages))
+        elapsed = time.perf_counter() - start
+        sent = sum(r.ok for r in results)
+        retries = sum(r.attempts - 1 for r in results)
+        logger.info(
+            f"Delivered {sent}/{len(results)} emails in {elapsed:.2f}s "
+            f"({len(results) / max(elapsed, 1e-9):,.1f} msg/s, {retries} retries, "
+            f"{self.pool.opened} connections opened)"
+        )
+        return results
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP for smtplib: EHLO/HELO, AUTH, MAIL, RCPT, DATA, RSET,
+    NOOP, QUIT
+    """
+
+    def _reply(self, line: str):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        server: 'LocalSMTPServer' = self.server.owner
+        server.record_connection()
+        if server.connect_latency:
+            time.sleep(server.connect_latency)
+        self._reply('220 localhost reporting SMTP sink')
+        mail_from, rcpts = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip()
+            verb = command[:4].upper()
+            if verb == 'EHLO':
+                self._reply('250-localhost')
+                self._reply('250-AUTH PLAIN LOGIN')
+                self._reply('250 8BITMIME')
+            elif verb == 'HELO':
+                self._reply('250 localhost')
+            elif verb == 'AUTH':
+                self._reply('235 2.7.0 Authentication successful')
+            elif verb == 'MAIL':
+                mail_from, rcpts = command[10:].strip(), []
+                self._reply('250 OK')
+            elif verb == 'RCPT':
+                rcpts.append(command[8:].strip())
+                self._reply('250 OK')
+            elif verb == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                size = 0
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk in (b'.\r\n', b'.\n'):
+                        break
+                    size += len(chunk)
+                if server.latency:
+                    time.sleep(server.latency)
+                if server.should_fail():
+                    self._reply('451 4.3.0 Temporary local failure')
+                else:
+                    server.record(mail_from, rcpts, size)
+                    self._reply('250 OK queued')
+                mail_from, rcpts = None, []
+            elif verb == 'RSET':
+                mail_from, rcpts = None, []
+                self._reply('250 OK')
+            elif verb == 'NOOP':
+                self._reply('250 OK')
+            elif verb == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LocalSMTPServer:
+    """
+    In-process SMTP sink for offline delivery tests and benchmarks.
+
+    latency adds a fixed delay before each DATA reply (a slow relay);
+    connect_latency delays the greeting, standing in for TCP + TLS + login
+    set-up; fail_rate makes that fraction of messages fail with a 451 reply.
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        connect_latency: float = 0.0,
+        fail_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.fail_rate = fail_rate
+        self.received: List[Tuple[str, List[str], int]] = []
+        self.connections = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _ThreadingTCPServer((host, port), _SMTPHandler)
+        self._server.owner = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def smtp_config(self, sender: str = 'reports@localhost') -> Dict:
+        return {'host': self._server.server_address[0], 'port': self.port, 'sender': sender, 'use_tls': False}
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self.fail_rate > 0 and self._rng.random() < self.fail_rate
+
+    def record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def record(self, mail_from: str, rcpts: List[str], size: int):
+        with self._lock:
+            self.received.append((mail_from, rcpts, size))
+
+    def start(self) -> 'LocalSMTPServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'LocalSMTPServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
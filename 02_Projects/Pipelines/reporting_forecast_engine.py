@@ -0,0 +1,347 @@
+"""
+Pluggable time-series forecasting engine for the reporting pipeline.
+
+run_forecasts fits a straight line through every raw row, so days with many
+transactions weigh more than quiet days and the fit cost grows with the row
+count. The engine instead:
+
+1. resamples the metrics onto a regular daily / weekly / monthly grid with
+   np.bincount over integer period codes (one pass over the rows), then
+2. fits the registered models on that (much shorter) grid, vectorised
+   across all metrics at once.
+
+Built-in models: linear_trend, seasonal_naive, holt_winters (additive, with
+a small smoothing-parameter grid searched in one vectorised pass) and
+linear_seasonal (trend plus seasonal dummies, one least-squares solve).
+New models are added with @register_forecast_model.
+"""
+
+import logging
+import re
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from reporting_schema import infer_schema
+
+logger = logging.getLogger(__name__)
+
+# Default season length (in grid periods) for each resampling frequency
+SEASON_LENGTHS = {'D': 7, 'W': 52, 'M': 12}
+
+# Metric names that read as rates or averages: summing them over a period
+# means nothing, so agg='auto' averages them instead
+NON_ADDITIVE_NAME = re.compile(
+    r'(?:^|[^a-z])(?:rate|ratio|pct|percent|share|avg|average|mean|margin)(?:[^a-z]|$)',
+    re.IGNORECASE
+)
+
+ForecastModel = Callable[[np.ndarray, int, int], np.ndarray]
+FORECAST_MODELS: Dict[str, ForecastModel] = {}
+
+
+def register_forecast_model(name: str):
+    """
+    Decorator adding a model to the engine registry.
+
+    A model takes (Y, season_length, horizon) where Y is a (periods x
+    metrics) array on a regular grid and returns a (horizon x metrics)
+    array. Raise ValueError when the history is too short for the model.
+    """
+    def decorator(fn: ForecastModel) -> ForecastModel:
+        FORECAST_MODELS[name] = fn
+        return fn
+    return decorator
+
+
+@register_forecast_model('linear_trend')
+def linear_trend(Y: np.ndarray, season_length: int, horizon: int) -> np.ndarray:
+    T = len(Y)
+    if T < 2:
+        raise ValueError("linear_trend needs at least 2 periods")
+    t = np.arange(T) - (T - 1) / 2
+    slopes = (t @ Y) / (t @ t)
+    future = np.arange(T, T + horizon) - (T - 1) / 2
+    return Y.mean(axis=0) + np.outer(future, slopes)
+
+
+@register_forecast_model('seasonal_naive')
+def seasonal_naive(Y: np.ndarray, season_length: int, horizon: int) -> np.ndarray:
+    T = len(Y)
+    if T < season_length:
+        raise ValueError(f"seasonal_naive needs at least {season_length} periods")
+    return Y[T - season_length + np.arange(horizon) % season_length]
+
+
+@register_forecast_model('linear_seasonal')
+def linear_seasonal(Y: np.ndarray, season_length: int, horizon: int) -> np.ndarray:
+    T = len(Y)
+    if T < season_length + 2:
+        raise ValueError(f"linear_seasonal needs at least {season_length + 2} periods")
+
+    def design(t: np.ndarray) -> np.ndarray:
+        dummies = np.zeros((len(t), season_length - 1))
+        phase = t % season_length
+        rows = np.nonzero(phase > 0)[0]
+        dummies[rows, phase[rows] - 1] = 1.0
+        return np.column_stack([np.ones(len(t)), (t - T / 2) / T, dummies])
+
+    coef, _, _, _ = np.linalg.lstsq(design(np.arange(T)), Y, rcond=None)
+    return design(np.arange(T, T + horizon)) @ coef
+
+
+HOLT_WINTERS_GRID = [
+    (alpha, beta, gamma)
+    for alpha in (0.1, 0.3, 0.6)
+    for beta in (0.01, 0.1)
+    for gamma in (0.05, 0.2)
+]
+
+
+@register_forecast_model('holt_winters')
+def holt_winters(Y: np.ndarray, season_length: int, horizon: int) -> np.ndarray:
+    """
+    Additive Holt-Winters. All (alpha, beta, gamma) candidates in
+    HOLT_WINTERS_GRID run side by side as one array recursion; each metric
+    keeps the candidate with the lowest one-step-ahead squared error.
+    """
+    T, M = Y.shape
+    s = season_length
+    if T < 2 * s:
+        raise ValueError(f"holt_winters needs at least {2 * s} periods")
+
+    params = np.asarray(HOLT_WINTERS_GRID)
+    alpha, beta, gamma = (params[:, i][:, None] for i in range(3))
+    C = len(params)
+
+    first, second = Y[:s].mean(axis=0), Y[s:2 * s].mean(axis=0)
+    level = np.broadcast_to(first, (C, M)).copy()
+    trend = np.broadcast_to((second - first) / s, (C, M)).copy()
+    season = np.broadcast_to((Y[:s] - first)[:, None, :], (s, C, M)).copy()
+    sse = np.zeros((C, M))
+
+    for t in range(T):
+        i = t % s
+        y = Y[t]
+        error = y - (level + trend + season[i])
+        if t >= s:
+            sse += error * error
+        new_level = alpha * (y - season[i]) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[i] = gamma * (y - new_level) + (1 - gamma) * season[i]
+        level = new_level
+
+    best = np.argmin(sse, axis=0)
+    cols = np.arange(M)
+    h = np.arange(1, horizon + 1)[:, None]
+    future_season = season[(T + h[:, 0] - 1) % s][:, best, cols]
+    return level[best, cols] + h * trend[best, cols] + future_season
+
+
+class ForecastEngine:
+    """
+    Resample-then-fit forecaster with per-model timings.
+
+    freq is 'D', 'W' (weeks starting Monday) or 'M'. agg is 'sum' (empty
+    periods become 0), 'mean' (empty periods carry the last value forward),
+    'auto' (mean for metrics named like rates or averages, see
+    NON_ADDITIVE_NAME, sum otherwise) or a {metric: 'sum' | 'mean'} dict,
+    unlisted metrics being summed.
+
+    A week or month the data only partly covers (it starts or ends mid-
+    period) would look like a dip in its sum, so when any metric is summed
+    the incomplete first and last periods are left out of the grid.
+    """
+
+    def __init__(
+        self,
+        freq: str = 'D',
+        horizon: int = 30,
+        season_length: Optional[int] = None,
+        agg: Union[str, Dict[str, str]] = 'sum'
+    ):
+        if freq not in SEASON_LENGTHS:
+            raise ValueError(f"Unknown frequency '{freq}'. Expected one of {list(SEASON_LENGTHS)}")
+        if isinstance(agg, dict):
+            if not set(agg.values()) <= {'sum', 'mean'}:
+                raise ValueError("Per-metric agg values must be 'sum' or 'mean'")
+        elif agg not in ('sum', 'mean', 'auto'):
+            raise ValueError("agg must be 'sum', 'mean', 'auto' or a {metric: 'sum' | 'mean'} dict")
+        self.freq = freq
+        self.horizon = horizon
+        self.season_length = season_length or SEASON_LENGTHS[freq]
+        self.agg = agg
+        self.timings: Dict[str, float] = {}
+
+    def _period_codes(self, dates: pd.Series) -> np.ndarray:
+        days = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        if self.freq == 'D':
+            return days.view(np.int64)
+        if self.freq == 'W':
+            # 1970-01-01 was a Thursday; shift so weeks start on Monday
+            return (days.view(np.int64) + 3) // 7
+        return days.astype('datetime64[M]').view(np.int64)
+
+    def _start_days(self, codes: np.ndarray) -> np.ndarray:
+        if self.freq == 'D':
+            return codes.astype('datetime64[D]')
+        if self.freq == 'W':
+            return (codes * 7 - 3).astype('datetime64[D]')
+        return codes.astype('datetime64[M]').astype('datetime64[D]')
+
+    def _period_starts(self, codes: np.ndarray) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self._start_days(codes).astype('datetime64[ns]'))
+
+    def aggregations(self, metrics: List[str]) -> Dict[str, str]:
+        """
+        'sum' or 'mean' for each metric, resolving agg='auto' and dicts
+        """
+        if isinstance(self.agg, dict):
+            return {col: self.agg.get(col, 'sum') for col in metrics}
+        if self.agg == 'auto':
+            return {
+                col: 'mean' if NON_ADDITIVE_NAME.search(str(col)) else 'sum'
+                for col in metrics
+            }
+        return {col: self.agg for col in metrics}
+
+    def resample(self, df: pd.DataFrame, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Aggregate the metrics onto a regular, gap-free period grid
+        """
+        start = time.perf_counter()
+        schema = infer_schema(df)
+        if schema.date_col is None:
+            raise ValueError("Forecasting needs a date column")
+        metrics = metrics or list(schema.numeric_columns)
+        dates = schema.dates(df)
+        valid = dates.notna().to_numpy()
+        all_valid = valid.all()
+        observed = dates if all_valid else dates[valid]
+        codes = self._period_codes(observed)
+        if codes.size == 0:
+            return pd.DataFrame(columns=metrics, dtype=np.float64)
+        first = codes.min()
+        offsets = codes - first
+        n_periods = int(offsets.max()) + 1
+
+        aggregations = self.aggregations(metrics)
+        grid = {}
+        counts = np.bincount(offsets, minlength=n_periods)
+        for col in metrics:
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            if not all_valid:
+                values = values[valid]
+            present = ~np.isnan(values)
+            if present.all():
+                col_offsets, n = offsets, counts
+            else:
+                col_offsets, values = offsets[present], values[present]
+                n = np.bincount(col_offsets, minlength=n_periods)
+            sums = np.bincount(col_offsets, weights=values, minlength=n_periods)
+            if aggregations[col] == 'sum':
+                grid[col] = sums
+            else:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    grid[col] = sums / n
+        index = self._period_starts(first + np.arange(n_periods))
+        resampled = pd.DataFrame(grid, index=index)
+        averaged = [col for col in metrics if aggregations[col] == 'mean']
+        if averaged:
+            resampled[averaged] = resampled[averaged].ffill()
+
+        partial = 0
+        if self.freq != 'D' and 'sum' in aggregations.values():
+            # Days the data covers vs. the days of its first and last periods
+            days = observed.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+            bounds = self._start_days(np.array([first, first + n_periods]))
+            lead = int(days.min() > bounds[0])
+            trail = int(days.max() < bounds[1] - np.timedelta64(1, 'D'))
+            resampled = resampled.iloc[lead:max(lead, n_periods - trail)]
+            partial = lead + trail
+        self.timings['resample'] = time.perf_counter() - start
+        logger.info(
+            f"Resampled {int(valid.sum()):,} rows onto {n_periods:,} '{self.freq}' periods "
+            f"({int((counts == 0).sum()):,} empty, {partial} incomplete dropped)"
+        )
+        return resampled
+
+    def future_index(self, grid: pd.DataFrame) -> pd.DatetimeIndex:
+        last = self._period_codes(pd.Series(grid.index[-1:]))[0]
+        return self._period_starts(last + np.arange(1, self.horizon + 1))
+
+    def fit_predict(
+        self,
+        grid: pd.DataFrame,
+        models: Optional[List[str]] = None,
+        horizon: Optional[int] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Run each model on the grid; returns {model: forecast frame}.
+        Models that cannot run on this history are logged and skipped.
+        """
+        horizon = horizon or self.horizon
+        Y = grid.to_numpy(dtype=np.float64)
+        index = self.future_index(grid)[:horizon] if horizon == self.horizon else None
+        results = {}
+        for name in models or list(FORECAST_MODELS):
+            start = time.perf_counter()
+            try:
+                predictions = FORECAST_MODELS[name](Y, self.season_length, horizon)
+            except ValueError as e:
+                logger.info(f"Skipping model {name}: {e}")
+                continue
+            self.timings[name] = time.perf_counter() - start
+            results[name] = pd.DataFrame(predictions, index=index, columns=grid.columns)
+            logger.info(f"Model {name} fitted in {self.timings[name] * 1000:.1f} ms")
+        return results
+
+    def backtest(
+        self,
+        grid: pd.DataFrame,
+        models: Optional[List[str]] = None,
+        holdout: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Mean absolute error of each model on the last `holdout` periods
+        (default: the forecast horizon, capped at a quarter of the history)
+        """
+        holdout = holdout or max(1, min(self.horizon, len(grid) // 4))
+        train, test = grid.iloc[:-holdout], grid.iloc[-holdout:].to_numpy()
+        forecasts = self.fit_predict(train, models, horizon=holdout)
+        return pd.DataFrame({
+            name: np.abs(frame.to_numpy() - test).mean(axis=0)
+            for name, frame in forecasts.items()
+        }, index=grid.columns).T
+
+    def forecast(
+        self,
+        df: pd.DataFrame,
+        model: str = 'auto',
+        metrics: Optional[List[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Forecast `horizon` periods per metric, in run_forecasts' return format.
+
+        model='auto' backtests every registered model and picks, per metric,
+        the one with the lowest holdout MAE before refitting on all history.
+        """
+        grid = self.resample(df, metrics)
+        if len(grid) < 2:
+            return {}
+        if model == 'auto':
+            errors = self.backtest(grid)
+            if errors.empty:
+                return {}
+            choice = errors.idxmin(axis=0)
+            logger.info(f"Auto-selected models: {choice.to_dict()}")
+            fitted = self.fit_predict(grid, sorted(set(choice)))
+            return {col: fitted[choice[col]][col].to_numpy() for col in grid.columns}
+        if model not in FORECAST_MODELS:
+            raise ValueError(f"Unknown model '{model}'. Available: {sorted(FORECAST_MODELS)}")
+        fitted = self.fit_predict(grid, [model])
+        if model not in fitted:
+            return {}
+        return {col: fitted[model][col].to_numpy() for col in grid.columns}
@@ -0,0 +1,166 @@
+"""
+Dtype-aware memory compaction for frames entering the reporting pipeline.
+
+Raw extracts arrive as int64 / float64 and Python-string object columns.
+compact_dtypes shrinks them before cleaning and forecasting:
+
+- integers go to the smallest signed type holding their range
+  (int8 / int16 / int32);
+- floats go to float32 only when every value round-trips exactly (e.g.
+  whole-number counts stored as float because of missing values), or
+  always with lossy_floats=True;
+- low-cardinality text columns become `category` with sorted categories,
+  so a row costs one small integer code instead of a pointer to a string.
+
+The date column is left as is. clean_data works on category columns
+through their codes (category_mode), and run_forecasts converts to float64
+itself, so forecasts are unchanged.
+"""
+
+import logging
+import sys
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from reporting_schema import detect_date_column
+
+logger = logging.getLogger(__name__)
+
+_INT_TYPES = (np.int8, np.int16, np.int32)
+_FLOAT32_MAX = float(np.finfo(np.float32).max)
+
+
+class CompactionReport(NamedTuple):
+    bytes_before: int
+    bytes_after: int
+    conversions: Dict[str, Tuple[str, str]]
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def ratio(self) -> float:
+        return self.bytes_before / self.bytes_after if self.bytes_after else float('inf')
+
+
+def _smallest_int(values: np.ndarray) -> Optional[np.dtype]:
+    if values.size == 0:
+        return None
+    lo, hi = values.min(), values.max()
+    for dtype in _INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(dtype) if np.dtype(dtype).itemsize < values.dtype.itemsize else None
+    return None
+
+
+def _float32_if_safe(values: np.ndarray, lossy: bool) -> Optional[np.ndarray]:
+    if values.dtype.itemsize <= 4:
+        return None
+    finite = values[np.isfinite(values)]
+    if finite.size and np.abs(finite).max() > _FLOAT32_MAX:
+        return None
+    compact = values.astype(np.float32)
+    if lossy:
+        return compact
+    # Exact round trip (NaN compares unequal, so check it separately)
+    same = (compact.astype(values.dtype) == values) | np.isnan(values)
+    return compact if same.all() else None
+
+
+def _as_category(series: pd.Series, max_category_ratio: float) -> Tuple[Optional[pd.Categorical], int]:
+    """
+    Sorted-category version of a text column (None if it has too many
+    distinct values or is not plain text) and the column's current size in
+    bytes, as memory_usage(deep=True) would report it
+    """
+    codes, uniques = pd.factorize(series, sort=True)
+    if len(uniques) > max_category_ratio * len(series) or pd.api.types.infer_dtype(uniques) != 'string':
+        return None, int(series.memory_usage(index=False, deep=True))
+    # Equal strings have equal getsizeof, so size the distinct values once
+    # instead of walking every row
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    sizes = np.fromiter((sys.getsizeof(value) for value in uniques), dtype=np.int64, count=len(uniques))
+    missing = series[codes < 0]
+    nbytes = 8 * len(series) + int(counts @ sizes) + sum(sys.getsizeof(value) for value in missing)
+    return pd.Categorical.from_codes(codes, categories=uniques), nbytes
+
+
+def compact_dtypes(
+    df: pd.DataFrame,
+    max_category_ratio: float = 0.5,
+    lossy_floats: bool = False
+) -> Tuple[pd.DataFrame, CompactionReport]:
+    """
+    Downcast numeric columns and convert low-cardinality text columns to
+    category (see module docstring).
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Raw input data (not modified)
+    max_category_ratio : float
+        Convert a text column when distinct values / rows is at most this
+    lossy_floats : bool
+        Store every float column as float32, accepting ~7 significant digits
+
+    Returns:
+    --------
+    Tuple[pd.DataFrame, CompactionReport]
+        The compact frame and the memory it saved
+    """
+    date_col = detect_date_column(df)
+    converted = {}
+    conversions = {}
+    bytes_before = bytes_after = int(df.index.memory_usage(deep=True))
+
+    for col, dtype in df.dtypes.items():
+        values, nbytes = None, None
+        plain = not pd.api.types.is_extension_array_dtype(dtype)
+        if col != date_col and len(df):
+            if pd.api.types.is_integer_dtype(dtype) and plain:
+                target = _smallest_int(df[col].to_numpy())
+                if target is not None:
+                    values = df[col].to_numpy().astype(target)
+            elif pd.api.types.is_float_dtype(dtype) and plain:
+                values = _float32_if_safe(df[col].to_numpy(), lossy_floats)
+            elif dtype == object:
+                values, nbytes = _as_category(df[col], max_category_ratio)
+        if nbytes is None:
+            nbytes = int(df[col].memory_usage(index=False, deep=True))
+        bytes_before += nbytes
+        if values is None:
+            bytes_after += nbytes
+        else:
+            converted[col] = values
+            conversions[col] = (str(dtype), str(values.dtype))
+            bytes_after += int(pd.Series(values).memory_usage(index=False, deep=True))
+
+    # Assigned one by one rather than through assign(**converted), which only
+    # takes string column labels
+    compact = df.copy(deep=False)
+    for col, values in converted.items():
+        compact[col] = values
+    report = CompactionReport(bytes_before, bytes_after, conversions)
+    logger.info(
+        f"Compacted {len(conversions)} of {df.shape[1]} columns: "
+        f"{bytes_before / 1024 ** 2:,.1f} MB -> {bytes_after / 1024 ** 2:,.1f} MB "
+        f"({report.bytes_saved / 1024 ** 2:,.1f} MB saved, {report.ratio:.1f}x)"
+    )
+    return compact, report
+
+
+def category_mode(series: pd.Series):
+    """
+    Most frequent category counted on the integer codes (ties go to the
+    first category, which is the smallest value for sorted categories,
+    matching Series.mode()[0])
+    """
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    if counts.size == 0 or counts.max() == 0:
+        raise ValueError(f"Cannot compute mode for '{series.name}': column has no values")
+    return series.cat.categories[counts.argmax()]
@@ -0,0 +1,210 @@
+"""
+Per-stage instrumentation for the reporting pipelines.
+
+PipelineProfiler wraps each stage of a run in a context manager. For every
+stage it records:
+
+- wall time and CPU time (process CPU, so worker threads are included);
+- peak RSS during the stage. On Linux the kernel high-water mark is reset
+  at the start of each stage (/proc/self/clear_refs). Elsewhere the
+  process-lifetime peak (getrusage) is reported instead. The counter is
+  per process, so the figure is approximate when runs share a process
+  (e.g. thread-pool scheduler jobs);
+- optionally (trace_memory=True) the tracemalloc peak above the stage's
+  starting allocation. This slows allocation-heavy code noticeably;
+- rows in / rows out.
+
+Each run is appended to a JSON-lines log with one record per stage and a
+final 'total' record, so `pd.read_json(path, lines=True)` loads the history
+for regression tracking. summary_table() formats the stages as plain text
+for the report email.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_CLEAR_REFS = '/proc/self/clear_refs'
+_STATUS = '/proc/self/status'
+
+
+def _reset_peak_rss() -> bool:
+    """
+    Reset the kernel's peak-RSS counter (VmHWM); False where unsupported
+    """
+    try:
+        with open(_CLEAR_REFS, 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb(resettable: bool) -> Optional[float]:
+    if resettable:
+        try:
+            with open(_STATUS) as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+class StageRecord:
+    """
+    Measurements of one stage; set rows_out (and optionally extra fields)
+    inside the `with profiler.stage(...)` block
+    """
+
+    def __init__(self, stage: str, rows_in: Optional[int] = None):
+        self.stage = stage
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_rss_mb: Optional[float] = None
+        self.traced_peak_mb: Optional[float] = None
+        self.status = 'ok'
+        self.extra: Dict = {}
+
+    def to_dict(self) -> Dict:
+        return {
+            'stage': self.stage,
+            'status': self.status,
+            'wall_seconds': round(self.wall_seconds, 6),
+            'cpu_seconds': round(self.cpu_seconds, 6),
+            'peak_rss_mb': None if self.peak_rss_mb is None else round(self.peak_rss_mb, 2),
+            'traced_peak_mb': None if self.traced_peak_mb is None else round(self.traced_peak_mb, 2),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            **self.extra,
+        }
+
+
+class PipelineProfiler:
+    """
+    Collects StageRecords for one pipeline run and writes them to a
+    JSON-lines run log
+    """
+
+    def __init__(
+        self,
+        pipeline: str = 'automate_reporting_pipeline',
+        run_log_path: Optional[str] = None,
+        trace_memory: bool = False
+    ):
+        self.pipeline = pipeline
+        self.run_log_path = run_log_path
+        self.trace_memory = trace_memory
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now()
+        self.stages: List[StageRecord] = []
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[StageRecord]:
+        record = StageRecord(name, rows_in)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.trace_memory:
+            traced_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        resettable = _reset_peak_rss()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        except BaseException:
+            record.status = 'failed'
+            raise
+        finally:
+            record.wall_seconds = time.perf_counter() - wall
+            record.cpu_seconds = time.process_time() - cpu
+            record.peak_rss_mb = _peak_rss_mb(resettable)
+            if self.trace_memory:
+                record.traced_peak_mb = (tracemalloc.get_traced_memory()[1] - traced_start) / 1024 ** 2
+            self.stages.append(record)
+            logger.info(
+                f"Stage {name}: {record.wall_seconds:.3f}s wall, {record.cpu_seconds:.3f}s CPU, "
+                f"peak RSS {_format_mb(record.peak_rss_mb)}, rows {_format_rows(record.rows_in)} -> "
+                f"{_format_rows(record.rows_out)}"
+            )
+
+    def total(self, status: str = 'ok') -> Dict:
+        peaks = [s.peak_rss_mb for s in self.stages if s.peak_rss_mb is not None]
+        return {
+            'stage': 'total',
+            'status': status,
+            'wall_seconds': round(time.perf_counter() - self._start_wall, 6),
+            'cpu_seconds': round(time.process_time() - self._start_cpu, 6),
+            'peak_rss_mb': round(max(peaks), 2) if peaks else None,
+            'traced_peak_mb': None,
+            'rows_in': self.stages[0].rows_in if self.stages else None,
+            'rows_out': None,
+        }
+
+    def records(self, status: str = 'ok') -> List[Dict]:
+        base = {
+            'run_id': self.run_id,
+            'pipeline': self.pipeline,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+        }
+        return [{**base, **stage.to_dict()} for stage in self.stages] + [{**base, **self.total(status)}]
+
+    def write(self, status: str = 'ok') -> Optional[str]:
+        """
+        Append this run's stage records (and the total) to the run log
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        if not self.run_log_path:
+            return None
+        directory = os.path.dirname(os.path.abspath(self.run_log_path))
+        os.makedirs(directory, exist_ok=True)
+        lines = ''.join(json.dumps(record, default=str) + '\n' for record in self.records(status))
+        # One write per run keeps concurrent runs' lines from interleaving
+        with open(self.run_log_path, 'a') as f:
+            f.write(lines)
+        logger.info(f"Run {self.run_id} stage metrics appended to {self.run_log_path}")
+        return self.run_log_path
+
+    def summary_table(self, indent: str = '') -> str:
+        """
+        Fixed-width plain-text table of the stages recorded so far
+        """
+        header = f"{'Stage':<22}{'Wall s':>9}{'CPU s':>9}{'Peak MB':>10}{'Rows in':>12}{'Rows out':>12}"
+        lines = [header, '-' * len(header)]
+        for s in self.stages:
+            lines.append(
+                f"{s.stage:<22}{s.wall_seconds:>9.2f}{s.cpu_seconds:>9.2f}{_format_mb(s.peak_rss_mb, unit=''):>10}"
+                f"{_format_rows(s.rows_in):>12}{_format_rows(s.rows_out):>12}"
+            )
+        return '\n'.join(indent + line for line in lines)
+
+
+def _format_mb(value: Optional[float], unit: str = ' MB') -> str:
+    return '-' if value is None else f'{value:,.0f}{unit}'
+
+
+def _format_rows(value: Optional[int]) -> str:
+    return '-' if value is None else f'{value:,}'
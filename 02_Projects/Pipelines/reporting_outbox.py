@@ -0,0 +1,287 @@
+"""
+Durable local outbox for report emails.
+
+The pipeline used to block on SMTP and only log a failed send. With an
+outbox, the pipeline enqueues each finished report (recipients, subject,
+body and the path of the PDF already written to output_dir) in a SQLite
+database and returns at once. An OutboxWorker thread drains the queue:
+
+- claims due messages in small batches (at most `concurrency` in flight)
+  and sends them through one long-lived ReportMailer (pooled connections);
+- on a transient failure, reschedules the message with exponential backoff
+  until max_attempts, after which it is marked failed; permanent failures
+  are marked failed immediately;
+- messages left in 'sending' by a crashed worker are returned to 'pending'
+  when a worker starts.
+
+Delivery metrics (counts per status, attempts, enqueue-to-sent latency)
+come from ReportOutbox.metrics().
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, List, Optional
+
+from reporting_delivery import DeliveryResult, OutgoingMessage, ReportMailer, validate_smtp_config
+
+logger = logging.getLogger(__name__)
+
+PENDING, SENDING, SENT, FAILED = 'pending', 'sending', 'sent', 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    to_emails TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    attachment_path TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    claimed_at REAL,
+    sent_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+class ReportOutbox:
+    """
+    SQLite-backed queue of outgoing report emails (safe across threads and
+    processes; every operation uses its own short-lived connection)
+    """
+
+    def __init__(self, db_path: str = './reports/outbox.sqlite'):
+        self.db_path = db_path
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def enqueue(self, message: OutgoingMessage) -> int:
+        """
+        Persist one message for delivery; returns its id
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                'INSERT INTO outbox (to_emails, subject, body, attachment_path, created_at, next_attempt_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (json.dumps(list(message.to_emails)), message.subject, message.body,
+                 message.attachment_path, now, now)
+            )
+            return cursor.lastrowid
+
+    def claim(self, limit: int) -> Dict[int, OutgoingMessage]:
+        """
+        Atomically move up to `limit` due messages from pending to sending
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute(
+                'SELECT id, to_emails, subject, body, attachment_path FROM outbox '
+                'WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at, id LIMIT ?',
+                (PENDING, now, limit)
+            ).fetchall()
+            conn.executemany(
+                'UPDATE outbox SET status = ?, claimed_at = ? WHERE id = ?',
+                [(SENDING, now, row['id']) for row in rows]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return {
+            row['id']: OutgoingMessage(json.loads(row['to_emails']), row['subject'], row['body'],
+                                       row['attachment_path'])
+            for row in rows
+        }
+
+    def complete(self, message_id: int, result: DeliveryResult, max_attempts: int, backoff: float):
+        """
+        Record a delivery outcome: sent, rescheduled with backoff, or failed
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            if result.ok:
+                conn.execute(
+                    'UPDATE outbox SET status = ?, attempts = attempts + 1, sent_at = ?, last_error = NULL '
+                    'WHERE id = ?', (SENT, now, message_id)
+                )
+                return
+            attempts = conn.execute('SELECT attempts FROM outbox WHERE id = ?', (message_id,)).fetchone()[0] + 1
+            if result.transient and attempts < max_attempts:
+                status, next_attempt = PENDING, now + backoff * 2 ** (attempts - 1)
+            else:
+                status, next_attempt = FAILED, now
+            conn.execute(
+                'UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?',
+                (status, attempts, next_attempt, result.error, message_id)
+            )
+
+    def requeue_stale(self, older_than: float = 0.0) -> int:
+        """
+        Return messages stuck in 'sending' (claimed more than `older_than`
+        seconds ago, e.g. by a worker that crashed) to 'pending'
+        """
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                'UPDATE outbox SET status = ?, next_attempt_at = ? WHERE status = ? AND claimed_at <= ?',
+                (PENDING, time.time(), SENDING, time.time() - older_than)
+            )
+            return cursor.rowcount
+
+    def retry_failed(self) -> int:
+        """
+        Give every failed message a fresh set of attempts
+        """
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                'UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = ? WHERE status = ?',
+                (PENDING, time.time(), FAILED)
+            )
+            return cursor.rowcount
+
+    def pending_count(self) -> int:
+        """
+        Messages not yet settled (pending, including rescheduled ones, or
+        currently being sent)
+        """
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                'SELECT COUNT(*) FROM outbox WHERE status IN (?, ?)', (PENDING, SENDING)
+            ).fetchone()[0]
+
+    def metrics(self) -> Dict:
+        """
+        Delivery metrics: message counts per status, total attempts, and
+        mean / max seconds from enqueue to sent
+        """
+        with closing(self._connect()) as conn:
+            counts = dict(conn.execute('SELECT status, COUNT(*) FROM outbox GROUP BY status').fetchall())
+            attempts, mean_latency, max_latency = conn.execute(
+                'SELECT COALESCE(SUM(attempts), 0), AVG(sent_at - created_at), MAX(sent_at - created_at) '
+                'FROM outbox'
+            ).fetchone()
+        return {
+            **{status: counts.get(status, 0) for status in (PENDING, SENDING, SENT, FAILED)},
+            'attempts': attempts,
+            'mean_latency_seconds': mean_latency,
+            'max_latency_seconds': max_latency,
+        }
+
+    def failures(self, limit: int = 20) -> List[Dict]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT id, to_emails, subject, attempts, last_error FROM outbox WHERE status = ? '
+                'ORDER BY id DESC LIMIT ?', (FAILED, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+class OutboxWorker:
+    """
+    Background thread draining a ReportOutbox.
+
+    concurrency bounds both the messages in flight and the pooled SMTP
+    connections; failed sends are retried durably by the outbox with
+    `backoff` * 2^(attempt - 1) seconds between attempts. On start, messages
+    claimed more than `stale_after` seconds ago are assumed orphaned by a
+    crashed worker and requeued.
+    """
+
+    def __init__(
+        self,
+        outbox: ReportOutbox,
+        smtp_config: Dict,
+        concurrency: int = 4,
+        max_attempts: int = 5,
+        backoff: float = 30.0,
+        poll_interval: float = 1.0,
+        stale_after: float = 600.0
+    ):
+        # Fail here rather than after a batch has been claimed
+        validate_smtp_config(smtp_config)
+        self.outbox = outbox
+        self.smtp_config = smtp_config
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._mailer: Optional[ReportMailer] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> int:
+        """
+        Claim and send one batch of due messages; returns how many were tried
+        """
+        batch = self.outbox.claim(self.concurrency)
+        if not batch:
+            return 0
+        if self._mailer is None:
+            # Retries are scheduled by the outbox, not inside the mailer
+            self._mailer = ReportMailer(self.smtp_config, pool_size=self.concurrency, max_retries=0)
+        results = self._mailer.send_many(list(batch.values()))
+        for message_id, result in zip(batch, results):
+            self.outbox.complete(message_id, result, self.max_attempts, self.backoff)
+        return len(batch)
+
+    def _run(self):
+        requeued = self.outbox.requeue_stale(self.stale_after)
+        if requeued:
+            logger.info(f"Requeued {requeued} message(s) left in 'sending' by a previous worker")
+        while not self._stop.is_set():
+            try:
+                if self.run_once() == 0:
+                    self._stop.wait(self.poll_interval)
+            except Exception as e:
+                logger.error(f"Outbox worker error: {e}")
+                self._stop.wait(self.poll_interval)
+
+    def start(self) -> 'OutboxWorker':
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='report-outbox', daemon=True)
+            self._thread.start()
+            logger.info(f"Outbox worker started (concurrency={self.concurrency})")
+        return self
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no message is pending or sending (rescheduled messages
+        included); returns False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.outbox.pending_count() > 0:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(min(self.poll_interval, 0.1))
+        return True
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._mailer is not None:
+            self._mailer.close()
+            self._mailer = None
+        logger.info(f"Outbox worker stopped; metrics: {self.outbox.metrics()}")
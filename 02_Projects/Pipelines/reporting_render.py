@@ -0,0 +1,183 @@
+"""
+Report rendering for the reporting pipeline.
+
+render_report() draws the four report panels from the aggregates produced
+by summarize_for_report (or the streaming summary) and writes the PDF
+straight to its final path. Everything here uses the object-oriented
+matplotlib API (Figure + FigureCanvasAgg), never pyplot, so rendering is
+headless and safe inside worker processes.
+
+How a report is drawn depends on its profile (RENDER_PROFILES):
+
+- raster profiles draw each panel into an Agg pixel buffer, one panel per
+  worker process when n_jobs > 1, and the main process places the buffers
+  on a single PDF page;
+- vector profiles draw all panels on one figure in-process (vector output
+  cannot be split across processes without a PDF merger), which gives the
+  smallest file for these simple charts and selectable text.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+logger = logging.getLogger(__name__)
+
+# figsize in inches; dpi is the pixel density of rasterised panels (vector
+# profiles only use it for any embedded images)
+RENDER_PROFILES = {
+    'vector': {'raster': False, 'dpi': 300, 'figsize': (16, 12)},
+    'compact': {'raster': False, 'dpi': 150, 'figsize': (12, 9)},
+    'draft': {'raster': True, 'dpi': 72, 'figsize': (12, 9)},
+    'hires': {'raster': True, 'dpi': 200, 'figsize': (16, 12)},
+}
+
+# Forecast panel labels for each forecast frequency
+FORECAST_UNITS = {'D': 'Day', 'W': 'Week', 'M': 'Month'}
+
+PanelDrawer = Callable[[object, Dict, Dict], None]
+
+
+class RenderStats(NamedTuple):
+    path: str
+    profile: str
+    seconds: float
+    size_bytes: int
+
+
+def _draw_means(ax, summary: Dict, forecasts: Dict):
+    means = summary['means']
+    ax.bar(np.arange(len(means)), means.to_numpy(dtype=np.float64))
+    ax.set_xticks(np.arange(len(means)))
+    ax.set_xticklabels([str(c) for c in means.index], rotation=45)
+    ax.set_title('Average Metrics Summary')
+    ax.set_ylabel('Mean Value')
+
+
+def _draw_monthly(ax, summary: Dict, forecasts: Dict):
+    monthly = summary['monthly']
+    if monthly is None:
+        return
+    locator = mdates.AutoDateLocator()
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+    ax.plot(monthly.index.to_timestamp(), monthly.to_numpy(dtype=np.float64))
+    ax.set_title(f"Monthly Trend: {summary['trend_col']}")
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Average')
+
+
+def _draw_forecast(ax, summary: Dict, forecasts: Dict):
+    # Summaries without a forecast_freq come from daily forecasts
+    unit = FORECAST_UNITS.get(summary.get('forecast_freq', 'D'), 'Period')
+    for col, preds in list(forecasts.items())[:1]:  # Plot first forecast
+        ax.plot(preds, label=f'{col} Forecast', marker='o')
+        ax.set_title(f'{len(preds)}-{unit} Forecast')
+        ax.set_xlabel(f'{unit}s Ahead')
+        ax.set_ylabel('Predicted Value')
+        ax.legend()
+
+
+def _draw_distribution(ax, summary: Dict, forecasts: Dict):
+    if summary['hist_col'] is None:
+        return
+    edges = summary['hist_edges']
+    ax.stairs(summary['hist_counts'], edges, fill=True)
+    ax.grid(True)
+    ax.set_title(f"Distribution: {summary['hist_col']}")
+    ax.set_xlabel('Value')
+    ax.set_ylabel('Frequency')
+
+
+# Panel order is the 2 x 2 reading order on the page
+PANELS: List[Tuple[str, PanelDrawer]] = [
+    ('means', _draw_means),
+    ('monthly', _draw_monthly),
+    ('forecast', _draw_forecast),
+    ('distribution', _draw_distribution),
+]
+
+
+def _render_panel(args) -> np.ndarray:
+    """
+    Draw one panel into an Agg buffer; returns an (h, w, 3) uint8 array
+    """
+    index, summary, forecasts, panel_size, dpi = args
+    fig = Figure(figsize=panel_size, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    PANELS[index][1](ax, summary, forecasts)
+    fig.tight_layout()
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())[:, :, :3].copy()
+
+
+def _panel_payload(forecasts: Dict) -> Dict:
+    # Only the first forecast is drawn; don't ship the rest to workers
+    return dict(list(forecasts.items())[:1])
+
+
+def _render_raster(summary: Dict, forecasts: Dict, output_path: str, profile: Dict, n_jobs: int):
+    width, height = profile['figsize']
+    panel_size = (width / 2, height / 2)
+    tasks = [
+        (i, summary, _panel_payload(forecasts), panel_size, profile['dpi'])
+        for i in range(len(PANELS))
+    ]
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as pool:
+            images = list(pool.map(_render_panel, tasks))
+    else:
+        images = [_render_panel(task) for task in tasks]
+
+    page = Figure(figsize=profile['figsize'], dpi=profile['dpi'])
+    for i, image in enumerate(images):
+        row, col = divmod(i, 2)
+        ax = page.add_axes([col / 2, (1 - row) / 2, 0.5, 0.5])
+        ax.imshow(image, interpolation='none', aspect='auto')
+        ax.set_axis_off()
+    page.savefig(output_path, format='pdf', dpi=profile['dpi'])
+
+
+def _render_vector(summary: Dict, forecasts: Dict, output_path: str, profile: Dict):
+    fig = Figure(figsize=profile['figsize'])
+    FigureCanvasAgg(fig)
+    for i, (_, draw) in enumerate(PANELS):
+        draw(fig.add_subplot(2, 2, i + 1), summary, forecasts)
+    fig.tight_layout()
+    fig.savefig(output_path, format='pdf', dpi=profile['dpi'])
+
+
+def render_report(
+    summary: Dict,
+    forecasts: Dict,
+    output_path: str,
+    profile: str = 'vector',
+    n_jobs: Optional[int] = None
+) -> RenderStats:
+    """
+    Render the 4-panel report PDF directly to output_path.
+
+    n_jobs only affects raster profiles; None uses one worker per panel,
+    capped at the CPU count, and 1 renders in-process.
+    """
+    if profile not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile '{profile}'. Expected one of {list(RENDER_PROFILES)}")
+    settings = RENDER_PROFILES[profile]
+    if n_jobs is None:
+        n_jobs = min(len(PANELS), os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    if settings['raster']:
+        _render_raster(summary, forecasts, output_path, settings, n_jobs)
+    else:
+        _render_vector(summary, forecasts, output_path, settings)
+    elapsed = time.perf_counter() - start
+    return RenderStats(output_path, profile, elapsed, os.path.getsize(output_path))
@@ -0,0 +1,433 @@
+"""
+Config-driven scheduler for many report jobs.
+
+Jobs are listed in a YAML or TOML registry (see report_jobs.yaml). Each job
+names a data source, a cadence, its recipients and which pipeline to run
+('standard', 'batch', 'incremental' or 'streaming') with extra keyword
+arguments. ReportScheduler loads the registry into one APScheduler instance:
+
+- jobs run concurrently on a bounded thread or process pool
+  (scheduler.max_workers / scheduler.executor);
+- a run that could not start on time is still started within
+  misfire_grace_time seconds, and a backlog of missed runs is coalesced into
+  one (coalesce);
+- max_instances = 1 per job, so a slow run is never overlapped by the next
+  run of the same job; the skipped run is recorded instead;
+- every run (success, failure, missed or skipped) is recorded with its
+  scheduled time and duration in a SQLite run log (JobRunLog). The worker
+  writes the row of an executed run; the scheduler's executed/error event
+  then fills in the fire time it was run for.
+
+Pipeline entry points are referenced by module path and imported by the
+worker, so jobs can run in a process pool.
+"""
+
+import importlib
+import logging
+import os
+import sqlite3
+import time
+import traceback
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
+from apscheduler.executors.pool import ProcessPoolExecutor, ThreadPoolExecutor
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+logger = logging.getLogger(__name__)
+
+# pipeline name -> (entry point, keyword for the data, keyword for the recipients)
+PIPELINES: Dict[str, Tuple[str, str, str]] = {
+    'standard': ('Automated_Reporting_Pipeline:automate_reporting_pipeline', 'df', 'email_list'),
+    'batch': ('reporting_batch:automate_reporting_batch', 'df', 'recipients'),
+    'incremental': ('reporting_incremental:automate_reporting_pipeline_incremental', 'new_rows', 'email_list'),
+    'streaming': ('reporting_streaming:automate_reporting_pipeline_streaming', 'source', 'email_list'),
+}
+
+SCHEDULER_DEFAULTS = {
+    'timezone': 'America/New_York',
+    'executor': 'thread',
+    'max_workers': 4,
+    'misfire_grace_time': 3600,
+    'coalesce': True,
+    'output_dir': './reports',
+    'run_log': './reports/job_runs.sqlite',
+}
+
+SUCCESS, FAILED, MISSED, SKIPPED = 'success', 'failed', 'missed', 'skipped'
+
+
+class ReportJob(NamedTuple):
+    name: str
+    source: Any
+    recipients: Any
+    trigger: Dict
+    pipeline: str = 'standard'
+    options: Dict = {}
+    read_options: Dict = {}
+    output_dir: Optional[str] = None
+    timezone: Optional[str] = None
+    enabled: bool = True
+
+
+# ----------------------------------------------------------------------
+# Registry
+# ----------------------------------------------------------------------
+
+def _read_config_file(path: str) -> Dict:
+    if path.lower().endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("YAML job registries require PyYAML: pip install pyyaml") from e
+        with open(path) as f:
+            return yaml.safe_load(f) or {}
+    if path.lower().endswith('.toml'):
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError as e:
+                raise ImportError("TOML job registries require Python 3.11+ or tomli: pip install tomli") from e
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    raise ValueError(f"Unsupported job registry format '{path}'. Expected .yaml, .yml or .toml")
+
+
+def _resolve_env(config: Dict) -> Dict:
+    """
+    Replace `<key>_env: VAR` entries with the value of environment variable VAR
+    """
+    resolved = {}
+    for key, value in config.items():
+        if key.endswith('_env'):
+            if value not in os.environ:
+                raise ValueError(f"Environment variable '{value}' (for '{key[:-4]}') is not set")
+            resolved[key[:-4]] = os.environ[value]
+        else:
+            resolved[key] = value
+    return resolved
+
+
+def _parse_trigger(name: str, spec: Dict) -> Dict:
+    triggers = [key for key in ('cron', 'interval') if key in spec]
+    if len(triggers) != 1:
+        raise ValueError(f"Job '{name}' needs exactly one of 'cron' or 'interval'")
+    kind = triggers[0]
+    value = spec[kind]
+    if kind == 'cron' and isinstance(value, str):
+        return {'type': 'crontab', 'expr': value}
+    if not isinstance(value, dict):
+        raise ValueError(f"Job '{name}': '{kind}' must be a mapping of trigger fields")
+    return {'type': kind, **value}
+
+
+def load_job_registry(path: str) -> Tuple[Dict, Optional[Dict], List[ReportJob]]:
+    """
+    Parse a YAML/TOML job registry.
+
+    Returns (scheduler settings, smtp config or None, jobs). Keys ending in
+    `_env` in the smtp section are read from the environment, e.g.
+    `password_env: SMTP_PASSWORD`.
+    """
+    config = _read_config_file(path)
+    settings = {**SCHEDULER_DEFAULTS, **config.get('scheduler', {})}
+    if settings['executor'] not in ('thread', 'process'):
+        raise ValueError(f"Unknown executor '{settings['executor']}'. Expected 'thread' or 'process'")
+    smtp_config = _resolve_env(config['smtp']) if config.get('smtp') else None
+
+    jobs = []
+    for spec in config.get('jobs', []):
+        name = spec.get('name')
+        if not name:
+            raise ValueError(f"Job without a name in {path}")
+        if any(job.name == name for job in jobs):
+            raise ValueError(f"Duplicate job name '{name}' in {path}")
+        pipeline = spec.get('pipeline', 'standard')
+        if pipeline not in PIPELINES:
+            raise ValueError(f"Job '{name}': unknown pipeline '{pipeline}'. Expected one of {sorted(PIPELINES)}")
+        if 'source' not in spec:
+            raise ValueError(f"Job '{name}' has no data source")
+        jobs.append(ReportJob(
+            name=name,
+            source=spec['source'],
+            recipients=spec.get('recipients', []),
+            trigger=_parse_trigger(name, spec),
+            pipeline=pipeline,
+            options=spec.get('options', {}),
+            read_options=spec.get('read_options', {}),
+            output_dir=spec.get('output_dir'),
+            timezone=spec.get('timezone'),
+            enabled=spec.get('enabled', True),
+        ))
+    logger.info(f"Loaded {len(jobs)} report job(s) from {path}")
+    return settings, smtp_config, jobs
+
+
+def build_trigger(job: ReportJob, default_timezone: str):
+    tz = job.timezone or default_timezone
+    spec = dict(job.trigger)
+    kind = spec.pop('type')
+    if kind == 'crontab':
+        return CronTrigger.from_crontab(spec['expr'], timezone=tz)
+    if kind == 'cron':
+        return CronTrigger(timezone=tz, **spec)
+    return IntervalTrigger(timezone=tz, **spec)
+
+
+# ----------------------------------------------------------------------
+# Run log
+# ----------------------------------------------------------------------
+
+_RUN_LOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job TEXT NOT NULL,
+    status TEXT NOT NULL,
+    scheduled_at REAL,
+    started_at REAL,
+    finished_at REAL,
+    seconds REAL,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS job_runs_job ON job_runs (job, id);
+"""
+
+
+class JobRunLog:
+    """
+    SQLite record of every scheduled run (one short-lived connection per
+    operation, so worker threads and processes can write concurrently)
+    """
+
+    def __init__(self, db_path: str = './reports/job_runs.sqlite'):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_RUN_LOG_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record(
+        self,
+        job: str,
+        status: str,
+        scheduled_at: Optional[float] = None,
+        started_at: Optional[float] = None,
+        finished_at: Optional[float] = None,
+        message: Optional[str] = None
+    ) -> None:
+        seconds = finished_at - started_at if started_at is not None and finished_at is not None else None
+        with closing(self._connect()) as conn:
+            conn.execute(
+                'INSERT INTO job_runs (job, status, scheduled_at, started_at, finished_at, seconds, message) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job, status, scheduled_at, started_at, finished_at, seconds, message)
+            )
+
+    def mark_scheduled(self, job: str, scheduled_at: float) -> None:
+        """
+        Set scheduled_at on the job's latest completed run that started at or
+        after it, i.e. the run the scheduler has just reported. Runs of one
+        job never overlap (max_instances = 1), so that row is unambiguous.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute(
+                'UPDATE job_runs SET scheduled_at = ? WHERE id = ('
+                ' SELECT MAX(id) FROM job_runs WHERE job = ? AND status IN (?, ?)'
+                ' AND scheduled_at IS NULL AND started_at >= ?)',
+                (scheduled_at, job, SUCCESS, FAILED, scheduled_at)
+            )
+
+    def history(self, job: Optional[str] = None, limit: int = 50) -> pd.DataFrame:
+        query = 'SELECT * FROM job_runs'
+        params: tuple = ()
+        if job is not None:
+            query += ' WHERE job = ?'
+            params = (job,)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + ' ORDER BY id DESC LIMIT ?', params + (limit,)).fetchall()
+        history = pd.DataFrame([dict(row) for row in rows])
+        for col in ('scheduled_at', 'started_at', 'finished_at'):
+            if col in history:
+                history[col] = pd.to_datetime(history[col], unit='s')
+        return history
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Per job: runs by status, mean / max duration of completed runs and
+        the last status
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT job, '
+                'SUM(status = ?) AS success, SUM(status = ?) AS failed, '
+                'SUM(status = ?) AS missed, SUM(status = ?) AS skipped, '
+                'AVG(seconds) AS mean_seconds, MAX(seconds) AS max_seconds, '
+                '(SELECT status FROM job_runs AS last WHERE last.job = job_runs.job '
+                ' ORDER BY id DESC LIMIT 1) AS last_status '
+                'FROM job_runs GROUP BY job ORDER BY job',
+                (SUCCESS, FAILED, MISSED, SKIPPED)
+            ).fetchall()
+        return pd.DataFrame([dict(row) for row in rows])
+
+
+# ----------------------------------------------------------------------
+# Job execution
+# ----------------------------------------------------------------------
+
+def _import_entry_point(ref: str):
+    module_name, func_name = ref.split(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def load_source(source: Any, read_options: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Read a job's data source: CSV, Parquet, Feather, JSON or Excel by file
+    extension (read_options are passed to the pandas reader)
+    """
+    read_options = read_options or {}
+    path = os.fspath(source)
+    lower = path.lower()
+    if lower.endswith(('.parquet', '.pq')):
+        return pd.read_parquet(path, **read_options)
+    if lower.endswith('.feather'):
+        return pd.read_feather(path, **read_options)
+    if lower.endswith(('.json', '.jsonl')):
+        return pd.read_json(path, lines=lower.endswith('.jsonl'), **read_options)
+    if lower.endswith(('.xlsx', '.xls')):
+        return pd.read_excel(path, **read_options)
+    return pd.read_csv(path, **read_options)
+
+
+def run_report_job(
+    job: ReportJob,
+    smtp_config: Optional[Dict],
+    output_dir: str,
+    run_log_path: Optional[str] = None,
+    scheduled_at: Optional[float] = None
+) -> float:
+    """
+    Execute one job: load its source, call its pipeline and record the run.
+
+    Module-level (and importing the pipeline lazily) so it can be executed
+    in a worker process. Returns the run duration in seconds; failures are
+    recorded and re-raised so the scheduler logs them too.
+    """
+    run_log = JobRunLog(run_log_path) if run_log_path else None
+    started = time.time()
+    logger.info(f"Job '{job.name}' started ({job.pipeline} pipeline)")
+    try:
+        entry_point, data_arg, recipients_arg = PIPELINES[job.pipeline]
+        pipeline = _import_entry_point(entry_point)
+        # The streaming pipeline reads its source itself, chunk by chunk
+        data = job.source if job.pipeline == 'streaming' else load_source(job.source, job.read_options)
+        kwargs = {
+            data_arg: data,
+            recipients_arg: job.recipients,
+            'smtp_config': smtp_config,
+            'output_dir': job.output_dir or os.path.join(output_dir, job.name),
+            **job.options,
+        }
+        result = pipeline(**kwargs)
+    except Exception as e:
+        finished = time.time()
+        logger.error(f"Job '{job.name}' failed after {finished - started:.1f}s: {e}")
+        if run_log is not None:
+            run_log.record(job.name, FAILED, scheduled_at, started, finished,
+                           ''.join(traceback.format_exception_only(type(e), e)).strip())
+        raise
+    finished = time.time()
+    # The batch pipeline returns its per-segment timings table
+    message = result if isinstance(result, str) else f"{len(result)} segment report(s)"
+    logger.info(f"Job '{job.name}' finished in {finished - started:.1f}s")
+    if run_log is not None:
+        run_log.record(job.name, SUCCESS, scheduled_at, started, finished, message)
+    return finished - started
+
+
+class ReportScheduler:
+    """
+    Runs every job of a registry on one APScheduler instance (see module
+    docstring for concurrency, misfire and overlap behaviour)
+    """
+
+    def __init__(self, config_path: str, blocking: bool = True):
+        self.config_path = config_path
+        self.settings, self.smtp_config, self.jobs = load_job_registry(config_path)
+        self.run_log = JobRunLog(self.settings['run_log'])
+        pool_class = ProcessPoolExecutor if self.settings['executor'] == 'process' else ThreadPoolExecutor
+        scheduler_class = BlockingScheduler if blocking else BackgroundScheduler
+        self.scheduler = scheduler_class(
+            executors={'default': pool_class(self.settings['max_workers'])},
+            job_defaults={
+                'coalesce': self.settings['coalesce'],
+                'misfire_grace_time': self.settings['misfire_grace_time'],
+                'max_instances': 1,
+            },
+            timezone=self.settings['timezone'],
+        )
+        self.scheduler.add_listener(self._on_run, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+        self.scheduler.add_listener(self._on_not_run, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
+        for job in self.jobs:
+            if not job.enabled:
+                logger.info(f"Job '{job.name}' is disabled; skipping")
+                continue
+            self.scheduler.add_job(
+                run_report_job,
+                build_trigger(job, self.settings['timezone']),
+                args=(job, self.smtp_config, self.settings['output_dir'], self.settings['run_log']),
+                id=job.name,
+                name=job.name,
+                replace_existing=True,
+            )
+
+    def _on_run(self, event):
+        # Dispatched after run_report_job has recorded the run
+        self.run_log.mark_scheduled(event.job_id, event.scheduled_run_time.timestamp())
+
+    def _on_not_run(self, event):
+        if event.code == EVENT_JOB_MISSED:
+            status, when = MISSED, event.scheduled_run_time
+            message = f"missed by more than misfire_grace_time ({self.settings['misfire_grace_time']}s)"
+        else:
+            status, when = SKIPPED, event.scheduled_run_times[-1]
+            message = 'previous run still in progress'
+        logger.warning(f"Job '{event.job_id}' {status} at {when}: {message}")
+        self.run_log.record(event.job_id, status, scheduled_at=when.timestamp(), message=message)
+
+    def run_now(self, name: str) -> float:
+        """
+        Run one job immediately in the calling thread (for testing a config)
+        """
+        job = next((job for job in self.jobs if job.name == name), None)
+        if job is None:
+            raise KeyError(f"No job named '{name}' in {self.config_path}")
+        return run_report_job(job, self.smtp_config, self.settings['output_dir'], self.settings['run_log'])
+
+    def start(self):
+        """
+        Start the scheduler (blocks for a blocking scheduler)
+        """
+        now = datetime.now(timezone.utc)
+        for job in self.scheduler.get_jobs():
+            logger.info(f"Job '{job.id}' next run: {job.trigger.get_next_fire_time(None, now)}")
+        logger.info(
+            f"Scheduler starting with {len(self.scheduler.get_jobs())} job(s) on a "
+            f"{self.settings['executor']} pool of {self.settings['max_workers']}"
+        )
+        self.scheduler.start()
+
+    def shutdown(self, wait: bool = True):
+        self.scheduler.shutdown(wait=wait)
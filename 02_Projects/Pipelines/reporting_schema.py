@@ -0,0 +1,142 @@
+"""
+Shared schema inference for the reporting pipeline.
+
+run_forecasts, summarize_for_report and the streaming accumulators all need
+to know which column holds the dates, which columns are numeric, and the
+dates as day ordinals. infer_schema() scans a DataFrame once and caches the
+result (keyed on the frame's identity plus its column/dtype signature) so
+every stage of a run reuses the same answer. Date conversion and day
+ordinals are computed lazily, once per frame, with integer arithmetic on
+the datetime64 buffer instead of a per-row datetime.toordinal() call.
+"""
+
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# datetime.toordinal() of 1970-01-01; converts epoch days to proleptic ordinals
+EPOCH_ORDINAL = 719163
+
+_SCHEMA_CACHE: Dict[int, Tuple[weakref.ref, tuple, 'FrameSchema']] = {}
+
+
+class FrameSchema:
+    """
+    Column roles of one DataFrame plus lazily computed date conversions
+    """
+
+    def __init__(
+        self,
+        date_col: Optional[str],
+        datetime_columns: List[str],
+        numeric_columns: List[str],
+        categorical_columns: List[str]
+    ):
+        self.date_col = date_col
+        self.datetime_columns = datetime_columns
+        self.numeric_columns = numeric_columns
+        self.categorical_columns = categorical_columns
+        self._dates: Optional[pd.Series] = None
+        self._ordinals: Optional[np.ndarray] = None
+
+    def dates(self, df: pd.DataFrame) -> Optional[pd.Series]:
+        """
+        The date column as datetime64 (parsed once if stored as text)
+        """
+        if self.date_col is None:
+            return None
+        if self._dates is None:
+            self._dates = to_datetime_series(df[self.date_col])
+        return self._dates
+
+    def day_ordinals(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Proleptic Gregorian day ordinals (datetime.toordinal) of the date
+        column as float64, NaN where the date is missing
+        """
+        if self.date_col is None:
+            return None
+        if self._ordinals is None:
+            self._ordinals = day_ordinals(self.dates(df))
+        return self._ordinals
+
+
+def _is_date_column(name, dtype) -> bool:
+    return 'date' in str(name).lower() or pd.api.types.is_datetime64_any_dtype(dtype)
+
+
+def detect_date_column(df: pd.DataFrame) -> Optional[str]:
+    """
+    First column whose name contains 'date' or whose dtype is datetime64
+    """
+    for col, dtype in df.dtypes.items():
+        if _is_date_column(col, dtype):
+            return col
+    return None
+
+
+def to_datetime_series(values: pd.Series) -> pd.Series:
+    """
+    Vectorised conversion to naive datetime64 (tz-aware values keep wall time)
+    """
+    if not pd.api.types.is_datetime64_any_dtype(values.dtype):
+        values = pd.to_datetime(values)
+    if getattr(values.dt, 'tz', None) is not None:
+        values = values.dt.tz_localize(None)
+    return values
+
+
+def day_ordinals(dates: pd.Series) -> np.ndarray:
+    """
+    datetime.toordinal() for a whole Series without per-row Python calls:
+    floor the datetime64 buffer to days and shift the epoch
+    """
+    dates = to_datetime_series(dates)
+    days = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+    missing = np.isnat(days)
+    ordinals = days.view(np.int64).astype(np.float64) + EPOCH_ORDINAL
+    if missing.any():
+        ordinals[missing] = np.nan
+    return ordinals
+
+
+def _signature(df: pd.DataFrame) -> tuple:
+    return tuple(df.columns), tuple(df.dtypes), len(df)
+
+
+def _evict(key: int):
+    def callback(_ref):
+        _SCHEMA_CACHE.pop(key, None)
+    return callback
+
+
+def infer_schema(df: pd.DataFrame, refresh: bool = False) -> FrameSchema:
+    """
+    Detect column roles once per DataFrame; later calls on the same frame
+    return the cached FrameSchema.
+
+    Adding, removing or retyping columns invalidates the cache automatically.
+    Overwriting the values of an existing column in place does not; pass
+    refresh=True after doing that.
+    """
+    key = id(df)
+    signature = _signature(df)
+    cached = _SCHEMA_CACHE.get(key)
+    if cached is not None and not refresh:
+        ref, cached_signature, schema = cached
+        if ref() is df and cached_signature == signature:
+            return schema
+
+    datetime_columns = [
+        col for col, dtype in df.dtypes.items() if pd.api.types.is_datetime64_any_dtype(dtype)
+    ]
+    schema = FrameSchema(
+        date_col=detect_date_column(df),
+        datetime_columns=datetime_columns,
+        numeric_columns=df.select_dtypes(include=[np.number]).columns.tolist(),
+        categorical_columns=df.select_dtypes(include=['object']).columns.tolist(),
+    )
+    _SCHEMA_CACHE[key] = (weakref.ref(df, _evict(key)), signature, schema)
+    return schema
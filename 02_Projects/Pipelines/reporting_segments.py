@@ -0,0 +1,169 @@
+"""
+Grouped (per-segment) trend forecasting for the reporting pipeline.
+
+run_forecasts fits one global trend per metric. run_grouped_forecasts fits
+one trend per metric *per segment* (by default Region x Category x
+Sub-Category, the dimensions the Superstore dashboard groups on) and
+returns a tidy table with one row per segment / metric / forecast day.
+
+The frame is partitioned with a single groupby; every group is then fitted
+at once from per-group sufficient statistics accumulated with np.bincount
+(group sizes, centred sum of squares of x, sums of y and of x*y). With
+n_jobs > 1 the groups are split into contiguous shards of roughly equal
+row counts and each shard is fitted in a worker process.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Automated_Reporting_Pipeline import FORECAST_HORIZON
+from reporting_schema import EPOCH_ORDINAL, infer_schema
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_COLUMNS = ['Region', 'Category', 'Sub-Category']
+
+
+def _segment_trend_stats(
+    codes: np.ndarray,
+    x: np.ndarray,
+    Y: np.ndarray,
+    n_groups: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-group OLS sufficient statistics for every column of Y.
+
+    Returns (n, x_mean, sxx, y_mean, sxy) where sxx and sxy are centred on
+    each group's own mean x; y_mean and sxy have shape (n_groups, n_metrics).
+    """
+    n = np.bincount(codes, minlength=n_groups).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.bincount(codes, weights=x, minlength=n_groups) / n
+        xc = x - x_mean[codes]
+        sxx = np.bincount(codes, weights=xc * xc, minlength=n_groups)
+        y_mean = np.empty((n_groups, Y.shape[1]))
+        sxy = np.empty((n_groups, Y.shape[1]))
+        for j in range(Y.shape[1]):
+            y = Y[:, j]
+            y_mean[:, j] = np.bincount(codes, weights=y, minlength=n_groups) / n
+            sxy[:, j] = np.bincount(codes, weights=xc * y, minlength=n_groups)
+    return n, x_mean, sxx, y_mean, sxy
+
+
+def _fit_shard(args) -> Tuple[np.ndarray, ...]:
+    codes, x, Y, n_groups = args
+    return _segment_trend_stats(codes, x, Y, n_groups)
+
+
+def _shard_bounds(group_sizes: np.ndarray, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Split group codes 0..G-1 into contiguous ranges with similar row counts
+    """
+    cumulative = np.cumsum(group_sizes)
+    targets = cumulative[-1] * np.arange(1, n_shards) / n_shards
+    cuts = np.unique(np.searchsorted(cumulative, targets, side='left') + 1)
+    edges = [0] + [int(c) for c in cuts if 0 < c < len(group_sizes)] + [len(group_sizes)]
+    return [(lo, hi) for lo, hi in zip(edges[:-1], edges[1:]) if hi > lo]
+
+
+def run_grouped_forecasts(
+    df: pd.DataFrame,
+    group_cols: Optional[List[str]] = None,
+    metrics: Optional[List[str]] = None,
+    horizon: int = FORECAST_HORIZON,
+    n_jobs: int = 1,
+    min_points: int = 2
+) -> pd.DataFrame:
+    """
+    Fit a linear trend per segment and metric and forecast `horizon` days.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Cleaned data with a date column
+    group_cols : List[str], optional
+        Segment columns (default: Region, Category, Sub-Category)
+    metrics : List[str], optional
+        Numeric columns to forecast (default: all numeric columns)
+    horizon : int
+        Number of days to forecast after the last date in the frame
+    n_jobs : int
+        1 fits all groups in-process; >1 fans shards out to a process pool
+    min_points : int
+        Segments with fewer observations are left out of the result
+
+    Returns:
+    --------
+    pd.DataFrame
+        Tidy table: group columns, metric, horizon (1..N), forecast_date,
+        forecast, n_obs
+    """
+    group_cols = list(group_cols or SEGMENT_COLUMNS)
+    schema = infer_schema(df)
+    if schema.date_col is None:
+        raise ValueError("Grouped forecasting needs a date column")
+    missing = [c for c in group_cols if c not in df.columns]
+    if missing:
+        raise ValueError(f"Group columns not found in data: {missing}")
+    if metrics is None:
+        metrics = [c for c in schema.numeric_columns if c not in group_cols]
+    logger.info(f"Starting grouped forecasts: {len(metrics)} metrics by {group_cols}")
+
+    # Partition once: group codes per row plus the key of every group
+    grouper = df.groupby(group_cols, sort=True, observed=True, dropna=True)
+    # Rows with a missing key get NaN from ngroup(); code them -1 (no group)
+    codes = grouper.ngroup().to_numpy(dtype=np.int64, na_value=-1)
+    keys = grouper.size().index.to_frame(index=False)
+
+    x = schema.day_ordinals(df)
+    Y = df[metrics].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = (codes >= 0) & ~np.isnan(x) & np.isfinite(Y).all(axis=1)
+    if not valid.all():
+        logger.info(f"Skipping {int((~valid).sum()):,} rows with missing keys, dates or metrics")
+        codes, x, Y = codes[valid], x[valid], Y[valid]
+    n_groups = len(keys)
+    if len(codes) == 0 or n_groups == 0:
+        return pd.DataFrame(columns=group_cols + ['metric', 'horizon', 'forecast_date', 'forecast', 'n_obs'])
+
+    if n_jobs > 1 and n_groups > 1:
+        order = np.argsort(codes, kind='stable')
+        codes, x, Y = codes[order], x[order], Y[order]
+        sizes = np.bincount(codes, minlength=n_groups)
+        starts = np.concatenate([[0], np.cumsum(sizes)])
+        shards = _shard_bounds(sizes, n_jobs)
+        tasks = [
+            (codes[starts[lo]:starts[hi]] - lo, x[starts[lo]:starts[hi]], Y[starts[lo]:starts[hi]], hi - lo)
+            for lo, hi in shards
+        ]
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as pool:
+            parts = list(pool.map(_fit_shard, tasks))
+        n, x_mean, sxx, y_mean, sxy = (np.concatenate(p) for p in zip(*parts))
+    else:
+        n, x_mean, sxx, y_mean, sxy = _segment_trend_stats(codes, x, Y, n_groups)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slopes = np.where(sxx[:, None] > 0, sxy / sxx[:, None], 0.0)
+
+    keep = n >= min_points
+    last_date = x.max()
+    future = last_date + np.arange(1, horizon + 1)
+    # predictions[g, m, h] = mean_y + slope * (future_h - mean_x)
+    offsets = future[None, :] - x_mean[keep][:, None]
+    predictions = y_mean[keep][:, :, None] + slopes[keep][:, :, None] * offsets[:, None, :]
+
+    g, m, h = predictions.shape
+    table = keys[keep].reset_index(drop=True).loc[np.repeat(np.arange(g), m * h)].reset_index(drop=True)
+    table['metric'] = np.tile(np.repeat(np.asarray(metrics, dtype=object), h), g)
+    table['horizon'] = np.tile(np.arange(1, h + 1), g * m)
+    table['forecast_date'] = pd.to_datetime(
+        np.tile(future - EPOCH_ORDINAL, g * m).astype('int64'), unit='D'
+    )
+    table['forecast'] = predictions.ravel()
+    table['n_obs'] = np.repeat(n[keep].astype(np.int64), m * h)
+
+    logger.info(f"Grouped forecasts generated for {g:,} segments x {m} metrics")
+    return table
@@ -0,0 +1,631 @@
+"""
+Chunked / streaming mode for the automated reporting pipeline.
+
+The in-memory pipeline needs the raw frame plus several copies of it in
+memory. This module runs the same clean -> forecast -> report -> email flow
+over a CSV/Parquet file or an iterator of DataFrame chunks in two passes:
+
+1. Statistics pass: hashed duplicate detection, per-column medians and IQR
+   fences from bounded-size quantile sketches, categorical modes from value
+   counts.
+2. Cleaning pass: re-reads the chunks, drops duplicates / fills missing
+   values / removes outliers with the global statistics, and feeds each
+   cleaned chunk to the forecast and report accumulators.
+
+The full frame is never materialised. Memory is bounded by the chunk size,
+the sketch capacity, 8 bytes per distinct row (dedup hashes) and one bit per
+input row (keep mask).
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from Automated_Reporting_Pipeline import (
+    FORECAST_HORIZON,
+    build_report_email_body,
+    render_pdf_report,
+    send_email_with_attachment,
+)
+from reporting_schema import day_ordinals, detect_date_column, to_datetime_series
+
+logger = logging.getLogger(__name__)
+
+ChunkSource = Union[str, Iterable[pd.DataFrame], Callable[[], Iterable[pd.DataFrame]]]
+
+HIST_BINS = 30
+HIST_OVERSAMPLE = 64
+
+
+class QuantileSketch:
+    """
+    Mergeable, fixed-capacity quantile sketch (bottom-k priority sample).
+
+    Every value gets a uniform random key; the sketch keeps the `capacity`
+    values with the smallest keys, which is a uniform sample without
+    replacement of everything seen so far. While fewer than `capacity`
+    values have been added the sketch is exact and its quantiles match
+    pandas' linear interpolation.
+    """
+
+    def __init__(self, capacity: int = 65536, seed: Optional[int] = 0):
+        self.capacity = capacity
+        self.count = 0
+        self._values = np.empty(0, dtype=np.float64)
+        self._keys = np.empty(0, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+        self._sorted = None
+
+    @property
+    def is_exact(self) -> bool:
+        return self.count <= self.capacity
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Sketch contents as plain arrays (for checkpointing)
+        """
+        return {'values': self._values, 'keys': self._keys, 'count': np.int64(self.count)}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], capacity: int, seed: Optional[int] = 0) -> 'QuantileSketch':
+        sketch = cls(capacity, seed=seed)
+        sketch._values = np.asarray(arrays['values'], dtype=np.float64)
+        sketch._keys = np.asarray(arrays['keys'], dtype=np.float64)
+        sketch.count = int(arrays['count'])
+        return sketch
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self._merge(values, self._rng.random(values.size), values.size)
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        if other.count == 0:
+            return
+        self._merge(other._values, other._keys, other.count)
+
+    def _merge(self, values: np.ndarray, keys: np.ndarray, count: int) -> None:
+        values = np.concatenate([self._values, values])
+        keys = np.concatenate([self._keys, keys])
+        if values.size > self.capacity:
+            keep = np.argpartition(keys, self.capacity - 1)[:self.capacity]
+            values, keys = values[keep], keys[keep]
+        self._values, self._keys = values, keys
+        self.count += count
+        self._sorted = None
+
+    def _sorted_sample(self) -> np.ndarray:
+        if self._sorted is None:
+            self._sorted = np.sort(self._values)
+        return self._sorted
+
+    def median(self) -> float:
+        """
+        Median of the values seen so far (NaN if empty)
+        """
+        sample = self._sorted_sample()
+        if sample.size == 0:
+            return np.nan
+        if self.is_exact:
+            return float(np.median(sample))
+        return float(self.quantiles([0.5])[0])
+
+    def quantiles(
+        self,
+        qs: List[float],
+        fill_value: float = np.nan,
+        fill_count: int = 0
+    ) -> np.ndarray:
+        """
+        Quantiles of the sketched values plus `fill_count` copies of
+        `fill_value` (the missing values that clean_data fills with the
+        median before computing IQR fences).
+        """
+        sample = self._sorted_sample()
+        k = sample.size
+        if np.isnan(fill_value):
+            fill_count = 0
+        if k == 0 and fill_count == 0:
+            return np.full(len(qs), np.nan)
+        weight = self.count / k if k else 1.0
+        fill_at = np.searchsorted(sample, fill_value, side='left') * weight if fill_count else np.inf
+        total = self.count + fill_count
+
+        def value_at(rank: int) -> float:
+            if rank < fill_at:
+                return sample[min(int(rank / weight), k - 1)]
+            if rank < fill_at + fill_count:
+                return fill_value
+            return sample[min(int((rank - fill_count) / weight), k - 1)]
+
+        out = np.empty(len(qs), dtype=np.float64)
+        for i, q in enumerate(qs):
+            pos = (total - 1) * q
+            lo = int(np.floor(pos))
+            t = pos - lo
+            a = value_at(lo)
+            b = value_at(min(lo + 1, total - 1))
+            # Same lerp as numpy.quantile so exact sketches match pandas bit for bit
+            diff = b - a
+            out[i] = b - diff * (1 - t) if t >= 0.5 else a + diff * t
+        return out
+
+
+class HashDeduplicator:
+    """
+    Detects repeated rows across chunks by 64-bit row hashes.
+
+    Only a sorted array of distinct hashes is kept (8 bytes per unique row).
+    Collisions are possible in principle but vanishingly rare at 64 bits.
+    """
+
+    def __init__(self):
+        self._seen = np.empty(0, dtype=np.uint64)
+
+    @property
+    def unique_rows(self) -> int:
+        return int(self._seen.size)
+
+    @staticmethod
+    def row_hashes(chunk: pd.DataFrame) -> np.ndarray:
+        # Normalise numerics so an int chunk and a float chunk hash the same rows equally
+        normalised = chunk.copy(deep=False)
+        for col in normalised.select_dtypes(include=[np.number]).columns:
+            normalised[col] = normalised[col].astype(np.float64)
+        return pd.util.hash_pandas_object(normalised, index=False).to_numpy()
+
+    def first_occurrence(self, chunk: pd.DataFrame) -> np.ndarray:
+        """
+        Boolean mask of rows never seen before (in this or earlier chunks)
+        """
+        hashes = self.row_hashes(chunk)
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        if self._seen.size:
+            idx = np.searchsorted(self._seen, hashes)
+            idx[idx == self._seen.size] = 0
+            keep &= self._seen[idx] != hashes
+        if keep.any():
+            self._seen = np.union1d(self._seen, hashes[keep])
+        return keep
+
+
+class StreamingCleaner:
+    """
+    Two-pass, bounded-memory equivalent of clean_data (vectorized outlier mode)
+    """
+
+    def __init__(self, sketch_capacity: int = 65536, k: float = 1.5):
+        self.sketch_capacity = sketch_capacity
+        self.k = k
+        self.dedup = HashDeduplicator()
+        self.numeric_columns: List[str] = []
+        self.categorical_columns: List[str] = []
+        self.sketches: Dict[str, QuantileSketch] = {}
+        self.missing: Dict[str, int] = {}
+        self.raw_min: Dict[str, float] = {}
+        self.raw_max: Dict[str, float] = {}
+        self.category_counts: Dict[str, pd.Series] = {}
+        self.medians: Dict[str, float] = {}
+        self.modes: Dict[str, object] = {}
+        self.lower: Dict[str, float] = {}
+        self.upper: Dict[str, float] = {}
+        self.rows_in = 0
+        self.rows_out = 0
+        self._keep_masks: List[np.ndarray] = []
+        self._chunk_lengths: List[int] = []
+
+    def observe(self, chunk: pd.DataFrame) -> None:
+        """
+        Pass 1: update dedup state and column statistics with one raw chunk
+        """
+        if not self._chunk_lengths:
+            self.numeric_columns = chunk.select_dtypes(include=[np.number]).columns.tolist()
+            self.categorical_columns = chunk.select_dtypes(include=['object']).columns.tolist()
+            for col in self.numeric_columns:
+                self.sketches[col] = QuantileSketch(self.sketch_capacity, seed=len(self.sketches))
+                self.missing[col] = 0
+                self.raw_min[col] = np.inf
+                self.raw_max[col] = -np.inf
+            for col in self.categorical_columns:
+                self.category_counts[col] = pd.Series(dtype=np.int64)
+
+        self.rows_in += len(chunk)
+        keep = self.dedup.first_occurrence(chunk)
+        self._keep_masks.append(np.packbits(keep))
+        self._chunk_lengths.append(len(chunk))
+        unique = chunk[keep]
+
+        for col in self.numeric_columns:
+            values = unique[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            nan = np.isnan(values)
+            self.missing[col] += int(nan.sum())
+            valid = values[~nan]
+            if valid.size:
+                self.sketches[col].update(valid)
+                self.raw_min[col] = min(self.raw_min[col], float(valid.min()))
+                self.raw_max[col] = max(self.raw_max[col], float(valid.max()))
+        for col in self.categorical_columns:
+            counts = unique[col].value_counts()
+            self.category_counts[col] = self.category_counts[col].add(counts, fill_value=0)
+
+    def finalize(self) -> None:
+        """
+        Derive medians, modes and IQR fences once pass 1 is complete
+        """
+        for col in self.numeric_columns:
+            sketch = self.sketches[col]
+            median = sketch.median()
+            q1, q3 = sketch.quantiles([0.25, 0.75], fill_value=median, fill_count=self.missing[col])
+            iqr = q3 - q1
+            self.medians[col] = median
+            self.lower[col] = q1 - self.k * iqr
+            self.upper[col] = q3 + self.k * iqr
+        for col in self.categorical_columns:
+            counts = self.category_counts[col]
+            if counts.empty:
+                raise ValueError(f"Cannot compute mode for '{col}': column has no values")
+            # Series.mode() breaks ties by sort order; mirror that
+            top = counts[counts == counts.max()].index
+            self.modes[col] = sorted(top)[0]
+
+    def clean(self, chunk: pd.DataFrame, chunk_no: int) -> pd.DataFrame:
+        """
+        Pass 2: apply dedup, fills and outlier fences to one raw chunk
+        """
+        keep = np.unpackbits(self._keep_masks[chunk_no], count=self._chunk_lengths[chunk_no]).astype(bool)
+        cleaned = chunk[keep]
+        fills = {col: self.medians[col] for col in self.numeric_columns}
+        fills.update({col: self.modes[col] for col in self.categorical_columns})
+        cleaned = cleaned.fillna(value=fills)
+        mask = np.ones(len(cleaned), dtype=bool)
+        for col in self.numeric_columns:
+            values = cleaned[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            np.logical_and(mask, values >= self.lower[col], out=mask)
+            np.logical_and(mask, values <= self.upper[col], out=mask)
+        cleaned = cleaned[mask]
+        self.rows_out += len(cleaned)
+        return cleaned
+
+
+class StreamingTrendForecaster:
+    """
+    Linear trend forecasts from running sufficient statistics.
+
+    Keeps n, sum(x), sum(x^2) for the shared day-ordinal axis and sum(y),
+    sum(xy) per metric, with x shifted to the first observed ordinal, so
+    the OLS fit matches run_forecasts without holding the rows.
+    """
+
+    def __init__(self, max_columns: Optional[int] = None, horizon: int = FORECAST_HORIZON):
+        self.max_columns = max_columns
+        self.horizon = horizon
+        self.date_col: Optional[str] = None
+        self.columns: List[str] = []
+        self.x0: Optional[int] = None
+        self.last_ordinal: Optional[int] = None
+        self.n = 0
+        self.sx = 0.0
+        self.sxx = 0.0
+        self.sy: Optional[np.ndarray] = None
+        self.sxy: Optional[np.ndarray] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if len(chunk) == 0:
+            return
+        if self.date_col is None:
+            self.date_col = detect_date_column(chunk)
+            if self.date_col is None:
+                return
+            numeric = [c for c in chunk.select_dtypes(include=[np.number]).columns if c != self.date_col]
+            self.columns = numeric[:self.max_columns] if self.max_columns else numeric
+            self.sy = np.zeros(len(self.columns))
+            self.sxy = np.zeros(len(self.columns))
+        ordinals = day_ordinals(chunk[self.date_col])
+        Y = chunk[self.columns].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(ordinals)
+        if not valid.all():
+            ordinals, Y = ordinals[valid], Y[valid]
+        if ordinals.size == 0:
+            return
+        if self.x0 is None:
+            self.x0 = int(ordinals[0])
+        chunk_max = int(ordinals.max())
+        self.last_ordinal = chunk_max if self.last_ordinal is None else max(self.last_ordinal, chunk_max)
+        x = ordinals - self.x0
+        self.n += len(x)
+        self.sx += x.sum()
+        self.sxx += x @ x
+        self.sy += Y.sum(axis=0)
+        self.sxy += x @ Y
+
+    def forecasts(self) -> Dict[str, np.ndarray]:
+        forecasts = {}
+        if self.last_ordinal is None or not self.columns:
+            return forecasts
+        future = np.arange(self.last_ordinal + 1, self.last_ordinal + self.horizon + 1) - self.x0
+        denom = self.n * self.sxx - self.sx * self.sx
+        slopes = (self.n * self.sxy - self.sx * self.sy) / denom if denom else np.zeros_like(self.sy)
+        intercepts = (self.sy - slopes * self.sx) / self.n
+        predictions = intercepts + np.outer(future, slopes)
+        for j, col in enumerate(self.columns):
+            forecasts[col] = predictions[:, j]
+        logger.info(f"Forecasts generated for {len(self.columns)} columns")
+        return forecasts
+
+
+class StreamingReportSummary:
+    """
+    Accumulates the aggregates of summarize_for_report chunk by chunk
+    """
+
+    def __init__(self, hist_range: Optional[Dict[str, tuple]] = None):
+        self.hist_range = hist_range or {}
+        self.sums: Optional[pd.Series] = None
+        self.counts: Optional[pd.Series] = None
+        self.date_col: Optional[str] = None
+        self.first_col: Optional[str] = None
+        self.monthly_sum = pd.Series(dtype=np.float64)
+        self.monthly_count = pd.Series(dtype=np.float64)
+        self._fine_counts: Optional[np.ndarray] = None
+        self._fine_edges: Optional[np.ndarray] = None
+        self._min = np.inf
+        self._max = -np.inf
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        numeric = chunk.select_dtypes(include=[np.number])
+        if self.sums is None:
+            self.sums = numeric.sum()
+            self.counts = numeric.count().astype(np.float64)
+            self.date_col = detect_date_column(chunk)
+            self.first_col = numeric.columns[0] if len(numeric.columns) else None
+            if self.first_col is not None:
+                lo, hi = self.hist_range.get(self.first_col, (None, None))
+                if lo is None or not np.isfinite(lo) or not np.isfinite(hi):
+                    values = numeric[self.first_col].dropna()
+                    lo, hi = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+                if lo == hi:
+                    lo, hi = lo - 0.5, hi + 0.5
+                self._fine_edges = np.linspace(lo, hi, HIST_BINS * HIST_OVERSAMPLE + 1)
+                self._fine_counts = np.zeros(HIST_BINS * HIST_OVERSAMPLE, dtype=np.int64)
+        else:
+            self.sums = self.sums.add(numeric.sum(), fill_value=0)
+            self.counts = self.counts.add(numeric.count(), fill_value=0)
+
+        if self.first_col is None or len(chunk) == 0:
+            return
+        if self.date_col is not None:
+            periods = to_datetime_series(chunk[self.date_col]).dt.to_period('M')
+            grouped = chunk[self.first_col].groupby(periods)
+            self.monthly_sum = self.monthly_sum.add(grouped.sum(), fill_value=0)
+            self.monthly_count = self.monthly_count.add(grouped.count(), fill_value=0)
+        values = chunk[self.first_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if values.size:
+            self._min = min(self._min, float(values.min()))
+            self._max = max(self._max, float(values.max()))
+            clipped = np.clip(values, self._fine_edges[0], self._fine_edges[-1])
+            counts, _ = np.histogram(clipped, bins=self._fine_edges)
+            self._fine_counts += counts
+
+    def summary(self) -> Dict:
+        """
+        Finalised aggregates in the format expected by render_pdf_report.
+
+        The histogram is re-binned from a fine grid onto 30 bins spanning the
+        observed range, so bin edges are approximate to 1/64 of a bin.
+        """
+        means = (self.sums / self.counts) if self.sums is not None else pd.Series(dtype=np.float64)
+        summary = {
+            'means': means,
+            'trend_col': None,
+            'monthly': None,
+            'hist_col': None,
+            'hist_counts': None,
+            'hist_edges': None,
+        }
+        if self.first_col is None:
+            return summary
+        if self.date_col is not None and len(self.monthly_count):
+            summary['trend_col'] = self.first_col
+            summary['monthly'] = (self.monthly_sum / self.monthly_count).sort_index()
+        if np.isfinite(self._min):
+            lo, hi = (self._min, self._max) if self._min < self._max else (self._min - 0.5, self._max + 0.5)
+            edges = np.linspace(lo, hi, HIST_BINS + 1)
+            centers = (self._fine_edges[:-1] + self._fine_edges[1:]) / 2
+            target = np.clip(np.searchsorted(edges, centers, side='right') - 1, 0, HIST_BINS - 1)
+            summary['hist_col'] = self.first_col
+            summary['hist_counts'] = np.bincount(
+                target, weights=self._fine_counts, minlength=HIST_BINS
+            ).astype(np.int64)
+            summary['hist_edges'] = edges
+        return summary
+
+
+def iter_source_chunks(
+    source: ChunkSource,
+    chunksize: int = 100_000,
+    parse_dates: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield DataFrame chunks from a CSV/Parquet path, a re-iterable of chunks
+    or a zero-argument callable returning an iterable of chunks
+    """
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.lower().endswith(('.parquet', '.pq')):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Reading Parquet sources requires pyarrow: pip install pyarrow") from e
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, chunksize=chunksize, parse_dates=parse_dates)
+    elif callable(source):
+        yield from source()
+    else:
+        yield from source
+
+
+class _ChunkSpool:
+    """
+    Replays a one-shot chunk iterator by spilling chunks to a temp directory
+    """
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix='reporting_stream_')
+        self.paths: List[str] = []
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        path = os.path.join(self.directory, f'chunk_{len(self.paths):06d}.pkl')
+        chunk.to_pickle(path)
+        self.paths.append(path)
+
+    def __iter__(self):
+        for path in self.paths:
+            yield pd.read_pickle(path)
+
+    def close(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _is_replayable(source: ChunkSource) -> bool:
+    return isinstance(source, (str, os.PathLike, list, tuple)) or callable(source)
+
+
+def stream_clean_chunks(
+    source: ChunkSource,
+    chunksize: int = 100_000,
+    parse_dates: Optional[List[str]] = None,
+    sketch_capacity: int = 65536,
+    cleaner: Optional[StreamingCleaner] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Two-pass streaming equivalent of clean_data; yields cleaned chunks.
+
+    File paths, lists and callables are read twice; any other iterator is
+    spooled to a temporary directory during the first pass.
+    """
+    cleaner = cleaner or StreamingCleaner(sketch_capacity=sketch_capacity)
+    spool = None if _is_replayable(source) else _ChunkSpool()
+    try:
+        for chunk in iter_source_chunks(source, chunksize, parse_dates):
+            cleaner.observe(chunk)
+            if spool is not None:
+                spool.add(chunk)
+        cleaner.finalize()
+        logger.info(
+            f"Streaming statistics pass complete: {cleaner.rows_in:,} rows, "
+            f"{cleaner.dedup.unique_rows:,} unique"
+        )
+
+        second_pass = spool if spool is not None else iter_source_chunks(source, chunksize, parse_dates)
+        for chunk_no, chunk in enumerate(second_pass):
+            yield cleaner.clean(chunk, chunk_no)
+        logger.info(f"Streaming cleaning complete. {cleaner.rows_out:,} rows retained.")
+    finally:
+        if spool is not None:
+            spool.close()
+
+
+def automate_reporting_pipeline_streaming(
+    source: ChunkSource,
+    email_list: List[str],
+    smtp_config: Optional[Dict] = None,
+    output_dir: str = './reports',
+    chunksize: int = 100_000,
+    parse_dates: Optional[List[str]] = None,
+    sketch_capacity: int = 65536
+) -> str:
+    """
+    Bounded-memory variant of automate_reporting_pipeline.
+
+    Parameters:
+    -----------
+    source : str, iterable or callable
+        CSV/Parquet path, iterable of DataFrame chunks, or a callable that
+        returns a fresh iterable of chunks on every call
+    email_list : List[str]
+        List of stakeholder email addresses
+    smtp_config : Dict, optional
+        SMTP configuration with keys: host, port, username, password, sender
+    output_dir : str
+        Directory to save generated reports
+    chunksize : int
+        Rows per chunk when reading from a file
+    parse_dates : List[str], optional
+        Columns to parse as dates when reading CSV
+    sketch_capacity : int
+        Values kept per numeric column for median/IQR estimation; statistics
+        are exact while a column has fewer values than this
+
+    Returns:
+    --------
+    str
+        Success message with recipient count
+    """
+    logger.info("="*60)
+    logger.info("STARTING STREAMING REPORTING PIPELINE")
+    logger.info(f"Timestamp: {datetime.now()}")
+    logger.info(f"Recipients: {len(email_list)}")
+
+    try:
+        cleaner = StreamingCleaner(sketch_capacity=sketch_capacity)
+        forecaster = StreamingTrendForecaster()
+        report = None
+
+        # Steps 1-2: Clean chunks and feed forecast/report accumulators
+        for cleaned in stream_clean_chunks(source, chunksize, parse_dates, cleaner=cleaner):
+            if report is None:
+                hist_range = {
+                    col: (max(cleaner.lower[col], cleaner.raw_min[col]),
+                          min(cleaner.upper[col], cleaner.raw_max[col]))
+                    for col in cleaner.numeric_columns
+                }
+                report = StreamingReportSummary(hist_range)
+            forecaster.update(cleaned)
+            report.update(cleaned)
+
+        forecasts = forecaster.forecasts()
+        summary = report.summary() if report is not None else StreamingReportSummary().summary()
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Step 3: Generate PDF report
+        report_date = datetime.now().strftime('%Y-%m-%d')
+        report_path = os.path.join(output_dir, f'executive_report_{report_date}.pdf')
+        render_pdf_report(summary, forecasts, report_path)
+        logger.info(f"PDF report successfully generated at {report_path}")
+
+        # Step 4: Send email if configured
+        if smtp_config and email_list:
+            send_email_with_attachment(
+                to_emails=email_list,
+                subject=f"Weekly Executive Report - {report_date}",
+                body=build_report_email_body(
+                    rows=cleaner.rows_out,
+                    metrics=len(cleaner.numeric_columns),
+                    forecast_count=len(forecasts)
+                ),
+                attachment_path=report_path,
+                smtp_config=smtp_config
+            )
+
+        logger.info("STREAMING PIPELINE COMPLETED SUCCESSFULLY")
+        logger.info("="*60)
+
+        return f"Report delivered to {len(email_list)} stakeholders"
+
+    except Exception as e:
+        logger.error(f"CRITICAL PIPELINE FAILURE: {e}")
+        logger.exception("Full traceback:")
+        logger.info("="*60)
+        raise